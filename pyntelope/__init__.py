@@ -1,4 +1,17 @@
 from . import exc, types
 from ._version import __version__
+from .blocks import *  # NOQA: F403
+from .cache import *  # NOQA: F403
+from .cassette import *  # NOQA: F403
+from .decoder import *  # NOQA: F403
+from .fakenode import *  # NOQA: F403
+from .fakeship import *  # NOQA: F403
+from .finality import *  # NOQA: F403
+from .keyring import *  # NOQA: F403
+from .metrics import *  # NOQA: F403
 from .net import *  # NOQA: F403
+from .ratelimit import *  # NOQA: F403
+from .readonly import *  # NOQA: F403
+from .routing import *  # NOQA: F403
+from .ship import *  # NOQA: F403
 from .transaction import *  # NOQA: F403
@@ -0,0 +1,163 @@
+"""Follow blocks as they are produced in the blockchain."""
+
+import datetime as dt
+import logging
+import threading
+from collections import deque
+from typing import Iterator, Optional, Union
+
+import pydantic
+
+from . import exc
+from .net import Net
+
+logger = logging.getLogger(__name__)
+
+BLOCK_INTERVAL_SEC = 0.5
+MIN_POLL_INTERVAL_SEC = 0.05
+
+
+class NewBlock(pydantic.BaseModel):
+    """
+    A block added to the followed chain.
+
+    block_num: int
+    id: str
+    block: dict
+        the block as returned by the net
+    """
+
+    block_num: int
+    id: str
+    block: dict
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class Rollback(pydantic.BaseModel):
+    """
+    A block, previously yielded as NewBlock, that was removed by a fork.
+
+    block_num: int
+    id: str
+    """
+
+    block_num: int
+    id: str
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class BlockFollower:
+    """
+    Follow the head (or the last irreversible block) of the chain.
+
+    Iterating over it yields a NewBlock for every block as soon as it is
+    produced.
+    When a micro-fork replaces blocks already yielded, one Rollback is
+    yielded for each removed block (newest first) followed by the NewBlock
+    events of the new branch.
+    Forks are detected by comparing each block `previous` field with the
+    id of the last block yielded.
+    Polling is paced by the 500ms block interval.
+
+    net: Net
+    start_block: int
+        first block to be yielded. Default is the current head (or lib)
+    irreversible: bool
+        follow the last irreversible block instead of the head.
+        Irreversible blocks are never rolled back
+    header_only: bool
+        use get_block_info instead of get_block
+    max_fork_depth: int
+        number of yielded blocks remembered to detect forks
+    """
+
+    def __init__(
+        self,
+        net: Net,
+        *,
+        start_block: Optional[int] = None,
+        irreversible: bool = False,
+        header_only: bool = False,
+        max_fork_depth: int = 1000,
+    ):
+        self.net = net
+        self.next_block_num = start_block
+        self.irreversible = irreversible
+        self.header_only = header_only
+        self._chain = deque(maxlen=max_fork_depth)
+        # updated on every poll
+        self.last_irreversible_block_num = 0
+        self._stop = threading.Event()
+
+    def stop(self):
+        """End the iteration, even while waiting for new blocks."""
+        self._stop.set()
+
+    def __iter__(self) -> Iterator[Union[NewBlock, Rollback]]:
+        while not self._stop.is_set():
+            info = self.net.get_info()
+            self.last_irreversible_block_num = info[
+                "last_irreversible_block_num"
+            ]
+            if self.irreversible:
+                target = info["last_irreversible_block_num"]
+            else:
+                target = info["head_block_num"]
+            if self.next_block_num is None:
+                self.next_block_num = target
+            yield from self._follow_until(target)
+            self._wait_next_block(info)
+
+    def _get_block(self, block_num: int) -> Optional[dict]:
+        """Return the block, or None when the node doesn't have it yet."""
+        try:
+            if self.header_only:
+                block = self.net.get_block_info(block_num=block_num)
+            else:
+                block = self.net.get_block(block_num_or_id=block_num)
+        except exc.UnknownBlockError:
+            # behind a load balancer, get_info and get_block can be
+            # answered by nodes with different heads
+            return None
+        # older nodes answer unknown blocks with a 500, returned as data
+        return block if "id" in block else None
+
+    def _follow_until(self, target: int):
+        while self.next_block_num <= target and not self._stop.is_set():
+            block = self._get_block(self.next_block_num)
+            if block is None:
+                logger.debug(f"Block {self.next_block_num} not available")
+                return
+
+            if self._chain and block["previous"] != self._chain[-1].id:
+                removed = self._chain.pop()
+                self.next_block_num = removed.block_num
+                yield removed
+                continue
+
+            block_num = self.next_block_num
+            # kept as the event to be yielded if the block is forked out
+            self._chain.append(Rollback(block_num=block_num, id=block["id"]))
+            self.next_block_num += 1
+            yield NewBlock(block_num=block_num, id=block["id"], block=block)
+
+    def _wait_next_block(self, info: dict):
+        """Wait until the block after the reported head is due, or stop."""
+        head_time = dt.datetime.fromisoformat(info["head_block_time"])
+        next_block_time = head_time + dt.timedelta(seconds=BLOCK_INTERVAL_SEC)
+        delay = (next_block_time - dt.datetime.utcnow()).total_seconds()
+        delay = min(max(delay, MIN_POLL_INTERVAL_SEC), BLOCK_INTERVAL_SEC)
+        self._stop.wait(delay)
+
+
+__all__ = [
+    "BlockFollower",
+    "NewBlock",
+    "Rollback",
+]
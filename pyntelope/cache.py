@@ -0,0 +1,266 @@
+"""Local caches for data that doesn't change in the blockchain."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+
+from . import types
+from .decoder import decode_raw_abi
+
+
+class _LRU:
+    """Thread safe mapping that keeps only the most recently used items."""
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1. {maxsize=}")
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            if len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _reset_after_fork(self):
+        # locks held by other threads of the parent are never released
+        self._lock = threading.Lock()
+
+
+class _SqliteStore:
+    """Thread safe key-value table in a sqlite file."""
+
+    def __init__(self, *, path: Union[str, Path], table: str, key_type: str):
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        with self._lock, self._db:
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                f"(key {key_type} PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), check_same_thread=False)
+
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            )
+            row = cursor.fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key, value: str):
+        with self._lock, self._db:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?)",
+                (key, value),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _reset_after_fork(self):
+        # sqlite connections must not be used across a fork: the parent
+        # one is left alone (not closed) and the child opens its own
+        self._lock = threading.Lock()
+        self._db = self._connect()
+
+
+class BlockCache:
+    """
+    Cache for irreversible blocks.
+
+    Blocks at or below the last irreversible block never change, so once
+    fetched they can be served locally.
+    Use it with `Net(..., block_cache=BlockCache())`.
+
+    maxsize: int = 1000
+        number of blocks kept in memory
+    path: str | Path = None
+        optional sqlite file where the blocks are also stored.
+        Blocks evicted from memory (or from a previous run) are read from it
+    """
+
+    # how often the last irreversible block num may be refreshed
+    lib_refresh_interval_sec = 0.5
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 1000,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        self._memory = _LRU(maxsize)
+        self._disk = None
+        if path is not None:
+            self._disk = _SqliteStore(
+                path=path, table="blocks", key_type="INTEGER"
+            )
+        self.last_irreversible_block_num = 0
+        self._lib_updated_at = float("-inf")
+
+    def get(self, block_num: int) -> Optional[dict]:
+        """Return a cached block or None."""
+        text = self._memory.get(block_num)
+        if text is None and self._disk is not None:
+            text = self._disk.get(block_num)
+            if text is not None:
+                self._memory.set(block_num, text)
+        return None if text is None else json.loads(text)
+
+    def set(self, block_num: int, block: dict):
+        text = json.dumps(block)
+        self._memory.set(block_num, text)
+        if self._disk is not None:
+            self._disk.set(block_num, text)
+
+    def update_lib(self, block_num: int):
+        """Store the last irreversible block num reported by the net."""
+        self.last_irreversible_block_num = max(
+            self.last_irreversible_block_num, block_num
+        )
+        self._lib_updated_at = time.monotonic()
+
+    def lib_is_stale(self) -> bool:
+        age = time.monotonic() - self._lib_updated_at
+        return age >= self.lib_refresh_interval_sec
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+    def _reset_after_fork(self):
+        self._memory._reset_after_fork()
+        if self._disk is not None:
+            self._disk._reset_after_fork()
+
+
+class _AbiEntry:
+    def __init__(self, *, abi_hash: str, abi: Optional[dict]):
+        self.abi_hash = abi_hash
+        self.abi = abi
+        self.checked_at = float("-inf")
+        self.abi_obj = None
+
+
+class AbiCache:
+    """
+    Cache for the contracts ABIs.
+
+    Stores the ABI of each account (as returned in get_abi "abi" field)
+    and the types.Abi object compiled from it.
+    ABIs are downloaded in binary with get_raw_abi and decoded locally.
+    Entries older than max_age_sec are revalidated with get_raw_abi,
+    sending the known abi_hash, so the ABI is downloaded again only when
+    it has changed.
+
+    net: Net
+    maxsize: int = 128
+        number of ABIs kept in memory
+    path: str | Path = None
+        optional sqlite file where the ABIs are also stored.
+        ABIs loaded from it are revalidated in their first use
+    max_age_sec: float = 60
+        time an ABI is used without being revalidated
+    """
+
+    def __init__(
+        self,
+        net,
+        *,
+        maxsize: int = 128,
+        path: Optional[Union[str, Path]] = None,
+        max_age_sec: float = 60,
+    ):
+        self.net = net
+        self.max_age_sec = max_age_sec
+        self._memory = _LRU(maxsize)
+        self._disk = None
+        if path is not None:
+            self._disk = _SqliteStore(path=path, table="abis", key_type="TEXT")
+
+    def get(self, account_name: str) -> Optional[dict]:
+        """Return the ABI of an account or None if it has no ABI."""
+        entry = self._get_entry(account_name)
+        return entry.abi
+
+    def get_abi_obj(self, account_name: str) -> Optional[types.Abi]:
+        """Return the ABI of an account as a types.Abi object."""
+        entry = self._get_entry(account_name)
+        if entry.abi is not None and entry.abi_obj is None:
+            entry.abi_obj = types.Abi.from_dict(entry.abi)
+        return entry.abi_obj
+
+    def _get_entry(self, account_name: str) -> _AbiEntry:
+        entry = self._memory.get(account_name)
+        if entry is None:
+            entry = self._load(account_name)
+        if entry is None or self._is_stale(entry):
+            entry = self._revalidate(account_name, entry)
+        return entry
+
+    def _is_stale(self, entry: _AbiEntry) -> bool:
+        age = time.monotonic() - entry.checked_at
+        return age > self.max_age_sec
+
+    def _load(self, account_name: str) -> Optional[_AbiEntry]:
+        if self._disk is None:
+            return None
+        text = self._disk.get(account_name)
+        if text is None:
+            return None
+        return _AbiEntry(**json.loads(text))
+
+    def _revalidate(
+        self, account_name: str, entry: Optional[_AbiEntry]
+    ) -> _AbiEntry:
+        known_hash = entry.abi_hash if entry is not None else None
+        raw = self.net.get_raw_abi(
+            account_name=account_name, abi_hash=known_hash
+        )
+        if "abi_hash" not in raw:
+            msg = f"Could not get the abi hash of {account_name=}: {raw=}"
+            raise ValueError(msg)
+
+        if raw["abi_hash"] != known_hash:
+            # accounts without an abi have an empty one
+            abi = decode_raw_abi(raw["abi"]) if raw["abi"] else None
+            entry = _AbiEntry(abi_hash=raw["abi_hash"], abi=abi)
+            if self._disk is not None:
+                text = json.dumps(dict(abi_hash=entry.abi_hash, abi=abi))
+                self._disk.set(account_name, text)
+
+        entry.checked_at = time.monotonic()
+        self._memory.set(account_name, entry)
+        return entry
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+
+__all__ = [
+    "AbiCache",
+    "BlockCache",
+]
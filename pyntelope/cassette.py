@@ -0,0 +1,156 @@
+"""
+Record http traffic to a cassette file and replay it later.
+
+Record with
+`Net(host=..., client=httpx.Client(transport=RecordingTransport(path)))`
+and replay with `ReplayTransport(path)` instead, without touching the
+node.
+"""
+
+import collections
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import httpx
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf8")
+    return open(path, mode, encoding="utf8")
+
+
+def _request_key(method: str, path: str, body: str) -> tuple:
+    # json bodies match regardless of the order of their keys
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        pass
+    return method, path, body
+
+
+def read_cassette(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    Yield the entries recorded in a cassette file.
+
+    Each entry has the keys:
+    start_sec: seconds since the recording started
+    duration_sec: seconds the node took to answer
+    method, url, request: the http method, url and request body
+    status_code, response: the http status code and response body
+    """
+    with _open(Path(path), "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """
+    Forward the requests and append them, with their timing, to a cassette.
+
+    The cassette is a file with one json object per line, gzip compressed
+    when its name ends with ".gz".
+
+    path: str | Path
+        the cassette file. New entries are appended to it.
+    transport: httpx.BaseTransport
+        the transport doing the requests (httpx.HTTPTransport by default)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        transport: Optional[httpx.BaseTransport] = None,
+    ):
+        self.path = Path(path)
+        self.transport = transport or httpx.HTTPTransport()
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self._file = _open(self.path, "a")
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        response = self.transport.handle_request(request)
+        response.read()
+        entry = dict(
+            start_sec=round(start - self._start, 6),
+            duration_sec=round(time.monotonic() - start, 6),
+            method=request.method,
+            url=str(request.url),
+            request=request.read().decode("utf8"),
+            status_code=response.status_code,
+            response=response.content.decode("utf8"),
+        )
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+        return response
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+        self.transport.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    Answer the requests with the responses recorded in a cassette.
+
+    Requests match recorded ones with the same method, url path and body.
+    Repeated requests get the recorded responses in order, then the last
+    one again.
+    A request never recorded raises ValueError.
+
+    path: str | Path
+        the cassette file
+    speed: float
+        each response is delayed by its recorded duration divided by
+        speed: 1 keeps the original timing, 10 is 10 times faster and
+        None answers without delay
+    """
+
+    def __init__(self, path: Union[str, Path], *, speed: Optional[float] = 1):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._entries = collections.defaultdict(collections.deque)
+        for entry in read_cassette(path):
+            url = httpx.URL(entry["url"])
+            key = _request_key(entry["method"], url.path, entry["request"])
+            self._entries[key].append(entry)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body = request.read().decode("utf8")
+        key = _request_key(request.method, request.url.path, body)
+        entry = self._next_entry(key)
+        if self.speed is not None:
+            time.sleep(entry["duration_sec"] / self.speed)
+        return httpx.Response(
+            entry["status_code"],
+            content=entry["response"].encode("utf8"),
+            headers={"content-type": "application/json"},
+        )
+
+    def _next_entry(self, key: tuple) -> dict:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise ValueError(f"Request not found in the cassette: {key}")
+            if len(entries) > 1:
+                return entries.popleft()
+            return entries[0]
+
+
+__all__ = [
+    "RecordingTransport",
+    "ReplayTransport",
+    "read_cassette",
+]
@@ -0,0 +1,375 @@
+"""Decode binary data (like table rows) using a contract ABI."""
+
+import datetime as dt
+from typing import Union
+
+import base58
+
+from . import types, utils
+
+# builtin abi types with a fixed size, decoded by the primitive types
+_FIXED_SIZE_TYPES = {
+    "bool": (types.Bool, 1),
+    "int8": (types.Int8, 1),
+    "int16": (types.Int16, 2),
+    "int32": (types.Int32, 4),
+    "int64": (types.Int64, 8),
+    "uint8": (types.Uint8, 1),
+    "uint16": (types.Uint16, 2),
+    "uint32": (types.Uint32, 4),
+    "uint64": (types.Uint64, 8),
+    "float32": (types.Float32, 4),
+    "float64": (types.Float64, 8),
+    "name": (types.Name, 8),
+    "symbol": (types.Symbol, 8),
+    "time_point": (types.TimePoint, 8),
+    "time_point_sec": (types.UnixTimestamp, 4),
+}
+
+BLOCK_TIMESTAMP_EPOCH = dt.datetime(2000, 1, 1)
+
+# builtin abi types decoded as hex strings
+_CHECKSUM_SIZES = {
+    "checksum160": 20,
+    "checksum256": 32,
+    "checksum512": 64,
+}
+
+
+def _read_varuint32(bytes_: bytes, offset: int):
+    # a varuint32 takes up to 5 bytes
+    end = offset + 5
+    varuint32 = types.Varuint32.from_bytes(bytes_[offset:end])
+    return varuint32.value, offset + len(varuint32)
+
+
+def _read_sized(bytes_: bytes, offset: int):
+    size, offset = _read_varuint32(bytes_, offset)
+    end = offset + size
+    if end > len(bytes_):
+        raise ValueError(f"Not enough bytes to read {size} bytes")
+    return bytes_[offset:end], end
+
+
+def _read_string(bytes_: bytes, offset: int):
+    # types.String refuses multi-byte utf8 characters, which are
+    # perfectly valid in data stored by contracts
+    value, end = _read_sized(bytes_, offset)
+    return value.decode("utf8"), end
+
+
+def _read_fixed(bytes_: bytes, offset: int, size: int) -> bytes:
+    end = offset + size
+    if end > len(bytes_):
+        raise ValueError(f"Not enough bytes to read {size} bytes")
+    return bytes_[offset:end]
+
+
+def _read_varint32(bytes_: bytes, offset: int):
+    value, offset = _read_varuint32(bytes_, offset)
+    # zigzag encoded
+    return (value >> 1) ^ -(value & 1), offset
+
+
+def _read_int128(bytes_: bytes, offset: int):
+    value = _read_fixed(bytes_, offset, 16)
+    return int.from_bytes(value, "little", signed=True), offset + 16
+
+
+def _read_uint128(bytes_: bytes, offset: int):
+    value = _read_fixed(bytes_, offset, 16)
+    return int.from_bytes(value, "little"), offset + 16
+
+
+def _read_float128(bytes_: bytes, offset: int):
+    # as nodeos does: the little endian bytes in hex
+    value = _read_fixed(bytes_, offset, 16)
+    return "0x" + value.hex(), offset + 16
+
+
+def _read_symbol_code(bytes_: bytes, offset: int):
+    # up to 7 characters, right padded with null bytes
+    value = _read_fixed(bytes_, offset, 8)
+    return value.rstrip(b"\x00").decode("ascii"), offset + 8
+
+
+def _read_asset(bytes_: bytes, offset: int):
+    # types.Asset refuses negative amounts, that contracts may store
+    value = _read_fixed(bytes_, offset, 16)
+    return types.Asset._value_from_bytes(value), offset + 16
+
+
+def _read_extended_asset(bytes_: bytes, offset: int):
+    quantity, offset = _read_asset(bytes_, offset)
+    contract = types.Name.from_bytes(_read_fixed(bytes_, offset, 8)).value
+    return {"quantity": quantity, "contract": contract}, offset + 8
+
+
+def _read_block_timestamp(bytes_: bytes, offset: int):
+    # number of half second slots since 2000-01-01
+    slot = int.from_bytes(_read_fixed(bytes_, offset, 4), "little")
+    timestamp = BLOCK_TIMESTAMP_EPOCH + dt.timedelta(milliseconds=slot * 500)
+    return timestamp, offset + 4
+
+
+# key types supported: K1 (0) and R1 (1)
+_KEY_TYPES = {0: "K1", 1: "R1"}
+
+
+def _read_key(prefix: str, size: int, bytes_: bytes, offset: int):
+    key_type = _read_fixed(bytes_, offset, 1)[0]
+    if key_type not in _KEY_TYPES:
+        raise ValueError(f"Key type {key_type} not supported")
+    suffix = _KEY_TYPES[key_type]
+    data = _read_fixed(bytes_, offset + 1, size)
+    checksum = utils._ripmed160(data + suffix.encode())[:4]
+    key = base58.b58encode(data + checksum).decode("ascii")
+    return f"{prefix}_{suffix}_{key}", offset + 1 + size
+
+
+def _read_public_key(bytes_: bytes, offset: int):
+    return _read_key("PUB", 33, bytes_, offset)
+
+
+def _read_signature(bytes_: bytes, offset: int):
+    return _read_key("SIG", 65, bytes_, offset)
+
+
+# builtin abi types read by a function
+_READERS = {
+    "varuint32": _read_varuint32,
+    "varint32": _read_varint32,
+    "int128": _read_int128,
+    "uint128": _read_uint128,
+    "float128": _read_float128,
+    "symbol_code": _read_symbol_code,
+    "asset": _read_asset,
+    "extended_asset": _read_extended_asset,
+    "block_timestamp_type": _read_block_timestamp,
+    "public_key": _read_public_key,
+    "signature": _read_signature,
+    "string": _read_string,
+    "bytes": _read_sized,
+}
+
+
+def _read_builtin(type_: str, bytes_: bytes, offset: int):
+    if type_ in _FIXED_SIZE_TYPES:
+        class_, size = _FIXED_SIZE_TYPES[type_]
+        end = offset + size
+        if end > len(bytes_):
+            raise ValueError(f"Not enough bytes to read {type_}")
+        return class_.from_bytes(bytes_[offset:end]).value, end
+    if type_ in _CHECKSUM_SIZES:
+        end = offset + _CHECKSUM_SIZES[type_]
+        return bytes_[offset:end].hex(), end
+    if type_ in _READERS:
+        return _READERS[type_](bytes_, offset)
+    raise ValueError(f"Type {type_} not found in the abi")
+
+
+def _resolve_aliases(aliases: dict) -> dict:
+    """Map each alias directly to its final type."""
+    resolved = {}
+    for alias, type_ in aliases.items():
+        seen = {alias}
+        # abis may have aliases to themselves, like name -> name
+        while type_ in aliases and type_ not in seen:
+            seen.add(type_)
+            type_ = aliases[type_]
+        resolved[alias] = type_
+    return resolved
+
+
+class AbiDecoder:
+    """
+    Decode binary data using the structs of a contract ABI.
+
+    Useful to request table rows as binary (get_table_rows with json=False),
+    which is faster for the node and makes smaller responses, and decode
+    them locally.
+
+    Structs are decoded as dicts and builtin types as the value of the
+    matching pyntelope type (checksums as hex strings, float128 as a 0x
+    prefixed hex string, extended assets as dicts with the quantity and
+    the contract, keys and signatures as PUB_K1_ and SIG_K1_ strings).
+    Variants are decoded as a list with the name of the type and the
+    value, like nodeos does.
+
+    abi: types.Abi | dict
+        the ABI as a types.Abi object or as a dict (the "abi" field
+        returned by get_abi)
+    """
+
+    def __init__(self, abi: Union[types.Abi, dict]):
+        if isinstance(abi, dict):
+            abi = types.Abi.from_dict(abi)
+        aliases = {
+            t.new_type_name.value: t.json_type.value for t in abi.types.values
+        }
+        self._aliases = _resolve_aliases(aliases)
+        self._structs = {s.name.value: s for s in abi.structs.values}
+        self._tables = {t.name.value: t.type_.value for t in abi.tables.values}
+        action_results = abi.action_results or types.Array.from_dict(
+            [], type_=types.String
+        )
+        self._action_results = {
+            r.name.value: r.result_type.value for r in action_results.values
+        }
+        variants = abi.variants or types.Array.from_dict(
+            [], type_=types.String
+        )
+        self._variants = {
+            v.name.value: [t.value for t in v.types.values]
+            for v in variants.values
+        }
+        self._suffix_readers = {
+            "[]": self._read_array,
+            "?": self._read_optional,
+            "$": self._read_binary_extension,
+        }
+
+    def decode(self, type_: str, bytes_: bytes):
+        """Decode bytes as an ABI type (struct, alias or builtin)."""
+        value, _ = self._read(type_, bytes_, 0)
+        return value
+
+    def decode_table_row(self, table: str, row: Union[str, bytes, dict]):
+        """
+        Decode a row returned by get_table_rows with json=False.
+
+        row can be the hex string, its bytes, or a dict with the hex string
+        in "data" (when show_payer=True). In this case a copy of the dict
+        with the decoded "data" is returned.
+        """
+        if isinstance(row, dict):
+            return {**row, "data": self.decode_table_row(table, row["data"])}
+        if table not in self._tables:
+            raise ValueError(f"Table {table} not found in the abi")
+        if isinstance(row, str):
+            row = bytes.fromhex(row)
+        return self.decode(self._tables[table], row)
+
+    def decode_action_result(self, action: str, data: Union[str, bytes]):
+        """
+        Decode the return value of an action.
+
+        data is the hex string (return_value_hex_data in the action trace)
+        or its bytes. The type is the result_type of the action in the
+        "action_results" of the abi.
+        """
+        if action not in self._action_results:
+            raise ValueError(f"Action result of {action} not found in the abi")
+        if isinstance(data, str):
+            data = bytes.fromhex(data)
+        return self.decode(self._action_results[action], data)
+
+    def _read(self, type_: str, bytes_: bytes, offset: int):
+        type_ = self._aliases.get(type_, type_)
+        for suffix, reader in self._suffix_readers.items():
+            if type_.endswith(suffix):
+                return reader(type_[: -len(suffix)], bytes_, offset)
+        if type_ in self._structs:
+            return self._read_struct(type_, bytes_, offset)
+        if type_ in self._variants:
+            return self._read_variant(type_, bytes_, offset)
+        return _read_builtin(type_, bytes_, offset)
+
+    def _read_struct(self, type_: str, bytes_: bytes, offset: int):
+        struct = self._structs[type_]
+        value = {}
+        if struct.base.value:
+            value, offset = self._read(struct.base.value, bytes_, offset)
+        for field in struct.fields.values:
+            name = field.name.value
+            value[name], offset = self._read(field.type_.value, bytes_, offset)
+        return value, offset
+
+    def _read_variant(self, type_: str, bytes_: bytes, offset: int):
+        index, offset = _read_varuint32(bytes_, offset)
+        variant_types = self._variants[type_]
+        if index >= len(variant_types):
+            raise ValueError(f"Invalid index {index} of variant {type_}")
+        value, offset = self._read(variant_types[index], bytes_, offset)
+        return [variant_types[index], value], offset
+
+    def _read_array(self, type_: str, bytes_: bytes, offset: int):
+        length, offset = _read_varuint32(bytes_, offset)
+        values = []
+        for _ in range(length):
+            value, offset = self._read(type_, bytes_, offset)
+            values.append(value)
+        return values, offset
+
+    def _read_optional(self, type_: str, bytes_: bytes, offset: int):
+        present, offset = _read_builtin("bool", bytes_, offset)
+        if not present:
+            return None, offset
+        return self._read(type_, bytes_, offset)
+
+    def _read_binary_extension(self, type_: str, bytes_: bytes, offset: int):
+        # binary extensions may be missing at the end of old data
+        if offset >= len(bytes_):
+            return None, offset
+        return self._read(type_, bytes_, offset)
+
+
+def _struct(name: str, fields: str, base: str = "") -> dict:
+    # fields as "name type, name type"
+    pairs = [f.split() for f in fields.split(",") if f.strip()]
+    fields = [{"name": n, "type": t} for n, t in pairs]
+    return {"name": name, "base": base, "fields": fields}
+
+
+# the abi of the binary abis (abi_def), as returned by get_raw_abi
+_ABI_DEF_ABI = {
+    "version": "eosio::abi/1.1",
+    "structs": [
+        _struct("type_def", "new_type_name string, type string"),
+        _struct("field_def", "name string, type string"),
+        _struct("struct_def", "name string, base string, fields field_def[]"),
+        _struct(
+            "action_def", "name name, type string, ricardian_contract string"
+        ),
+        _struct(
+            "table_def",
+            "name name, index_type string, key_names string[], "
+            "key_types string[], type string",
+        ),
+        _struct("clause_pair", "id string, body string"),
+        _struct("error_message", "error_code uint64, error_msg string"),
+        _struct("extension", "type uint16, data bytes"),
+        _struct("variant_def", "name string, types string[]"),
+        _struct("action_result_def", "name name, result_type string"),
+        _struct(
+            "abi_def",
+            "version string, types type_def[], structs struct_def[], "
+            "actions action_def[], tables table_def[], "
+            "ricardian_clauses clause_pair[], "
+            "error_messages error_message[], abi_extensions extension[], "
+            "variants variant_def[]$, action_results action_result_def[]$",
+        ),
+    ],
+}
+
+_ABI_DEF_DECODER = AbiDecoder(_ABI_DEF_ABI)
+
+
+def decode_raw_abi(raw_abi: bytes) -> dict:
+    """
+    Decode a binary ABI (the "abi" of get_raw_abi) as a dict.
+
+    The dict is like the "abi" returned by get_abi, so the ABI doesn't
+    need to be downloaded again as json.
+    """
+    abi = _ABI_DEF_DECODER.decode("abi_def", raw_abi)
+    for extension in ["variants", "action_results"]:
+        if abi[extension] is None:
+            abi[extension] = []
+    return abi
+
+
+__all__ = [
+    "AbiDecoder",
+    "decode_raw_abi",
+]
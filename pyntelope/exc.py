@@ -20,3 +20,97 @@ class ConnectionError(Exception):
         ]
         msg = ";\n".join(msg)
         super().__init__(self, msg)
+
+
+class NodeosError(ConnectionError):
+    """
+    An error answered by nodeos, with its error code, name and message.
+
+    Subclasses group the error codes that callers usually handle
+    differently. Use nodeos_error to get the matching exception from an
+    error response.
+    """
+
+    codes = ()
+
+    def __init__(self, *, data: dict, response=None, url=None, payload=None):
+        self.data = data
+        error = data.get("error") or {}
+        self.code = error.get("code")
+        self.name = error.get("name")
+        self.what = error.get("what")
+        super().__init__(
+            response=response,
+            url=url,
+            payload=payload,
+            error=f"{self.code} {self.name}: {self.what}",
+        )
+
+
+class TransactionExpiredError(NodeosError):
+    codes = (3040005,)  # expired_tx_exception
+
+
+class InvalidTaposError(NodeosError):
+    codes = (3040007,)  # invalid_ref_block_exception
+
+
+class DuplicateTransactionError(NodeosError):
+    codes = (3040008,)  # tx_duplicate
+
+
+class ContractAssertionError(NodeosError):
+    codes = (
+        3050003,  # eosio_assert_message_exception
+        3050004,  # eosio_assert_code_exception
+    )
+
+
+class RamUsageExceededError(NodeosError):
+    codes = (3080001,)  # ram_usage_exceeded
+
+
+class ResourceExhaustedError(NodeosError):
+    """Cpu or net exhaustion. Usually transient."""
+
+    codes = (
+        3080002,  # tx_net_usage_exceeded
+        3080003,  # block_net_usage_exceeded
+        3080004,  # tx_cpu_usage_exceeded
+        3080005,  # block_cpu_usage_exceeded
+        3080006,  # deadline_exception
+        3080007,  # greylist_net_usage_exceeded
+        3080008,  # greylist_cpu_usage_exceeded
+        3081001,  # leeway_deadline_exception
+    )
+
+
+class AuthorizationError(NodeosError):
+    codes = (
+        3090003,  # unsatisfied_authorization
+        3090004,  # missing_auth_exception
+    )
+
+
+class UnknownBlockError(NodeosError):
+    codes = (3100002,)  # unknown_block_exception
+
+
+_ERRORS_BY_CODE = {
+    code: error_class
+    for error_class in NodeosError.__subclasses__()
+    for code in error_class.codes
+}
+
+
+def nodeos_error(data, *, response=None, url=None, payload=None):
+    """
+    Return the exception matching a nodeos error response, or None.
+
+    data is the json of the response. Unknown error codes return a
+    NodeosError.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("error"), dict):
+        return None
+    error_class = _ERRORS_BY_CODE.get(data["error"].get("code"), NodeosError)
+    return error_class(data=data, response=response, url=url, payload=payload)
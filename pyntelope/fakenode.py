@@ -0,0 +1,556 @@
+"""
+In-process fake of the nodeos chain api.
+
+Useful to test and load-test code using pyntelope without a real node.
+"""
+
+import base64
+import collections
+import datetime as dt
+import hashlib
+import http
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Sequence
+
+import httpx
+
+from . import types, utils
+from .decoder import BLOCK_TIMESTAMP_EPOCH
+from .net import Net
+
+DEFAULT_CHAIN_ID = hashlib.sha256(b"pyntelope fake node").hexdigest()
+
+# nodeos produces a block every half second, 12 blocks per producer round
+BLOCK_INTERVAL_SEC = 0.5
+BLOCKS_PER_PRODUCER = 12
+_BLOCK_SLOT = dt.timedelta(seconds=BLOCK_INTERVAL_SEC)
+
+# messages and statuses of the nodeos http_plugin
+_STATUS_MESSAGES = {
+    400: "Bad Request",
+    401: "UnAuthorized",
+    404: "Not Found",
+    409: "Conflict",
+    429: "Too Many Requests",
+    500: "Internal Service Error",
+}
+
+
+def _status_message(status_code: int) -> str:
+    if status_code in _STATUS_MESSAGES:
+        return _STATUS_MESSAGES[status_code]
+    try:
+        return http.HTTPStatus(status_code).phrase
+    except ValueError:
+        return "Error"
+
+
+def _error(
+    status_code: int,
+    code: int,
+    name: str,
+    what: str,
+    *,
+    message: Optional[str] = None,
+    details: Sequence[str] = (),
+):
+    """Return the status code and body of a nodeos error response."""
+    body = {
+        "code": status_code,
+        "message": message or _status_message(status_code),
+        "error": {
+            "code": code,
+            "name": name,
+            "what": what,
+            "details": [{"message": d} for d in details],
+        },
+    }
+    return status_code, body
+
+
+def _unknown_block_error():
+    return _error(
+        400,
+        3100002,
+        "unknown_block_exception",
+        "Unknown block",
+        message="Unknown Block",
+    )
+
+
+def _unsatisfied_authorization_error(auth: dict):
+    authority = f"{auth['actor']}@{auth['permission']}"
+    return _error(
+        401,
+        3090003,
+        "unsatisfied_authorization",
+        "Provided keys, permissions, and delays do not satisfy declared "
+        "authorizations",
+        details=[
+            f"transaction declares authority '{authority}', "
+            "but does not have signatures for it."
+        ],
+    )
+
+
+def _key_to_int(key) -> int:
+    """Convert a table key or bound (number or account name) to int."""
+    if isinstance(key, int) or str(key).isdigit():
+        return int(key)
+    return int.from_bytes(bytes(types.Name(key)), "little")
+
+
+def _format_time(time_: dt.datetime) -> str:
+    return time_.isoformat(timespec="milliseconds")
+
+
+def _unpack_trx(payload: dict) -> bytes:
+    packed_trx = bytes.fromhex(payload["packed_trx"])
+    if payload.get("compression") not in (None, False, 0, "none"):
+        packed_trx = zlib.decompress(packed_trx)
+    return packed_trx
+
+
+class FakeNode:
+    """
+    In-process fake of a nodeos chain api.
+
+    A new block is produced every block_interval_sec of the clock, with
+    deterministic ids. Pushed transactions are accepted (only duplicates
+    and expired ones are refused) and included in the next block.
+    Table rows and abis are set with set_table_rows and set_abi, and the
+    keys of the account permissions with set_permission_keys.
+
+    Use it from a Net with `fake.net()` (an httpx transport, no sockets)
+    or start a real http server with `fake.serve()`.
+
+    latency_sec: float
+        time waited before answering each request
+    error_rate: float
+        fraction of the requests answered with an internal server error
+    max_requests_per_sec: int
+        requests above this number in the last second are answered with
+        http status 429
+    producers: list[str]
+        block producers, each one producing 12 blocks in turn. Like
+        nodeos, the producer of a block is given by the slot of its
+        timestamp (half seconds since 2000-01-01)
+    irreversible_lag: int
+        number of blocks between the head and the last irreversible block
+    block_interval_sec: float
+    start_time: datetime
+        timestamp of block 1 (now by default, rounded down to a slot)
+    chain_id: str
+    clock: callable
+        returns the current time in seconds (time.monotonic by default)
+    seed: int
+        seed of the random errors
+    """
+
+    host = "http://fakenode.local"
+
+    def __init__(
+        self,
+        *,
+        latency_sec: float = 0.0,
+        error_rate: float = 0.0,
+        max_requests_per_sec: Optional[int] = None,
+        producers: Sequence[str] = ("eosio",),
+        irreversible_lag: int = 2 * BLOCKS_PER_PRODUCER,
+        block_interval_sec: float = BLOCK_INTERVAL_SEC,
+        start_time: Optional[dt.datetime] = None,
+        chain_id: str = DEFAULT_CHAIN_ID,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None,
+    ):
+        self.latency_sec = latency_sec
+        self.error_rate = error_rate
+        self.max_requests_per_sec = max_requests_per_sec
+        self.producers = list(producers)
+        self.irreversible_lag = irreversible_lag
+        self.block_interval_sec = block_interval_sec
+        self.chain_id = chain_id
+        self.clock = clock
+
+        self._start = clock()
+        if start_time is None:
+            now = dt.datetime.utcnow()
+            start_time = now - (now - BLOCK_TIMESTAMP_EPOCH) % _BLOCK_SLOT
+        self._start_time = start_time
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._request_times = collections.deque()
+        self._failures = collections.deque()
+        self._abis = {}
+        self._permission_keys = {}
+        self._tables = {}
+        self._block_transactions = collections.defaultdict(list)
+        self._transaction_ids = set()
+        self._server = None
+        self.request_count = 0
+
+        self._handlers = {
+            "/v1/chain/get_info": self._get_info,
+            "/v1/chain/get_block": self._get_block,
+            "/v1/chain/get_block_info": self._get_block_info,
+            "/v1/chain/get_abi": self._get_abi,
+            "/v1/chain/get_raw_abi": self._get_raw_abi,
+            "/v1/chain/get_account": self._get_account,
+            "/v1/chain/get_producer_schedule": self._get_producer_schedule,
+            "/v1/chain/get_table_rows": self._get_table_rows,
+            "/v1/chain/push_transaction": self._push_transaction,
+            "/v1/chain/send_transaction": self._push_transaction,
+            "/v1/chain/push_transactions": self._push_transactions,
+            "/v1/chain/send_transaction2": self._send_transaction2,
+            "/v1/chain/compute_transaction": self._compute_transaction,
+            "/v1/chain/get_required_keys": self._get_required_keys,
+        }
+
+    # setup
+
+    def set_abi(self, account_name: str, abi: dict):
+        self._abis[account_name] = abi
+
+    def set_table_rows(
+        self,
+        *,
+        code: str,
+        table: str,
+        rows: List[dict],
+        scope: Optional[str] = None,
+        primary_key: str = "id",
+    ):
+        """Set the rows of a table, sorted by the primary_key field."""
+        scope = code if scope is None else scope
+        keyed_rows = [(_key_to_int(row[primary_key]), row) for row in rows]
+        self._tables[(code, scope, table)] = sorted(
+            keyed_rows, key=lambda r: r[0]
+        )
+
+    def set_permission_keys(
+        self, actor: str, permission: str, public_keys: List[str]
+    ):
+        """Set the keys of a permission. Any one of them satisfies it."""
+        self._permission_keys[(actor, permission)] = list(public_keys)
+
+    def fail_next(self, count: int = 1, *, status_code: int = 500):
+        """Answer the next count requests with an error."""
+        with self._lock:
+            self._failures.extend([status_code] * count)
+
+    # clients
+
+    def transport(self) -> httpx.BaseTransport:
+        return httpx.MockTransport(self._handle_httpx_request)
+
+    def client(self) -> httpx.Client:
+        return httpx.Client(transport=self.transport())
+
+    def net(self, **kwargs) -> Net:
+        """Return a Net connected to this fake node without sockets."""
+        return Net(host=self.host, client=self.client(), **kwargs)
+
+    def serve(self, *, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve the api in a background thread and return its url."""
+        handler = type("Handler", (_HttpHandler,), {"node": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return f"http://{host}:{self._server.server_port}"
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # chain state
+
+    def head_block_num(self) -> int:
+        elapsed = self.clock() - self._start
+        return 1 + int(elapsed / self.block_interval_sec)
+
+    def last_irreversible_block_num(self) -> int:
+        return max(1, self.head_block_num() - self.irreversible_lag)
+
+    def block_id(self, block_num: int) -> str:
+        # like nodeos, the id starts with the block number
+        seed = f"{self.chain_id}:{block_num}".encode()
+        return f"{block_num:08x}" + hashlib.sha256(seed).hexdigest()[8:]
+
+    def _block_time(self, block_num: int) -> dt.datetime:
+        elapsed_sec = (block_num - 1) * self.block_interval_sec
+        return self._start_time + dt.timedelta(seconds=elapsed_sec)
+
+    def _producer(self, block_num: int) -> str:
+        time_ = self._block_time(block_num)
+        slot = (time_ - BLOCK_TIMESTAMP_EPOCH) // _BLOCK_SLOT
+        round_ = slot // BLOCKS_PER_PRODUCER
+        return self.producers[round_ % len(self.producers)]
+
+    # requests
+
+    def _handle_httpx_request(self, request: httpx.Request):
+        status_code, body = self.respond(request.url.path, request.content)
+        return httpx.Response(status_code, json=body)
+
+    def respond(self, path: str, content: bytes):
+        """Return the status code and json body answering a request."""
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+        error = self._injected_error()
+        if error is not None:
+            return error
+        return self._dispatch(path, content)
+
+    def _dispatch(self, path: str, content: bytes):
+        if path not in self._handlers:
+            return _error(404, 0, "not_found", f"Unknown endpoint {path}")
+        try:
+            return self._handlers[path](json.loads(content or b"{}"))
+        except (KeyError, TypeError, ValueError) as e:
+            return _error(
+                400,
+                3200006,
+                "invalid_http_request",
+                "invalid http request",
+                message="Invalid Request",
+                details=[repr(e)],
+            )
+
+    def _injected_error(self):
+        with self._lock:
+            self.request_count += 1
+            if self._failures:
+                status_code = self._failures.popleft()
+                return _error(status_code, 0, "injected_error", "Injected")
+            if self._over_throughput():
+                return _error(429, 0, "too_many_requests", "Rate limited")
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _error(500, 0, "injected_error", "Injected")
+        return None
+
+    def _over_throughput(self) -> bool:
+        if self.max_requests_per_sec is None:
+            return False
+        now = self.clock()
+        while self._request_times and self._request_times[0] <= now - 1:
+            self._request_times.popleft()
+        if len(self._request_times) >= self.max_requests_per_sec:
+            return True
+        self._request_times.append(now)
+        return False
+
+    # endpoints
+
+    def _get_info(self, payload: dict):
+        head = self.head_block_num()
+        lib = self.last_irreversible_block_num()
+        return 200, {
+            "server_version": "fakenode",
+            "chain_id": self.chain_id,
+            "head_block_num": head,
+            "last_irreversible_block_num": lib,
+            "last_irreversible_block_id": self.block_id(lib),
+            "head_block_id": self.block_id(head),
+            "head_block_time": _format_time(self._block_time(head)),
+            "head_block_producer": self._producer(head),
+            "fork_db_head_block_num": head,
+            "fork_db_head_block_id": self.block_id(head),
+            "server_version_string": "fakenode",
+        }
+
+    def _find_block_num(self, block_num_or_id) -> Optional[int]:
+        value = str(block_num_or_id)
+        if len(value) == 64:
+            block_num = int(value[:8], 16)
+            if self.block_id(block_num) != value:
+                return None
+        else:
+            block_num = int(value)
+        if not 1 <= block_num <= self.head_block_num():
+            return None
+        return block_num
+
+    def _block_info(self, block_num: int) -> dict:
+        block_id = self.block_id(block_num)
+        previous = self.block_id(block_num - 1) if block_num > 1 else "0" * 64
+        prefix = int.from_bytes(bytes.fromhex(block_id)[8:12], "little")
+        return {
+            "timestamp": _format_time(self._block_time(block_num)),
+            "producer": self._producer(block_num),
+            "confirmed": 0,
+            "previous": previous,
+            "transaction_mroot": "0" * 64,
+            "action_mroot": "0" * 64,
+            "schedule_version": 1,
+            "id": block_id,
+            "block_num": block_num,
+            "ref_block_num": block_num & 0xFFFF,
+            "ref_block_prefix": prefix,
+        }
+
+    def _get_block(self, payload: dict):
+        block_num = self._find_block_num(payload["block_num_or_id"])
+        if block_num is None:
+            return _unknown_block_error()
+        block = self._block_info(block_num)
+        block["transactions"] = list(self._block_transactions[block_num])
+        return 200, block
+
+    def _get_block_info(self, payload: dict):
+        block_num = self._find_block_num(payload["block_num"])
+        if block_num is None:
+            return _unknown_block_error()
+        return 200, self._block_info(block_num)
+
+    def _get_abi(self, payload: dict):
+        account_name = payload["account_name"]
+        data = {"account_name": account_name}
+        if account_name in self._abis:
+            data["abi"] = self._abis[account_name]
+        return 200, data
+
+    def _get_raw_abi(self, payload: dict):
+        account_name = payload["account_name"]
+        raw_abi = b""
+        if account_name in self._abis:
+            raw_abi = types.Abi.from_dict(self._abis[account_name])._packed()
+        abi_hash = hashlib.sha256(raw_abi).hexdigest()
+        data = {"account_name": account_name, "abi_hash": abi_hash}
+        if payload.get("abi_hash") != abi_hash:
+            data["abi"] = base64.b64encode(raw_abi).decode()
+        return 200, data
+
+    def _get_account(self, payload: dict):
+        account_name = payload["account_name"]
+        return 200, {
+            "account_name": account_name,
+            "head_block_num": self.head_block_num(),
+            "privileged": False,
+            "permissions": [],
+        }
+
+    def _get_required_keys(self, payload: dict):
+        available = {
+            utils.public_key_bytes(k) for k in payload["available_keys"]
+        }
+        required = []
+        for action in payload["transaction"]["actions"]:
+            for auth in action["authorization"]:
+                key = self._satisfying_key(auth, available)
+                if key is None:
+                    return _unsatisfied_authorization_error(auth)
+                if key not in required:
+                    required.append(key)
+        return 200, {"required_keys": required}
+
+    def _satisfying_key(self, auth: dict, available: set):
+        keys = self._permission_keys.get((auth["actor"], auth["permission"]))
+        for key in keys or []:
+            if utils.public_key_bytes(key) in available:
+                return key
+        return None
+
+    def _get_producer_schedule(self, payload: dict):
+        producers = [
+            {"producer_name": p, "authority": [0, {}]} for p in self.producers
+        ]
+        active = {"version": 1, "producers": producers}
+        return 200, {"active": active, "pending": None, "proposed": None}
+
+    def _get_table_rows(self, payload: dict):
+        key = (payload["code"], payload["scope"], payload["table"])
+        rows = self._tables.get(key, [])
+        lower = _key_to_int(payload.get("lower_bound") or 0)
+        upper = _key_to_int(payload.get("upper_bound") or 2**64 - 1)
+        rows = [r for r in rows if lower <= r[0] <= upper]
+        if payload.get("reverse"):
+            rows = rows[::-1]
+        limit = int(payload.get("limit", 10))
+        page, rest = rows[:limit], rows[limit:]
+        if payload.get("show_payer"):
+            values = [{"data": r, "payer": payload["code"]} for _, r in page]
+        else:
+            values = [r for _, r in page]
+        next_key = str(rest[0][0]) if rest else ""
+        return 200, {"rows": values, "more": bool(rest), "next_key": next_key}
+
+    def _push_transaction(self, payload: dict):
+        return self._execute(payload, commit=True)
+
+    def _compute_transaction(self, payload: dict):
+        return self._execute(payload["transaction"], commit=False)
+
+    def _execute(self, payload: dict, *, commit: bool):
+        packed_trx = _unpack_trx(payload)
+        transaction_id = hashlib.sha256(packed_trx).hexdigest()
+        expiration = types.UnixTimestamp.from_bytes(packed_trx[:4]).value
+        block_num = self.head_block_num() + 1
+        if expiration <= self._block_time(block_num):
+            return _error(
+                500, 3040005, "expired_tx_exception", "Expired Transaction"
+            )
+        receipt = {
+            "status": "executed",
+            "cpu_usage_us": 100,
+            "net_usage_words": len(packed_trx) // 8 + 1,
+        }
+        with self._lock:
+            if transaction_id in self._transaction_ids:
+                return _error(
+                    409, 3040008, "tx_duplicate", "Duplicate transaction"
+                )
+            if commit:
+                self._transaction_ids.add(transaction_id)
+                self._block_transactions[block_num].append(
+                    {**receipt, "trx": {"id": transaction_id, **payload}}
+                )
+        processed = {
+            "id": transaction_id,
+            "block_num": block_num,
+            "block_time": _format_time(self._block_time(block_num)),
+            "receipt": receipt,
+            "elapsed": 100,
+            "net_usage": receipt["net_usage_words"] * 8,
+            "scheduled": False,
+            "action_traces": [],
+            "except": None,
+        }
+        return 202, {"transaction_id": transaction_id, "processed": processed}
+
+    def _push_transactions(self, payload: list):
+        return 202, [self._push_transaction(p)[1] for p in payload]
+
+    def _send_transaction2(self, payload: dict):
+        return self._push_transaction(payload["transaction"])
+
+
+class _HttpHandler(BaseHTTPRequestHandler):
+    node: FakeNode
+
+    def do_POST(self):
+        length = int(self.headers.get("content-length", 0))
+        content = self.rfile.read(length)
+        status_code, body = self.node.respond(self.path, content)
+        content = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+__all__ = [
+    "FakeNode",
+]
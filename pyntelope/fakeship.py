@@ -0,0 +1,328 @@
+"""
+In-process fake of the state history plugin (SHiP) websocket api.
+
+It serves the blocks of a FakeNode, to test code using ShipClient.
+"""
+
+import datetime as dt
+import json
+import threading
+from typing import List, Optional
+
+import base58
+
+from . import types
+from .decoder import BLOCK_TIMESTAMP_EPOCH, AbiDecoder, _struct
+from .fakenode import FakeNode
+
+# the part of the ship abi used by the fake
+SHIP_ABI = {
+    "version": "eosio::abi/1.1",
+    "types": [{"new_type_name": "transaction_id", "type": "checksum256"}],
+    "structs": [
+        _struct("get_status_request_v0", ""),
+        _struct("block_position", "block_num uint32, block_id checksum256"),
+        _struct(
+            "get_status_result_v0",
+            "head block_position, last_irreversible block_position, "
+            "trace_begin_block uint32, trace_end_block uint32, "
+            "chain_state_begin_block uint32, chain_state_end_block uint32, "
+            "chain_id checksum256$",
+        ),
+        _struct(
+            "get_blocks_request_v0",
+            "start_block_num uint32, end_block_num uint32, "
+            "max_messages_in_flight uint32, have_positions block_position[], "
+            "irreversible_only bool, fetch_block bool, fetch_traces bool, "
+            "fetch_deltas bool",
+        ),
+        _struct("get_blocks_ack_request_v0", "num_messages uint32"),
+        _struct(
+            "get_blocks_result_v0",
+            "head block_position, last_irreversible block_position, "
+            "this_block block_position?, prev_block block_position?, "
+            "block bytes?, traces bytes?, deltas bytes?",
+        ),
+        _struct("row", "present bool, data bytes"),
+        _struct("table_delta_v0", "name string, rows row[]"),
+        _struct("account_delta", "account name, delta int64"),
+        _struct(
+            "transaction_trace_v0",
+            "id checksum256, status uint8, cpu_usage_us uint32, "
+            "net_usage_words varuint32, elapsed int64, net_usage uint64, "
+            "scheduled bool, action_traces action_trace[], "
+            "account_ram_delta account_delta?, except string?, "
+            "error_code uint64?, failed_dtrx_trace transaction_trace?, "
+            "partial partial_transaction?",
+        ),
+        _struct("extension", "type uint16, data bytes"),
+        _struct(
+            "producer_key", "producer_name name, block_signing_key public_key"
+        ),
+        _struct(
+            "producer_schedule", "version uint32, producers producer_key[]"
+        ),
+        _struct(
+            "transaction_receipt_header",
+            "status uint8, cpu_usage_us uint32, net_usage_words varuint32",
+        ),
+        _struct(
+            "packed_transaction",
+            "signatures signature[], compression uint8, "
+            "packed_context_free_data bytes, packed_trx bytes",
+        ),
+        _struct(
+            "transaction_receipt",
+            "trx transaction_variant",
+            base="transaction_receipt_header",
+        ),
+        _struct(
+            "block_header",
+            "timestamp block_timestamp_type, producer name, confirmed uint16, "
+            "previous checksum256, transaction_mroot checksum256, "
+            "action_mroot checksum256, schedule_version uint32, "
+            "new_producers producer_schedule?, header_extensions extension[]",
+        ),
+        _struct(
+            "signed_block_header",
+            "producer_signature signature",
+            base="block_header",
+        ),
+        _struct(
+            "signed_block",
+            "transactions transaction_receipt[], "
+            "block_extensions extension[]",
+            base="signed_block_header",
+        ),
+    ],
+    "variants": [
+        {
+            "name": "request",
+            "types": [
+                "get_status_request_v0",
+                "get_blocks_request_v0",
+                "get_blocks_ack_request_v0",
+            ],
+        },
+        {
+            "name": "result",
+            "types": ["get_status_result_v0", "get_blocks_result_v0"],
+        },
+        {"name": "transaction_trace", "types": ["transaction_trace_v0"]},
+        {
+            "name": "transaction_variant",
+            "types": ["transaction_id", "packed_transaction"],
+        },
+        {"name": "table_delta", "types": ["table_delta_v0"]},
+    ],
+    "tables": [],
+}
+
+_STATUS_RESULT = 0
+_BLOCKS_RESULT = 1
+
+
+def _optional(bytes_: Optional[bytes]) -> bytes:
+    if bytes_ is None:
+        return bytes(types.Bool(False))
+    return bytes(types.Bool(True)) + bytes_
+
+
+def _sized(bytes_: bytes) -> bytes:
+    return bytes(types.Varuint32(len(bytes_))) + bytes_
+
+
+def _array(items: List[bytes]) -> bytes:
+    return bytes(types.Varuint32(len(items))) + b"".join(items)
+
+
+def _signature(signature: str) -> bytes:
+    # K1 key type, then the data without the checksum
+    data = base58.b58decode(signature[len("SIG_K1_") :])  # NOQA: E203
+    return b"\x00" + data[:-4]
+
+
+def _block_timestamp(time_: dt.datetime) -> bytes:
+    slot = (time_ - BLOCK_TIMESTAMP_EPOCH) // dt.timedelta(milliseconds=500)
+    return bytes(types.Uint32(slot))
+
+
+class FakeShip:
+    """
+    In-process fake of the state history plugin of a FakeNode.
+
+    It streams the node blocks with the get_blocks_request flow control,
+    and answers get_status_request. Blocks have the transactions pushed
+    to the node, traces have no action traces and deltas are empty.
+    Only the part of the ship abi needed is sent (SHIP_ABI).
+
+    Requires the websockets package (pip install pyntelope[ship]).
+
+    node: FakeNode
+    poll_sec: float
+        time between checks for new blocks when the head is reached
+    """
+
+    def __init__(self, node: FakeNode, *, poll_sec: float = 0.05):
+        self.node = node
+        self.poll_sec = poll_sec
+        self._decoder = AbiDecoder(SHIP_ABI)
+        self._server = None
+
+    def serve(self, *, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve the websocket in a background thread and return its url."""
+        from websockets.sync.server import serve  # NOQA: I001
+
+        self._server = serve(self._handle, host, port, compression=None)
+        thread = threading.Thread(target=self._server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return f"ws://{host}:{self._server.socket.getsockname()[1]}"
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+    def _handle(self, websocket):
+        from websockets.exceptions import ConnectionClosed  # NOQA: I001
+
+        websocket.send(json.dumps(SHIP_ABI))
+        try:
+            for message in websocket:
+                self._respond(websocket, message)
+        except ConnectionClosed:
+            pass
+
+    def _respond(self, websocket, message: bytes):
+        name, request = self._decoder.decode("request", message)
+        if name == "get_status_request_v0":
+            websocket.send(self._status_result())
+        elif name == "get_blocks_request_v0":
+            _BlockStream(self, websocket, request).run()
+
+    def _position(self, block_num: int) -> bytes:
+        block_id = bytes.fromhex(self.node.block_id(block_num))
+        return bytes(types.Uint32(block_num)) + block_id
+
+    def _head_positions(self) -> bytes:
+        head = self.node.head_block_num()
+        lib = self.node.last_irreversible_block_num()
+        return self._position(head) + self._position(lib)
+
+    def _status_result(self) -> bytes:
+        head = self.node.head_block_num()
+        bytes_ = bytes(types.Varuint32(_STATUS_RESULT))
+        bytes_ += self._head_positions()
+        for block_num in [1, head + 1, 1, head + 1]:
+            bytes_ += bytes(types.Uint32(block_num))
+        bytes_ += bytes.fromhex(self.node.chain_id)
+        return bytes_
+
+    def _blocks_result(self, block_num: int, request: dict) -> bytes:
+        contents = [
+            (request["fetch_block"], self._block),
+            (request["fetch_traces"], self._traces),
+            (request["fetch_deltas"], lambda _: _array([])),
+        ]
+        bytes_ = bytes(types.Varuint32(_BLOCKS_RESULT))
+        bytes_ += self._head_positions()
+        bytes_ += _optional(self._position(block_num))
+        previous = self._position(block_num - 1) if block_num > 1 else None
+        bytes_ += _optional(previous)
+        for fetch, pack in contents:
+            bytes_ += _optional(_sized(pack(block_num)) if fetch else None)
+        return bytes_
+
+    def _block(self, block_num: int) -> bytes:
+        node = self.node
+        previous = node.block_id(block_num - 1) if block_num > 1 else "0" * 64
+        bytes_ = _block_timestamp(node._block_time(block_num))
+        bytes_ += bytes(types.Name(node._producer(block_num)))
+        bytes_ += bytes(types.Uint16(0))
+        bytes_ += bytes.fromhex(previous)
+        bytes_ += bytes(64)  # transaction_mroot and action_mroot
+        bytes_ += bytes(types.Uint32(0)) + _optional(None) + _array([])
+        bytes_ += b"\x00" + bytes(65)  # producer_signature
+        receipts = node._block_transactions.get(block_num, [])
+        bytes_ += _array([self._receipt(r) for r in receipts])
+        bytes_ += _array([])  # block_extensions
+        return bytes_
+
+    def _receipt(self, receipt: dict) -> bytes:
+        trx = receipt["trx"]
+        bytes_ = bytes(types.Uint8(0))  # executed
+        bytes_ += bytes(types.Uint32(receipt["cpu_usage_us"]))
+        bytes_ += bytes(types.Varuint32(receipt["net_usage_words"]))
+        bytes_ += bytes(types.Varuint32(1))  # packed_transaction
+        bytes_ += _array([_signature(s) for s in trx["signatures"]])
+        bytes_ += bytes(types.Uint8(1 if trx.get("compression") else 0))
+        context_free_data = trx.get("packed_context_free_data") or ""
+        bytes_ += _sized(bytes.fromhex(context_free_data))
+        bytes_ += _sized(bytes.fromhex(trx["packed_trx"]))
+        return bytes_
+
+    def _traces(self, block_num: int) -> bytes:
+        receipts = self.node._block_transactions.get(block_num, [])
+        return _array([self._trace(r) for r in receipts])
+
+    def _trace(self, receipt: dict) -> bytes:
+        bytes_ = bytes(types.Varuint32(0))  # transaction_trace_v0
+        bytes_ += bytes.fromhex(receipt["trx"]["id"])
+        bytes_ += bytes(types.Uint8(0))  # executed
+        bytes_ += bytes(types.Uint32(receipt["cpu_usage_us"]))
+        bytes_ += bytes(types.Varuint32(receipt["net_usage_words"]))
+        bytes_ += bytes(types.Int64(receipt["cpu_usage_us"]))  # elapsed
+        bytes_ += bytes(types.Uint64(receipt["net_usage_words"] * 8))
+        bytes_ += bytes(types.Bool(False))  # scheduled
+        bytes_ += _array([])  # action_traces
+        # account_ram_delta, except, error_code, failed_dtrx_trace, partial
+        bytes_ += _optional(None) * 5
+        return bytes_
+
+
+class _BlockStream:
+    """Send the blocks of a get_blocks_request, waiting for acks."""
+
+    def __init__(self, ship: FakeShip, websocket, request: dict):
+        self.ship = ship
+        self.websocket = websocket
+        self.request = request
+        self.next_block_num = max(1, request["start_block_num"])
+        self.in_flight = 0
+
+    def run(self):
+        while self.next_block_num < self.request["end_block_num"]:
+            if self._can_send():
+                message = self.ship._blocks_result(
+                    self.next_block_num, self.request
+                )
+                self.websocket.send(message)
+                self.next_block_num += 1
+                self.in_flight += 1
+            else:
+                self._wait_ack()
+
+    def _can_send(self) -> bool:
+        node = self.ship.node
+        if self.request["irreversible_only"]:
+            last_block_num = node.last_irreversible_block_num()
+        else:
+            last_block_num = node.head_block_num()
+        in_flight_ok = self.in_flight < self.request["max_messages_in_flight"]
+        return in_flight_ok and self.next_block_num <= last_block_num
+
+    def _wait_ack(self):
+        try:
+            message = self.websocket.recv(timeout=self.ship.poll_sec)
+        except TimeoutError:
+            return
+        name, request = self.ship._decoder.decode("request", message)
+        if name == "get_blocks_ack_request_v0":
+            self.in_flight -= request["num_messages"]
+
+
+__all__ = [
+    "FakeShip",
+    "SHIP_ABI",
+]
@@ -0,0 +1,259 @@
+"""Track the finality of many transactions from a single block stream."""
+
+import datetime as dt
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterator, Optional, Set, Union
+
+import httpx
+import pydantic
+
+from . import exc
+from .blocks import BLOCK_INTERVAL_SEC, BlockFollower, NewBlock, Rollback
+from .net import Net
+
+logger = logging.getLogger(__name__)
+
+# number of latencies remembered by the tracker
+MAX_LATENCIES = 10000
+# the wait before following the chain again after a request error doubles
+# up to this
+MAX_RETRY_DELAY_SEC = 30
+
+
+class FinalityEvent(pydantic.BaseModel):
+    """
+    A change in the state of a tracked transaction.
+
+    transaction_id: str
+    status: str
+        "included", "forked_out", "irreversible" or "expired"
+    block_num: int
+        the block including the transaction (None when expired)
+    latency_sec: float
+        seconds since the transaction was tracked
+    """
+
+    transaction_id: str
+    status: str
+    block_num: Optional[int]
+    latency_sec: float
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class _Tracked:
+    def __init__(self, *, expiration, callback, sent_at):
+        self.expiration = expiration
+        self.callback = callback
+        self.sent_at = sent_at
+        self.block_num = None
+        self.future = Future()
+
+
+def _transaction_ids(block: dict) -> Iterator:
+    for receipt in block.get("transactions", []):
+        trx = receipt["trx"]
+        # deferred transactions only have their id
+        yield trx["id"] if isinstance(trx, dict) else trx
+
+
+class FinalityTracker:
+    """
+    Resolve the finality of many pending transactions from one block stream.
+
+    Track each transaction right before sending it (its id and expiration
+    are known once it is linked), so it can't be included in a block
+    already processed. Every block is fetched once for all the tracked
+    transactions, and events are emitted when a transaction is included
+    in a block, forked out (and pending again), becomes irreversible or
+    expires without being included.
+
+    track returns a future resolved with the final event ("irreversible"
+    or "expired"). The optional callback gets every event.
+    The latencies from tracking to inclusion and to finality are kept in
+    inclusion_latencies and finality_latencies.
+
+    Run the tracker with start() (background thread) or run(), or feed it
+    the events of a BlockFollower you already have with process() and
+    set_last_irreversible_block_num(). Request errors while following the
+    chain are logged and retried with backoff. Any other error stops the
+    tracker and is set as the exception of the pending futures.
+    Exceptions raised by callbacks are logged.
+
+    net: Net
+    start_block: int
+        first block to look for transactions. Default is the head when
+        the tracker starts: track transactions sent before that with it
+    """
+
+    def __init__(self, net: Net, *, start_block: Optional[int] = None):
+        self.net = net
+        self.start_block = start_block
+        self.last_irreversible_block_num = 0
+        self.inclusion_latencies = deque(maxlen=MAX_LATENCIES)
+        self.finality_latencies = deque(maxlen=MAX_LATENCIES)
+        self._tracked: Dict[str, _Tracked] = {}
+        self._included: Dict[int, Set[str]] = {}
+        self._expirations = []
+        # callbacks may track new transactions
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._follower = None
+
+    def track(
+        self,
+        transaction_id: str,
+        *,
+        expiration: dt.datetime,
+        callback: Optional[Callable[[FinalityEvent], None]] = None,
+    ) -> Future:
+        """
+        Track a transaction by its id (LinkedTransaction.id()).
+
+        A transaction already tracked keeps its future and callback: the
+        same future is returned.
+
+        expiration: datetime
+            the transaction expiration (LinkedTransaction.expiration)
+        """
+        tracked = _Tracked(
+            expiration=expiration, callback=callback, sent_at=time.monotonic()
+        )
+        with self._lock:
+            if transaction_id in self._tracked:
+                return self._tracked[transaction_id].future
+            self._tracked[transaction_id] = tracked
+            heapq.heappush(self._expirations, (expiration, transaction_id))
+        return tracked.future
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._tracked)
+
+    def process(self, event: Union[NewBlock, Rollback]):
+        """Update the tracked transactions with a block stream event."""
+        with self._lock:
+            if isinstance(event, Rollback):
+                self._rollback(event.block_num)
+            else:
+                self._add_block(event.block_num, event.block)
+
+    def set_last_irreversible_block_num(self, block_num: int):
+        """Finalize the transactions included up to block_num."""
+        with self._lock:
+            self.last_irreversible_block_num = block_num
+            for num in sorted(n for n in self._included if n <= block_num):
+                for transaction_id in self._included.pop(num):
+                    self._finish(transaction_id, "irreversible", num)
+
+    def run(self):
+        """Follow the chain head and process its blocks until stop()."""
+        follower = BlockFollower(self.net, start_block=self.start_block)
+        self._follower = follower
+        try:
+            self._follow(follower)
+        except Exception as e:
+            self._fail_pending(e)
+            raise
+
+    def _follow(self, follower: BlockFollower):
+        delay = BLOCK_INTERVAL_SEC
+        while not self._stop.is_set():
+            try:
+                # iterating again continues after the last block processed
+                for event in follower:
+                    self.process(event)
+                    lib = follower.last_irreversible_block_num
+                    self.set_last_irreversible_block_num(lib)
+                    delay = BLOCK_INTERVAL_SEC
+            except (exc.ConnectionError, httpx.HTTPError) as e:
+                logger.warning(f"Following the chain failed: {e!r}")
+                self._stop.wait(delay)
+                delay = min(2 * delay, MAX_RETRY_DELAY_SEC)
+
+    def _fail_pending(self, error: Exception):
+        with self._lock:
+            pending = list(self._tracked.values())
+            self._tracked.clear()
+            self._included.clear()
+            self._expirations.clear()
+        for tracked in pending:
+            tracked.future.set_exception(error)
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        # the follower is set before run checks the stop flag
+        if self._follower is not None:
+            self._follower.stop()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _add_block(self, block_num: int, block: dict):
+        for transaction_id in _transaction_ids(block):
+            tracked = self._tracked.get(transaction_id)
+            if tracked is None or tracked.block_num is not None:
+                continue
+            tracked.block_num = block_num
+            self._included.setdefault(block_num, set()).add(transaction_id)
+            event = self._emit(transaction_id, "included", block_num)
+            self.inclusion_latencies.append(event.latency_sec)
+        if "timestamp" in block:
+            self._expire(dt.datetime.fromisoformat(block["timestamp"]))
+
+    def _rollback(self, block_num: int):
+        for transaction_id in self._included.pop(block_num, ()):
+            tracked = self._tracked[transaction_id]
+            tracked.block_num = None
+            heapq.heappush(
+                self._expirations, (tracked.expiration, transaction_id)
+            )
+            self._emit(transaction_id, "forked_out", block_num)
+
+    def _expire(self, block_time: dt.datetime):
+        while self._expirations and self._expirations[0][0] < block_time:
+            _, transaction_id = heapq.heappop(self._expirations)
+            tracked = self._tracked.get(transaction_id)
+            if tracked is not None and tracked.block_num is None:
+                self._finish(transaction_id, "expired", None)
+
+    def _finish(self, transaction_id: str, status: str, block_num):
+        tracked = self._tracked.pop(transaction_id)
+        event = self._emit(transaction_id, status, block_num, tracked)
+        if status == "irreversible":
+            self.finality_latencies.append(event.latency_sec)
+        tracked.future.set_result(event)
+
+    def _emit(self, transaction_id, status, block_num, tracked=None):
+        tracked = tracked or self._tracked[transaction_id]
+        event = FinalityEvent(
+            transaction_id=transaction_id,
+            status=status,
+            block_num=block_num,
+            latency_sec=time.monotonic() - tracked.sent_at,
+        )
+        if tracked.callback is not None:
+            try:
+                tracked.callback(event)
+            except Exception:
+                logger.exception(f"Callback of {transaction_id} failed")
+        return event
+
+
+__all__ = [
+    "FinalityEvent",
+    "FinalityTracker",
+]
@@ -0,0 +1,109 @@
+"""Sign transactions with the keys required by their authorizations."""
+
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from . import exc, utils
+from .transaction import LinkedTransaction, SignedTransaction
+
+_CacheKey = Tuple[str, FrozenSet[Tuple[str, str]]]
+
+
+def _cache_key(transaction: LinkedTransaction) -> _CacheKey:
+    permissions = frozenset(
+        (auth.actor, auth.permission)
+        for action in transaction.actions
+        for auth in action.authorization
+    )
+    return transaction.chain_id, permissions
+
+
+class Keyring:
+    """
+    Hold many private keys and sign transactions with the required ones.
+
+    The keys needed by a transaction are asked to the node
+    (get_required_keys) and cached by chain and set of authorizations
+    (actor and permission of every action), so transactions with the same
+    authorizations don't repeat the call until ttl_sec passes. Keep the
+    ttl short if the permissions of the accounts may change.
+
+    A keyring can be shared by many threads.
+
+    keys: list[str]
+        private keys
+    ttl_sec: float
+        time the required keys of a set of authorizations are cached
+    clock: callable
+        returns the current time in seconds (time.monotonic by default)
+    """
+
+    def __init__(
+        self,
+        keys: Optional[List[str]] = None,
+        *,
+        ttl_sec: float = 60,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_sec = ttl_sec
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._keys: Dict[bytes, str] = {}
+        self._public_keys: List[str] = []
+        self._cache: Dict[_CacheKey, Tuple[float, Tuple[str, ...]]] = {}
+        for key in keys or []:
+            self.add(key)
+
+    def add(self, key: str):
+        """Add a private key."""
+        public_key = utils.public_key(key)
+        with self._lock:
+            point = utils.public_key_bytes(public_key)
+            if point not in self._keys:
+                self._keys[point] = key
+                self._public_keys.append(public_key)
+            # a new key may change the keys required before
+            self._cache.clear()
+
+    def public_keys(self) -> List[str]:
+        with self._lock:
+            return list(self._public_keys)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def required_keys(self, transaction: LinkedTransaction) -> List[str]:
+        """Return the private keys needed to sign a linked transaction."""
+        cache_key = _cache_key(transaction)
+        now = self.clock()
+        with self._lock:
+            cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            return list(cached[1])
+
+        keys = self._get_required_keys(transaction)
+        with self._lock:
+            self._cache[cache_key] = (now + self.ttl_sec, keys)
+        return list(keys)
+
+    def sign(self, transaction: LinkedTransaction) -> SignedTransaction:
+        """Sign a linked transaction with exactly the keys it requires."""
+        return transaction.sign_many(self.required_keys(transaction))
+
+    def _get_required_keys(self, transaction) -> Tuple[str, ...]:
+        data = transaction.net.get_required_keys(
+            transaction=transaction, available_keys=self.public_keys()
+        )
+        error = exc.nodeos_error(data)
+        if error is not None:
+            raise error
+        points = [utils.public_key_bytes(k) for k in data["required_keys"]]
+        with self._lock:
+            return tuple(self._keys[point] for point in points)
+
+
+__all__ = [
+    "Keyring",
+]
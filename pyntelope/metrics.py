@@ -0,0 +1,170 @@
+"""Metrics of the requests made to the blockchain nodes."""
+
+import bisect
+import threading
+from typing import Dict, Tuple
+
+# upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS_SEC = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _Series:
+    """Metrics of one host and api."""
+
+    def __init__(self):
+        self.requests = {}  # status -> count
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS_SEC) + 1)
+        self.latency_sum = 0.0
+
+    def to_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for le, count in zip(LATENCY_BUCKETS_SEC, self.latency_buckets):
+            cumulative += count
+            buckets[le] = cumulative
+        buckets[float("inf")] = sum(self.latency_buckets)
+        return dict(
+            requests=dict(self.requests),
+            bytes_sent=self.bytes_sent,
+            bytes_received=self.bytes_received,
+            latency=dict(
+                count=buckets[float("inf")],
+                sum=self.latency_sum,
+                buckets=buckets,
+            ),
+        )
+
+
+class Metrics:
+    """
+    Count requests, errors, bytes and latency per host and api.
+
+    Use it with `Net(..., metrics=Metrics())`. The same object can be
+    shared by many nets. Nets without metrics don't record anything.
+
+    The status of a request is its http status code or, when no response
+    was received, the class name of the transport error (like
+    "ConnectTimeout").
+    Bytes are the sizes of the request and response bodies.
+    """
+
+    def __init__(self):
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        *,
+        host: str,
+        api: str,
+        status: str,
+        duration_sec: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_SEC, duration_sec)
+        with self._lock:
+            series = self._series.get((host, api))
+            if series is None:
+                series = self._series[(host, api)] = _Series()
+            series.requests[status] = series.requests.get(status, 0) + 1
+            series.bytes_sent += bytes_sent
+            series.bytes_received += bytes_received
+            series.latency_buckets[bucket] += 1
+            series.latency_sum += duration_sec
+
+    def snapshot(self) -> list:
+        """
+        Return a list with the current metrics of each host and api.
+
+        Latency buckets are cumulative, keyed by their upper bound.
+        """
+        with self._lock:
+            snapshot = [
+                dict(host=host, api=api, **series.to_dict())
+                for (host, api), series in sorted(self._series.items())
+            ]
+        return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._series = {}
+
+    def _reset_after_fork(self):
+        # locks held by other threads of the parent are never released
+        self._lock = threading.Lock()
+
+    def to_prometheus(self) -> str:
+        """Return the metrics in the prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = _requests_lines(snapshot)
+
+        for direction in ["sent", "received"]:
+            name = f"pyntelope_bytes_{direction}_total"
+            lines.append(f"# HELP {name} Body bytes {direction}.")
+            lines.append(f"# TYPE {name} counter")
+            for s in snapshot:
+                labels = _labels(host=s["host"], api=s["api"])
+                lines.append(f"{name}{labels} {s[f'bytes_{direction}']}")
+
+        name = "pyntelope_request_duration_seconds"
+        lines.append(f"# HELP {name} Request latency.")
+        lines.append(f"# TYPE {name} histogram")
+        for s in snapshot:
+            lines += _histogram_lines(name, s)
+
+        return "\n".join(lines) + "\n"
+
+
+def _requests_lines(snapshot: list) -> list:
+    name = "pyntelope_requests_total"
+    lines = [
+        f"# HELP {name} Requests made to the nodes.",
+        f"# TYPE {name} counter",
+    ]
+    for s in snapshot:
+        for status, count in sorted(s["requests"].items()):
+            labels = _labels(host=s["host"], api=s["api"], status=status)
+            lines.append(f"{name}{labels} {count}")
+    return lines
+
+
+def _histogram_lines(name: str, series: dict) -> list:
+    host, api, latency = series["host"], series["api"], series["latency"]
+    lines = []
+    for le, count in latency["buckets"].items():
+        le = "+Inf" if le == float("inf") else repr(le)
+        labels = _labels(host=host, api=api, le=le)
+        lines.append(f"{name}_bucket{labels} {count}")
+    labels = _labels(host=host, api=api)
+    lines.append(f"{name}_sum{labels} {latency['sum']}")
+    lines.append(f"{name}_count{labels} {latency['count']}")
+    return lines
+
+
+def _labels(**labels) -> str:
+    def escape(value):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        return value.replace("\n", "\\n")
+
+    pairs = [f'{k}="{escape(v)}"' for k, v in labels.items()]
+    return "{" + ",".join(pairs) + "}"
+
+
+__all__ = [
+    "Metrics",
+]
@@ -6,16 +6,30 @@ https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api
 """
 
 import base64
+import contextlib
+import importlib.util
+import itertools
+import json
 import logging
+import os
+import threading
+import time
 import types
-from typing import Optional, Type, Union
-from urllib.parse import urljoin
+import weakref
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional, Type, Union
+from urllib.parse import urljoin, urlsplit
 
 import httpx
 import pydantic
 
 from pyntelope import exc
 from pyntelope._version import __version__
+from pyntelope.cache import BlockCache
+from pyntelope.metrics import Metrics
+from pyntelope.ratelimit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -26,18 +40,237 @@ DEPRECATION_WARNING = (
     "They will also be removed from pyntelope in a future version."
 )
 
+# transactions of this serialized size (or bigger) are compressed by default
+COMPRESSION_THRESHOLD_BYTES = 1024
+
+# endpoints that change the chain state and must never be coalesced
+WRITE_ENDPOINTS = frozenset(
+    {
+        "/v1/chain/push_transaction",
+        "/v1/chain/push_transactions",
+        "/v1/chain/send_transaction2",
+    }
+)
+
+
+# nets of this process, reset in the child process after a fork
+_NETS = weakref.WeakSet()
+
+
+def _reset_nets_after_fork():
+    for net in list(_NETS):
+        net._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_nets_after_fork)
+
+
+class _SingleFlight:
+    """
+    Share the result of identical calls that are in flight at the same time.
+
+    The first caller for a key runs the function, every other caller
+    arriving before it finishes waits and receives the same result (or
+    exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key: tuple, fn: Callable):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return result
+
+
+def _ordered_map(fn: Callable, items, concurrency: int) -> Iterator:
+    """
+    Yield fn(item) for each item, in order, running up to concurrency calls.
+
+    Only the results of the calls in flight are held in memory.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        first_items = itertools.islice(items, concurrency)
+        pending = deque(executor.submit(fn, i) for i in first_items)
+        while pending:
+            result = pending.popleft().result()
+            for i in itertools.islice(items, 1):
+                pending.append(executor.submit(fn, i))
+            yield result
+
+
+def _map_unique(fn: Callable, items, concurrency: int) -> dict:
+    """
+    Return a dict with fn(item) for each unique item, running concurrently.
+
+    Request errors don't stop the other calls: the exception is returned
+    as the value of its item. So are the nodeos errors answered with a
+    500 (like the "unknown key" of an account that doesn't exist), that
+    the single requests return as data.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1. {concurrency=}")
+
+    def call(item):
+        try:
+            data = fn(item)
+        except (exc.ConnectionError, httpx.HTTPError) as e:
+            return e
+        return exc.nodeos_error(data) or data
+
+    items = list(dict.fromkeys(items))
+    return dict(zip(items, _ordered_map(call, items, concurrency)))
+
+
+def _raise_for_status(*, resp: httpx.Response, url: str, payload):
+    """
+    Raise an error for http errors, except 500.
+
+    Nodeos errors answered with 500 are returned as data for backwards
+    compatibility. Other nodeos errors raise their exc.NodeosError.
+    """
+    if resp.status_code <= 299 or resp.status_code == 500:
+        return
+    try:
+        data = resp.json()
+    except ValueError:
+        data = None
+    error = exc.nodeos_error(data, response=resp, url=url, payload=payload)
+    raise error or exc.ConnectionError(
+        response=resp, url=url, payload=payload, error=None
+    )
+
+
+def _require_h2():
+    if importlib.util.find_spec("h2") is None:
+        raise ImportError(
+            "http2=True requires the h2 package. "
+            "Install it with: pip install pyntelope[http2]"
+        )
+
+
+def _packed_transaction(
+    *,
+    transaction: object,
+    compression: Optional[bool] = None,
+    packed_context_free_data: str = "",
+) -> dict:
+    """
+    Return a transaction in the format expected by the push apis.
+
+    Linked (unsigned) transactions are packed without signatures.
+
+    If compression is None, the transaction is zlib compressed when its
+    serialized size reaches COMPRESSION_THRESHOLD_BYTES.
+    """
+    packed_trx = transaction.pack()
+    if compression is None:
+        compression = len(packed_trx) // 2 >= COMPRESSION_THRESHOLD_BYTES
+    if compression:
+        packed_trx = _zlib_compress_hex(packed_trx)
+        packed_context_free_data = _zlib_compress_hex(packed_context_free_data)
+    packed_transaction = dict(
+        signatures=getattr(transaction, "signatures", ()),
+        compression=compression,
+        packed_context_free_data=packed_context_free_data,
+        packed_trx=packed_trx,
+    )
+    return packed_transaction
+
+
+def _transaction_json(transaction: object) -> dict:
+    """Return a linked transaction in the json format of the chain api."""
+    actions = [
+        dict(
+            account=action.account,
+            name=action.name,
+            authorization=[a.dict() for a in action.authorization],
+            data=b"".join(bytes(d) for d in action.data).hex(),
+        )
+        for action in transaction.actions
+    ]
+    return dict(
+        expiration=transaction.expiration.strftime("%Y-%m-%dT%H:%M:%S"),
+        ref_block_num=int(transaction.ref_block_num),
+        ref_block_prefix=int(transaction.ref_block_prefix),
+        max_net_usage_words=transaction.max_net_usage_words,
+        max_cpu_usage_ms=transaction.max_cpu_usage_ms,
+        delay_sec=transaction.delay_sec,
+        context_free_actions=[],
+        actions=actions,
+        transaction_extensions=[],
+    )
+
+
+def _zlib_compress_hex(hex_: str) -> str:
+    if not hex_:
+        return ""
+    return zlib.compress(bytes.fromhex(hex_)).hex()
+
 
 class Net:
     """
     A Net is an interface to the blockchain network api.
 
     It holds the connection information and methods for some of its endpoints
+
+    A net can be shared by many threads. In a child process created with
+    fork, a net used as a context manager gets a new client (connection
+    pool), and its locks are recreated, along with the ones of its block
+    cache (which reopens its sqlite file) and of its routers and their nets.
     host: any http url
         the address of the host you're connecting to
     headers: dict
         optional if you want to send a custom header in the request
     auth: tuple
         optional if your host requires basic http authentication
+    coalesce: bool
+        identical read requests (same endpoint and payload) made at the
+        same time from different threads share a single http call
+    block_cache: BlockCache
+        optional cache where get_block stores and looks for irreversible
+        blocks
+    metrics: Metrics
+        optional recorder of the count, status, size and latency of the
+        http requests made by this net
+    rate_limiter: RateLimiter
+        optional limit of requests per second and concurrent requests,
+        shared by every thread using this net
+    router: ProducerRouter | NetPool
+        optional router choosing the net the transactions are sent to,
+        like the net of the next block producer
+    read_router: NetPool
+        optional router choosing the net for every other request. With
+        different pools for reads and writes, heavy reads don't slow down
+        the transactions
+    http2: bool
+        use HTTP/2 when the host supports it, so one connection carries
+        many concurrent requests. The net keeps a single client for all
+        its requests. Requires the h2 package (pip install pyntelope[http2]).
+        httpx only negotiates HTTP/2 over TLS: cleartext http:// hosts stay
+        on HTTP/1.1. A client passed in is used as is: create it with
+        http2=True
     """
 
     def __init__(
@@ -47,31 +280,41 @@ class Net:
         headers: dict = dict(),
         auth: Optional[tuple] = None,
         client: Optional[Union[httpx.Client, httpx.AsyncClient]] = None,
+        coalesce: bool = True,
+        block_cache: Optional[BlockCache] = None,
+        metrics: Optional[Metrics] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        router: Optional[object] = None,
+        read_router: Optional[object] = None,
+        http2: bool = False,
     ):
         pydantic.parse_obj_as(pydantic.AnyHttpUrl, host)
         self.host = host
         self.headers = headers
         self.auth = auth
         self.client = client
+        self.coalesce = coalesce
+        self._inflight = _SingleFlight()
+        self.block_cache = block_cache
+        self.metrics = metrics
+        self.rate_limiter = rate_limiter
+        self.router = router
+        self.read_router = read_router
+        self.http2 = http2
+        self._owns_client = False
+        self._resetting_after_fork = False
+        if http2 and client is None:
+            _require_h2()
+            # multiplexing needs the connection to outlive each request
+            self.client = self._new_client()
+            self._owns_client = True
+        _NETS.add(self)
 
     def __new__(cls, *args, **kwargs):
         if hasattr(cls, "default_host"):
 
-            def __init__(
-                self,
-                *,
-                host: str = cls.default_host,
-                headers: dict = dict(),
-                auth: Optional[tuple] = None,
-                client: Optional[
-                    Union[httpx.Client, httpx.AsyncClient]
-                ] = None,
-            ):
-                pydantic.parse_obj_as(pydantic.AnyHttpUrl, host)
-                self.host = host
-                self.headers = headers
-                self.auth = auth
-                self.client = client
+            def __init__(self, *, host: str = cls.default_host, **kwargs):
+                Net.__init__(self, host=host, **kwargs)
 
             cls.__init__ = __init__
 
@@ -81,10 +324,26 @@ class Net:
         self,
         *,
         endpoint: str,
-        payload: Optional[dict] = dict(),
+        payload: Optional[Union[dict, list]] = dict(),
     ):
+        read_net = self._read_net(endpoint)
+        if read_net is not self:
+            return read_net._request(endpoint=endpoint, payload=payload)
+
         url = urljoin(self.host, endpoint)
 
+        if self.coalesce and endpoint not in WRITE_ENDPOINTS:
+            key = (url, json.dumps(payload, sort_keys=True, default=str))
+            resp = self._inflight.do(
+                key, lambda: self._post(url=url, payload=payload)
+            )
+        else:
+            resp = self._post(url=url, payload=payload)
+
+        _raise_for_status(resp=resp, url=url, payload=payload)
+        return resp.json()
+
+    def _post(self, *, url: str, payload: Union[dict, list]) -> httpx.Response:
         headers = {
             "user-agent": f"pyntelope/{__version__}",
             "content-type": "application/json",
@@ -93,27 +352,52 @@ class Net:
 
         client = self.client
         if client is None:
-            client = httpx.Client()
-
-        try:
-            resp = client.post(
-                url, json=payload, headers=headers, auth=self.auth
-            )
-        except (
-            httpx.TimeoutException,
-            httpx.NetworkError,
-            httpx.WriteError,
-        ) as e:
-            raise exc.ConnectionError(
-                response=None, url=url, payload=payload, error=e
-            )
-
-        if resp.status_code > 299 and resp.status_code != 500:
-            raise exc.ConnectionError(
-                response=resp, url=url, payload=payload, error=None
-            )
+            client = self._new_client()
+
+        with self.rate_limiter or contextlib.nullcontext():
+            start = time.perf_counter()
+            try:
+                resp = client.post(
+                    url, json=payload, headers=headers, auth=self.auth
+                )
+            except (
+                httpx.TimeoutException,
+                httpx.NetworkError,
+                httpx.WriteError,
+            ) as e:
+                self._record(url=url, start=start, status=type(e).__name__)
+                raise exc.ConnectionError(
+                    response=None, url=url, payload=payload, error=e
+                )
+
+        self._record(
+            url=url, start=start, status=str(resp.status_code), response=resp
+        )
+        return resp
 
-        return resp.json()
+    def _record(
+        self,
+        *,
+        url: str,
+        start: float,
+        status: str,
+        response: Optional[httpx.Response] = None,
+    ):
+        if self.metrics is None:
+            return
+        duration_sec = time.perf_counter() - start
+        bytes_sent = bytes_received = 0
+        if response is not None:
+            bytes_sent = len(response.request.content)
+            bytes_received = len(response.content)
+        self.metrics.record(
+            host=self.host,
+            api=urlsplit(url).path,
+            status=status,
+            duration_sec=duration_sec,
+            bytes_sent=bytes_sent,
+            bytes_received=bytes_received,
+        )
 
     def abi_bin_to_json(
         self, *, account_name: str, action: str, bytes: dict
@@ -156,6 +440,26 @@ class Net:
         data["wasm"] = base64.b64decode(data["wasm"])
         return data
 
+    def get_raw_abi(
+        self, *, account_name: str, abi_hash: Optional[str] = None
+    ) -> dict:
+        """
+        Retrieve the raw ABI and its hash for a contract based on account name.
+
+        If the abi_hash given matches the current one, the ABI itself is
+        not sent back, which makes it a cheap way to check if a known ABI
+        is still up to date.
+        https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/get_raw_abi
+        """
+        endpoint = "/v1/chain/get_raw_abi"
+        payload = dict(account_name=account_name)
+        if abi_hash is not None:
+            payload["abi_hash"] = abi_hash
+        data = self._request(endpoint=endpoint, payload=payload)
+        if "abi" in data:
+            data["abi"] = base64.b64decode(data["abi"])
+        return data
+
     def get_info(self):
         endpoint = "/v1/chain/get_info"
         data = self._request(endpoint=endpoint)
@@ -173,6 +477,59 @@ class Net:
         data = self._request(endpoint=endpoint, payload=payload)
         return data
 
+    def get_accounts(
+        self, account_names: List[str], *, concurrency: int = 10
+    ) -> dict:
+        """
+        Return a dict with the get_account result of each account.
+
+        Requests are made with up to `concurrency` in flight and repeated
+        names are requested once. When a request fails, the value of the
+        account is the exception (exc.ConnectionError) instead, like the
+        exc.NodeosError of an account that doesn't exist.
+        """
+        return _map_unique(
+            lambda name: self.get_account(account_name=name),
+            account_names,
+            concurrency,
+        )
+
+    def get_currency_balance(
+        self, *, code: str, account: str, symbol: Optional[str] = None
+    ) -> list:
+        """
+        Return the balances (like "1.0000 WAX") of an account in a token.
+
+        https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/get_currency_balance
+        """
+        endpoint = "/v1/chain/get_currency_balance"
+        payload = dict(code=code, account=account, symbol=symbol)
+        payload = {k: v for k, v in payload.items() if v is not None}
+        data = self._request(endpoint=endpoint, payload=payload)
+        return data
+
+    def get_currency_balances(
+        self,
+        *,
+        code: str,
+        accounts: List[str],
+        symbol: Optional[str] = None,
+        concurrency: int = 10,
+    ) -> dict:
+        """
+        Return a dict with the get_currency_balance result of each account.
+
+        Works like get_accounts: bounded concurrency, repeated accounts
+        requested once and the exception as the value of failed accounts.
+        """
+        return _map_unique(
+            lambda account: self.get_currency_balance(
+                code=code, account=account, symbol=symbol
+            ),
+            accounts,
+            concurrency,
+        )
+
     def get_abi(self, *, account_name: str):
         """
         Retrieve the ABI for a contract based on its account name.
@@ -190,13 +547,33 @@ class Net:
         """
         Return various details about a specific block on the blockchain.
 
+        If the net has a block_cache, irreversible blocks requested by
+        number are served from (and stored in) the cache.
         https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/get_block
         """
         endpoint = "/v1/chain/get_block"
         payload = dict(block_num_or_id=block_num_or_id)
+        if self.block_cache is None or not str(block_num_or_id).isdigit():
+            return self._request(endpoint=endpoint, payload=payload)
+
+        block_num = int(block_num_or_id)
+        data = self.block_cache.get(block_num)
+        if data is not None:
+            return data
+
         data = self._request(endpoint=endpoint, payload=payload)
+        if "id" in data and self._is_irreversible(block_num):
+            self.block_cache.set(block_num, data)
         return data
 
+    def _is_irreversible(self, block_num: int) -> bool:
+        cache = self.block_cache
+        lib = cache.last_irreversible_block_num
+        if block_num > lib and cache.lib_is_stale():
+            info = self.get_info()
+            cache.update_lib(info.get("last_irreversible_block_num", 0))
+        return block_num <= cache.last_irreversible_block_num
+
     def get_block_info(self, *, block_num: str):
         """
         Return a fixed-size smaller subset of the block data.
@@ -209,6 +586,43 @@ class Net:
         data = self._request(endpoint=endpoint, payload=payload)
         return data
 
+    def iter_blocks(
+        self,
+        start: int,
+        end: int,
+        *,
+        concurrency: int = 10,
+        nets: Optional[List["Net"]] = None,
+        header_only: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Yield the blocks from start to end (not included) in block order.
+
+        Keeps up to `concurrency` requests in flight, spread in round robin
+        between this net and the optional extra `nets`.
+        No more than `concurrency` blocks are held waiting to be yielded.
+
+        Parameters:
+        -----------
+        concurrency: int = 10
+            Maximum number of requests in flight
+        nets: list[Net] = None
+            Other nets (endpoints) of the same chain to fetch blocks from
+        header_only: bool = False
+            Use get_block_info instead of get_block
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be >= 1. {concurrency=}")
+        nets = [self] + list(nets or [])
+
+        def fetch(block_num):
+            net = nets[block_num % len(nets)]
+            if header_only:
+                return net.get_block_info(block_num=block_num)
+            return net.get_block(block_num_or_id=block_num)
+
+        yield from _ordered_map(fetch, range(start, end), concurrency)
+
     def get_table_by_scope(
         self,
         code: str,
@@ -308,33 +722,222 @@ class Net:
 
         return rows
 
+    def _push_net(self) -> "Net":
+        if self.router is None:
+            return self
+        return self.router.net()
+
+    def _read_net(self, endpoint: str) -> "Net":
+        if self.read_router is None or endpoint in WRITE_ENDPOINTS:
+            return self
+        return self.read_router.net()
+
+    def get_producer_schedule(self) -> dict:
+        """
+        Return the active, pending and proposed producer schedules.
+
+        https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/get_producer_schedule
+        """
+        endpoint = "/v1/chain/get_producer_schedule"
+        data = self._request(endpoint=endpoint)
+        return data
+
     def push_transaction(
         self,
         *,
         transaction: object,
-        compression: bool = False,
+        compression: Optional[bool] = None,
         packed_context_free_data: str = "",
     ):
         """
         Send a transaction to the blockchain.
 
+        Parameters:
+        -----------
+        compression: bool = None
+            zlib compress the transaction (and its context free data).
+            Default is to compress it only if its serialized size reaches
+            COMPRESSION_THRESHOLD_BYTES
+
         https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/push_transaction
         """
         endpoint = "/v1/chain/push_transaction"
-        payload = dict(
-            signatures=transaction.signatures,
+        payload = _packed_transaction(
+            transaction=transaction,
             compression=compression,
             packed_context_free_data=packed_context_free_data,
-            packed_trx=transaction.pack(),
+        )
+        data = self._push_net()._request(endpoint=endpoint, payload=payload)
+        return data
+
+    def compute_transaction(
+        self, *, transaction: object, compression: Optional[bool] = None
+    ) -> dict:
+        """
+        Execute a transaction without committing it to the blockchain.
+
+        Return the same trace as push_transaction, with the billed cpu and
+        net, so failures and costs are known before paying for them.
+        The transaction can be linked (not signed) or signed.
+        Requires nodeos >= 3.1.
+        https://docs.eosnetwork.com/apis/leap/latest/chain.api/#operation/compute_transaction
+        """
+        endpoint = "/v1/chain/compute_transaction"
+        payload = dict(
+            transaction=_packed_transaction(
+                transaction=transaction, compression=compression
+            )
         )
         data = self._request(endpoint=endpoint, payload=payload)
         return data
 
+    def get_required_keys(
+        self, *, transaction: object, available_keys: List[str]
+    ) -> dict:
+        """
+        Return the keys, among available_keys, needed to sign a transaction.
+
+        The transaction must be linked. The response has the public keys
+        in "required_keys".
+        https://docs.eosnetwork.com/apis/leap/latest/chain.api/#operation/get_required_keys
+        """
+        endpoint = "/v1/chain/get_required_keys"
+        payload = dict(
+            transaction=_transaction_json(transaction),
+            available_keys=list(available_keys),
+        )
+        data = self._request(endpoint=endpoint, payload=payload)
+        return data
+
+    def send_read_only_transaction(self, *, transaction: object) -> dict:
+        """
+        Execute a read-only transaction and return its trace.
+
+        Read-only transactions don't need signatures and can't change the
+        chain state. They are used to call read-only actions, whose
+        return values are in the action traces ("return_value_hex_data").
+        Requires nodeos >= 4.0.
+        https://docs.eosnetwork.com/apis/leap/latest/chain.api/#operation/send_read_only_transaction
+        """
+        endpoint = "/v1/chain/send_read_only_transaction"
+        payload = dict(
+            transaction=_packed_transaction(
+                transaction=transaction, compression=False
+            )
+        )
+        data = self._request(endpoint=endpoint, payload=payload)
+        return data
+
+    def push_transactions(
+        self,
+        *,
+        transactions: List[object],
+        compression: Optional[bool] = None,
+    ) -> list:
+        """
+        Send many transactions to the blockchain in a single request.
+
+        Return a list with the result of each transaction, in order.
+        Nodeos accepts up to 1000 transactions per request.
+        Compression works as in push_transaction.
+        https://developers.eos.io/manuals/eos/latest/nodeos/plugins/chain_api_plugin/api-reference/index#operation/push_transactions
+        """
+        endpoint = "/v1/chain/push_transactions"
+        payload = [
+            _packed_transaction(transaction=t, compression=compression)
+            for t in transactions
+        ]
+        data = self._push_net()._request(endpoint=endpoint, payload=payload)
+        return data
+
+    def send_transaction2(
+        self,
+        *,
+        transaction: object,
+        compression: Optional[bool] = None,
+        packed_context_free_data: str = "",
+        return_failure_trace: bool = True,
+        retry_trx: bool = False,
+        retry_trx_num_blocks: Optional[int] = None,
+    ):
+        """
+        Send a transaction to the blockchain, optionally retried by the node.
+
+        Parameters:
+        -----------
+        compression: bool = None
+            Same as in push_transaction
+        return_failure_trace: bool = True
+            Return the trace of a failed transaction instead of an error
+        retry_trx: bool = False
+            The node keeps retrying the transaction until it expires or
+            until it reaches retry_trx_num_blocks (requires the node to be
+            configured with transaction-retry-max-storage-size-gb)
+        retry_trx_num_blocks: int = None
+            Return only when the transaction reaches this number of blocks.
+            Default is to return when the transaction becomes irreversible
+
+        https://docs.eosnetwork.com/leap/latest/nodeos/plugins/chain_api_plugin/api-reference/#operation/send_transaction2
+        """
+        endpoint = "/v1/chain/send_transaction2"
+        payload = dict(
+            return_failure_trace=return_failure_trace,
+            retry_trx=retry_trx,
+            transaction=_packed_transaction(
+                transaction=transaction,
+                compression=compression,
+                packed_context_free_data=packed_context_free_data,
+            ),
+        )
+        if retry_trx_num_blocks is not None:
+            payload["retry_trx_num_blocks"] = retry_trx_num_blocks
+        data = self._push_net()._request(endpoint=endpoint, payload=payload)
+        return data
+
+    def _new_client(self) -> httpx.Client:
+        return httpx.Client(http2=self.http2)
+
     def __enter__(self):
         if self.client is None:
-            self.client = httpx.Client()
+            self.client = self._new_client()
+            self._owns_client = True
         return self
 
+    def _reset_after_fork(self):
+        """Drop the locks and connections inherited from the parent."""
+        if self._resetting_after_fork:
+            return  # a router that routes back to this net
+        self._resetting_after_fork = True
+        try:
+            self._reset_shared_after_fork()
+            self._reset_client_after_fork()
+        finally:
+            self._resetting_after_fork = False
+
+    def _reset_shared_after_fork(self):
+        self._inflight = _SingleFlight()
+        shared_objects = [
+            self.rate_limiter,
+            self.metrics,
+            self.block_cache,
+            self.router,
+            self.read_router,
+        ]
+        for shared in shared_objects:
+            if shared is not None:
+                shared._reset_after_fork()
+
+    def _reset_client_after_fork(self):
+        if self._owns_client and not self.client.is_closed:
+            # the parent connections must not be used (nor closed) here
+            self.client = self._new_client()
+        elif self.client is not None and not self._owns_client:
+            logger.warning(
+                "Net client was created in the parent process and its "
+                "connections are shared with it. Create the client in "
+                "the child process or use the Net as a context manager."
+            )
+
     def __exit__(
         self,
         exc_type: Optional[Type[BaseException]] = None,
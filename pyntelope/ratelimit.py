@@ -0,0 +1,88 @@
+"""Client side rate limiting of the requests made to the nodes."""
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Limit the rate and the concurrency of the requests made to a host.
+
+    Use it with `Net(..., rate_limiter=RateLimiter(...))`. Share the same
+    object between nets (and threads) connecting to the same host so they
+    are limited together.
+
+    requests_per_sec: float
+        optional max average number of requests per second (token bucket)
+    burst: int
+        max number of requests made at once after an idle period
+    max_concurrent: int
+        optional max number of requests in flight at the same time
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_sec: Optional[float] = None,
+        burst: int = 1,
+        max_concurrent: Optional[int] = None,
+    ):
+        if requests_per_sec is not None and requests_per_sec <= 0:
+            raise ValueError("requests_per_sec must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.requests_per_sec = requests_per_sec
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._semaphore = None
+        if max_concurrent is not None:
+            self._semaphore = threading.BoundedSemaphore(max_concurrent)
+
+    def acquire(self):
+        """Block until a request can be made."""
+        self._wait_for_token()
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+
+    def release(self):
+        """Signal that a request started with acquire has finished."""
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def _wait_for_token(self):
+        if self.requests_per_sec is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            refill = (now - self._updated) * self.requests_per_sec
+            self._updated = now
+            self._tokens = min(self.burst, self._tokens + refill)
+            # tokens may go negative: each waiting caller books its own slot
+            self._tokens -= 1
+            wait_sec = max(0.0, -self._tokens / self.requests_per_sec)
+        if wait_sec > 0:
+            time.sleep(wait_sec)
+
+    def _reset_after_fork(self):
+        # locks held by other threads of the parent are never released
+        self._lock = threading.Lock()
+        if self.max_concurrent is not None:
+            self._semaphore = threading.BoundedSemaphore(self.max_concurrent)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+__all__ = [
+    "RateLimiter",
+]
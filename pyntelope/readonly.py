@@ -0,0 +1,87 @@
+"""Call read-only contract actions and decode their return values."""
+
+from typing import List, Optional
+
+import httpx
+
+from . import exc
+from .cache import AbiCache
+from .decoder import AbiDecoder
+from .net import Net, _ordered_map
+from .transaction import Action, Transaction
+
+
+def _return_value_hex(data: dict) -> str:
+    error = exc.nodeos_error(data)
+    if error is not None:
+        raise error
+    processed = data.get("processed") or {}
+    if not processed.get("action_traces") or processed.get("except"):
+        raise ValueError(f"Read-only transaction failed: {data}")
+    return processed["action_traces"][0]["return_value_hex_data"]
+
+
+class _ReadOnlyCaller:
+    def __init__(self, net: Net, template: Transaction, abi_cache: AbiCache):
+        self.net = net
+        self.template = template
+        self.abi_cache = abi_cache
+        self._decoders = {}
+
+    def __call__(self, action: Action):
+        linked_actions = (action.link(self.net),)
+        transaction = self.template.copy(update=dict(actions=linked_actions))
+        try:
+            data = self.net.send_read_only_transaction(transaction=transaction)
+            return self._decoder(action.account).decode_action_result(
+                action.name, _return_value_hex(data)
+            )
+        except (exc.ConnectionError, httpx.HTTPError, ValueError) as e:
+            return e
+
+    def _decoder(self, account: str) -> AbiDecoder:
+        if account not in self._decoders:
+            abi = self.abi_cache.get_abi_obj(account)
+            if abi is None:
+                raise ValueError(f"Account {account} has no abi")
+            self._decoders[account] = AbiDecoder(abi)
+        return self._decoders[account]
+
+
+def call_read_only(
+    net: Net,
+    actions: List[Action],
+    *,
+    concurrency: int = 10,
+    abi_cache: Optional[AbiCache] = None,
+) -> list:
+    """
+    Call read-only actions and return their decoded return values.
+
+    Each action is sent in its own unsigned read-only transaction, with up
+    to `concurrency` requests in flight. The transactions are linked with
+    a single get_info call. Return values are decoded locally with the
+    "action_results" of the contract abi.
+
+    Return a list with the value of each action, in order. When a call
+    fails (request error, nodeos error, failed transaction or value that
+    can't be decoded), its item is the exception instead. Nodeos errors
+    are the exc.NodeosError matching their code, like an
+    exc.ContractAssertionError for a failed assertion.
+
+    abi_cache: AbiCache
+        optional cache of the contract abis. Share it between calls to
+        avoid downloading the abis again.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be >= 1. {concurrency=}")
+    if not actions:
+        return []
+    template = Transaction(actions=[actions[0]]).link(net=net)
+    call = _ReadOnlyCaller(net, template, abi_cache or AbiCache(net))
+    return list(_ordered_map(call, actions, concurrency))
+
+
+__all__ = [
+    "call_read_only",
+]
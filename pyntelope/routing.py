@@ -0,0 +1,143 @@
+"""Route requests to one of many api nodes."""
+
+import datetime as dt
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .decoder import BLOCK_TIMESTAMP_EPOCH
+from .net import Net
+
+# each producer produces 12 consecutive blocks (6 seconds) per round
+BLOCKS_PER_PRODUCER = 12
+BLOCK_SLOT = dt.timedelta(milliseconds=500)
+
+
+class ProducerRouter:
+    """
+    Choose the net to push transactions to, by block producer.
+
+    Transactions are included faster when they reach the producer of the
+    next block through a nearby api node. The router reads the head block
+    producer (get_info) and the active producer schedule
+    (get_producer_schedule) from the default net and picks the net
+    configured for the producer of the next blocks: the current producer,
+    or the next one in the schedule when the current round is about to
+    end. Producers without a net use the default net.
+
+    Use it with `Net(..., router=ProducerRouter(...))`: push_transaction,
+    push_transactions and send_transaction2 are then sent to the chosen
+    net. SignedTransaction.send uses push_transaction.
+
+    default: Net
+        net used to read the chain state and for producers without a net
+    nets: dict[str, Net]
+        net to be used for each producer
+    handoff_blocks: int
+        route to the next producer when the current one has fewer blocks
+        left in its round
+    refresh_sec: float
+        minimum time between get_info calls
+    schedule_refresh_sec: float
+        minimum time between get_producer_schedule calls
+    """
+
+    def __init__(
+        self,
+        default: Net,
+        nets: Dict[str, Net],
+        *,
+        handoff_blocks: int = 2,
+        refresh_sec: float = 0.5,
+        schedule_refresh_sec: float = 60,
+    ):
+        self.default = default
+        self.nets = dict(nets)
+        self.handoff_blocks = handoff_blocks
+        self.refresh_sec = refresh_sec
+        self.schedule_refresh_sec = schedule_refresh_sec
+        self._lock = threading.Lock()
+        self._schedule: List[str] = []
+        self._schedule_updated = float("-inf")
+        self._info_updated = float("-inf")
+        self._head_producer = None
+        self._head_slot = None
+
+    def next_producer(self) -> Optional[str]:
+        """Return the expected producer of the next blocks."""
+        with self._lock:
+            self._refresh()
+            if not self._schedule:
+                return self._head_producer
+            round_, position = divmod(self._head_slot, BLOCKS_PER_PRODUCER)
+            blocks_left = BLOCKS_PER_PRODUCER - position - 1
+            if blocks_left < self.handoff_blocks:
+                round_ += 1
+            return self._schedule[round_ % len(self._schedule)]
+
+    def net(self) -> Net:
+        """Return the net to push the next transaction to."""
+        return self.nets.get(self.next_producer(), self.default)
+
+    def _refresh(self):
+        now = time.monotonic()
+        if now - self._schedule_updated >= self.schedule_refresh_sec:
+            self._schedule = self._get_schedule()
+            self._schedule_updated = now
+        if now - self._info_updated >= self.refresh_sec:
+            self._update_head(self.default.get_info())
+            self._info_updated = now
+
+    def _get_schedule(self) -> List[str]:
+        data = self.default.get_producer_schedule()
+        producers = (data.get("active") or {}).get("producers", [])
+        return [p["producer_name"] for p in producers]
+
+    def _update_head(self, info: dict):
+        head_time = dt.datetime.fromisoformat(info["head_block_time"])
+        self._head_producer = info["head_block_producer"]
+        self._head_slot = (head_time - BLOCK_TIMESTAMP_EPOCH) // BLOCK_SLOT
+
+    def _reset_after_fork(self):
+        # locks held by other threads of the parent are never released
+        self._lock = threading.Lock()
+        for net in [self.default, *self.nets.values()]:
+            net._reset_after_fork()
+
+
+class NetPool:
+    """
+    Spread requests over a pool of nets, in turn (round robin).
+
+    Each net has its own host, client (connection pool size and
+    timeouts, like `httpx.Client(limits=..., timeout=...)`) and rate
+    limiter.
+
+    Use it with `Net(..., read_router=NetPool(...))` for the read
+    requests and `Net(..., router=NetPool(...))` for the transactions,
+    so both get their own nodes and limits.
+
+    nets: list[Net]
+    """
+
+    def __init__(self, nets: List[Net]):
+        if not nets:
+            raise ValueError("NetPool requires at least one net")
+        self.nets = list(nets)
+        # next() of a count is atomic: no lock needed between threads
+        self._counter = itertools.count()
+
+    def net(self) -> Net:
+        """Return the net for the next request."""
+        return self.nets[next(self._counter) % len(self.nets)]
+
+    def _reset_after_fork(self):
+        for net in self.nets:
+            net._reset_after_fork()
+
+
+__all__ = [
+    "NetPool",
+    "ProducerRouter",
+]
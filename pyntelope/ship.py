@@ -0,0 +1,291 @@
+"""Follow the chain with the state history plugin (SHiP) websocket api."""
+
+import contextlib
+import json
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pydantic
+
+from . import types
+from .decoder import AbiDecoder
+
+# the end block of a request is not included
+MAX_BLOCK_NUM = 0xFFFFFFFF
+
+# index of each request in the "request" variant of the ship abi
+_GET_STATUS_REQUEST = 0
+_GET_BLOCKS_REQUEST = 1
+_GET_BLOCKS_ACK_REQUEST = 2
+
+
+def _connect(url: str, open_timeout: float):
+    try:
+        from websockets.sync.client import connect  # NOQA: I001
+    except ImportError:
+        raise ImportError(
+            "ShipClient requires the websockets package. "
+            "Install it with: pip install pyntelope[ship]"
+        ) from None
+    # blocks can be bigger than the default 1MB message limit
+    return connect(
+        url, max_size=None, compression=None, open_timeout=open_timeout
+    )
+
+
+def _pack_blocks_request(
+    *,
+    start_block: int,
+    end_block: int,
+    max_messages_in_flight: int,
+    have_positions: List[Tuple[int, str]],
+    irreversible_only: bool,
+    fetch_block: bool,
+    fetch_traces: bool,
+    fetch_deltas: bool,
+) -> bytes:
+    bytes_ = bytes(types.Varuint32(_GET_BLOCKS_REQUEST))
+    bytes_ += bytes(types.Uint32(start_block))
+    bytes_ += bytes(types.Uint32(end_block))
+    bytes_ += bytes(types.Uint32(max_messages_in_flight))
+    bytes_ += bytes(types.Varuint32(len(have_positions)))
+    for block_num, block_id in have_positions:
+        bytes_ += bytes(types.Uint32(block_num)) + bytes.fromhex(block_id)
+    for flag in [irreversible_only, fetch_block, fetch_traces, fetch_deltas]:
+        bytes_ += bytes(types.Bool(flag))
+    return bytes_
+
+
+def _pack_ack_request(num_messages: int) -> bytes:
+    bytes_ = bytes(types.Varuint32(_GET_BLOCKS_ACK_REQUEST))
+    bytes_ += bytes(types.Uint32(num_messages))
+    return bytes_
+
+
+class ShipBlock(pydantic.BaseModel):
+    """
+    A block received from the state history plugin.
+
+    block, traces and deltas are None when they were not requested (or
+    are not available in the node). They are decoded with the ship abi
+    (signed_block, transaction_trace[] and table_delta[]) or left as bytes
+    when the client doesn't decode them.
+
+    block_num: int
+    block_id: str
+    prev_block_id: str
+    head_block_num: int
+    last_irreversible_block_num: int
+    block: dict
+    traces: list
+    deltas: list
+    """
+
+    block_num: int
+    block_id: str
+    prev_block_id: Optional[str]
+    head_block_num: int
+    last_irreversible_block_num: int
+    block: Any
+    traces: Any
+    deltas: Any
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class ShipClient:
+    """
+    Receive blocks, traces and table deltas from the state history plugin.
+
+    The binary protocol is spoken over a websocket: the node sends its abi
+    when the client connects, then streams the requested range of blocks.
+    Iterating over the client requests the blocks and yields a ShipBlock
+    for each one. Flow control: the node sends up to
+    max_messages_in_flight blocks not acknowledged yet, and the client
+    acknowledges them as they are yielded.
+
+    When a fork replaces blocks already yielded, the node sends the new
+    blocks again, starting from the fork: a block_num lower or equal to
+    the previous one means the blocks after it were rolled back.
+
+    Decoding blocks, traces and deltas in python is slow. To follow the
+    chain quickly, request only what is needed or use decode=False and
+    decode the bytes later (with decode_block, decode_traces and
+    decode_deltas). Contract rows in deltas are left as bytes: decode
+    them with the AbiDecoder of their contract.
+
+    Requires the websockets package (pip install pyntelope[ship]).
+
+    url: str
+        websocket url of the state history plugin, like ws://host:8080
+    start_block: int
+    end_block: int
+        first block not to be sent. Default is to follow the chain forever
+    max_messages_in_flight: int
+    irreversible_only: bool
+    fetch_block: bool
+    fetch_traces: bool
+    fetch_deltas: bool
+    decode: bool
+        decode block, traces and deltas
+    have_positions: list[tuple[int, str]]
+        (block_num, block_id) of the blocks already received. The node
+        starts from the first one forked out, if any
+    open_timeout: float
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        start_block: int = 0,
+        end_block: int = MAX_BLOCK_NUM,
+        max_messages_in_flight: int = 10,
+        irreversible_only: bool = False,
+        fetch_block: bool = True,
+        fetch_traces: bool = False,
+        fetch_deltas: bool = False,
+        decode: bool = True,
+        have_positions: Optional[List[Tuple[int, str]]] = None,
+        open_timeout: float = 10,
+    ):
+        if max_messages_in_flight < 1:
+            raise ValueError("max_messages_in_flight must be at least 1")
+        self.url = url
+        self.start_block = start_block
+        self.end_block = end_block
+        self.max_messages_in_flight = max_messages_in_flight
+        self.irreversible_only = irreversible_only
+        self.fetch_block = fetch_block
+        self.fetch_traces = fetch_traces
+        self.fetch_deltas = fetch_deltas
+        self.decode = decode
+        self.have_positions = list(have_positions or [])
+        self.open_timeout = open_timeout
+        self.abi = None
+        self._websocket = None
+        self._exit_stack = None
+        self._decoder = None
+        self._table_types = {}
+
+    def connect(self):
+        """Connect to the node and read its abi."""
+        if self._websocket is not None:
+            return
+        self._exit_stack = contextlib.ExitStack()
+        self._websocket = self._exit_stack.enter_context(
+            _connect(self.url, self.open_timeout)
+        )
+        self.abi = json.loads(self._websocket.recv())
+        self._table_types = {t["name"]: t["type"] for t in self.abi["tables"]}
+        # table names, like contract_row, are not valid account names
+        self._decoder = AbiDecoder({**self.abi, "tables": []})
+
+    def close(self):
+        if self._websocket is not None:
+            self._exit_stack.close()
+            self._websocket = None
+
+    def get_status(self) -> dict:
+        """Return the head, last irreversible and available block ranges."""
+        self.connect()
+        self._websocket.send(bytes(types.Varuint32(_GET_STATUS_REQUEST)))
+        _, status = self._receive()
+        return status
+
+    def __iter__(self) -> Iterator[ShipBlock]:
+        self.connect()
+        self._websocket.send(
+            _pack_blocks_request(
+                start_block=self.start_block,
+                end_block=self.end_block,
+                max_messages_in_flight=self.max_messages_in_flight,
+                have_positions=self.have_positions,
+                irreversible_only=self.irreversible_only,
+                fetch_block=self.fetch_block,
+                fetch_traces=self.fetch_traces,
+                fetch_deltas=self.fetch_deltas,
+            )
+        )
+        # acknowledging every message costs a websocket message each
+        ack_every = max(1, self.max_messages_in_flight // 2)
+        unacknowledged = 0
+        while True:
+            _, result = self._receive()
+            unacknowledged += 1
+            if unacknowledged >= ack_every:
+                self._websocket.send(_pack_ack_request(unacknowledged))
+                unacknowledged = 0
+            if result["this_block"] is None:
+                continue
+            block = self._ship_block(result)
+            yield block
+            if block.block_num + 1 >= self.end_block:
+                return
+
+    def decode_block(self, block: bytes) -> dict:
+        return self._decoder.decode("signed_block", block)
+
+    def decode_traces(self, traces: bytes) -> list:
+        return self._decoder.decode("transaction_trace[]", traces)
+
+    def decode_deltas(self, deltas: bytes) -> list:
+        """Decode the table deltas and the rows of each table."""
+        deltas = self._decoder.decode("table_delta[]", deltas)
+        for _, delta in deltas:
+            type_ = self._table_types[delta["name"]]
+            for row in delta["rows"]:
+                row["data"] = self._decoder.decode(type_, row["data"])
+        return deltas
+
+    def _receive(self) -> list:
+        return self._decoder.decode("result", self._websocket.recv())
+
+    def _ship_block(self, result: dict) -> ShipBlock:
+        contents = dict(
+            block=result["block"],
+            traces=result["traces"],
+            deltas=result["deltas"],
+        )
+        if self.decode:
+            decoders = dict(
+                block=self.decode_block,
+                traces=self.decode_traces,
+                deltas=self.decode_deltas,
+            )
+            contents = {
+                name: _decoded(decoders[name], value)
+                for name, value in contents.items()
+            }
+        prev_block = result["prev_block"] or {}
+        return ShipBlock(
+            block_num=result["this_block"]["block_num"],
+            block_id=result["this_block"]["block_id"],
+            prev_block_id=prev_block.get("block_id"),
+            head_block_num=result["head"]["block_num"],
+            last_irreversible_block_num=result["last_irreversible"][
+                "block_num"
+            ],
+            **contents,
+        )
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _decoded(decoder, value):
+    # newer results have the block already decoded
+    if isinstance(value, bytes):
+        return decoder(value)
+    return value
+
+
+__all__ = [
+    "ShipBlock",
+    "ShipClient",
+]
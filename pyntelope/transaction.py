@@ -1,353 +1,500 @@
-"""Transaction, Authorization and Action classes."""
-
-
-import datetime as dt
-import hashlib
-import json
-import struct
-from typing import List, Tuple
-
-import pydantic
-
-from . import types, utils
-from .net import Net
-
-
-class Authorization(pydantic.BaseModel):
-    """
-    Authorization to be used in Action.
-
-    actor: str
-    permission: str
-    """
-
-    actor: pydantic.constr(min_length=1, max_length=13)
-    permission: pydantic.constr(min_length=1, max_length=13)
-
-    def __bytes__(self):
-        bytes_ = b""
-        account_name = types.Name(self.actor)
-        bytes_ += bytes(account_name)
-        permission = types.Name(self.permission)
-        bytes_ += bytes(permission)
-        return bytes_
-
-    class Config:
-        extra = "forbid"
-        frozen = True
-
-
-class Data(pydantic.BaseModel):
-    """
-    Data to be used in actions.
-
-    name: the data field name
-    value: the typed value (types.AntelopeType) of the data
-    """
-
-    name: str
-    value: types.AntelopeType
-
-    def __init__(self, *args, **kwargs):
-        if len(args) == 1:
-            if isinstance(args[0], dict):
-                self = self.parse_obj(args[0])
-                return
-        super().__init__(*args, **kwargs)
-
-    @classmethod
-    def parse_obj(self, obj):
-        for field in ["name", "type", "value"]:
-            if field not in obj:
-                msg = f"Field {field} expected. {obj}"
-                raise ValueError(msg)
-        if len(obj) != 3:
-            msg = (
-                f"Object with lenght 3 was expected, but {len(obj)} "
-                f"found: {obj}"
-            )
-            raise ValueError(msg)
-        name = obj["name"]
-        type_str = obj["type"]
-        value_raw = obj["value"]
-        type_obj = types.from_string(type_str)
-        value = type_obj(value_raw)
-        return Data(name=name, value=value)
-
-    def dict(self):
-        d = dict(
-            name=self.name,
-            type=self.value.__class__.__name__,
-            value=self.value.value,
-        )
-        return d
-
-    def json(self):
-        d = self.dict()
-        j = json.dumps(d)
-        return j
-
-    def __bytes__(self):
-        return bytes(self.value)
-
-    class Config:
-        extra = "forbid"
-        frozen = True
-
-
-class Action(pydantic.BaseModel):
-    """
-    Action to be used in Transaction.
-
-    account: str
-    name: str
-    data: list[Data]
-    authorization: list[Action]
-    """
-
-    account: pydantic.constr(max_length=13)
-    name: str
-    authorization: pydantic.conlist(Authorization, min_items=1, max_items=10)
-    data: List[Data]
-
-    @pydantic.validator("data", "authorization")
-    def transform_to_tuple(cls, v):
-        new_v = tuple(v)
-        return new_v
-
-    # returns a LinkedAction with current values and a specificed net value
-    def link(self, net: Net):
-        return LinkedAction(
-            account=self.account,
-            name=self.name,
-            authorization=self.authorization,
-            data=self.data,
-            net=net,
-        )
-
-    def __bytes__(self):
-        name = self.__class__.__name__
-        raise TypeError(f"cannot convert '{name}' object to bytes")
-
-    class Config:
-        extra = "forbid"
-        frozen = True
-        arbitrary_types_allowed = True
-
-
-class LinkedAction(Action):
-    """
-    Action to be used in LinkedTransaction.
-
-    account: str
-    name: str
-    data: list[Data]
-    authorization: list[Authorization]
-    """
-
-    account: pydantic.constr(max_length=13)
-    name: str
-    authorization: pydantic.conlist(Authorization, min_items=1, max_items=10)
-    data: List[Data]
-    net: Net
-
-    def __bytes__(self):
-        bytes_ = b""
-        account_name = types.Name(value=self.account)
-        bytes_ += bytes(account_name)
-        action_name = types.Name(value=self.name)
-        bytes_ += bytes(action_name)
-
-        auth_bytes = [bytes(a) for a in self.authorization]
-        auth = types.Array.from_dict(auth_bytes, type_=types.Bytes)
-        bytes_ += bytes(auth)
-
-        data_bytes = b""
-        for d in self.data:
-            data_bytes += bytes(d)
-        data_bytes = data_bytes.hex()
-        data_bytes_list = []
-        for i in range(0, len(data_bytes), 2):
-            data_bytes_list.append(data_bytes[i : i + 2])  # NOQA: E203
-        data_bytes_list = [bytes.fromhex(b) for b in data_bytes_list]
-        data = types.Array.from_dict(data_bytes_list, type_=types.Bytes)
-
-        bytes_ += bytes(data)
-
-        return bytes_
-
-
-def _endian_reverse_u32(i: int) -> int:
-    i = i & 0xFFFFFFFF
-    r = (((i >> 0x18) & 0xFF)) | (((i >> 0x10) & 0xFF) << 0x08) | (((i >> 0x08) & 0xFF) << 0x10) | (((i) & 0xFF) << 0x18)  # NOQA BLK100, E501
-    return r
-
-
-def _get_tapos_info(block_id: str) -> Tuple[int]:
-    block_id_bin = bytes.fromhex(block_id)
-
-    hash0 = struct.unpack("<Q", block_id_bin[0:8])[0]
-    hash1 = struct.unpack("<Q", block_id_bin[8:16])[0]
-
-    ref_block_num = _endian_reverse_u32(hash0) & 0xFFFF
-    ref_block_prefix = hash1 & 0xFFFFFFFF
-    return ref_block_num, ref_block_prefix
-
-
-class Transaction(pydantic.BaseModel):
-    """
-    Raw Transaction. It can't be sent to the blockchain.
-
-    It becomes a LinkedTransaction when a Net is linked
-
-    actions: list[Action]
-    delay_sec: int = 0
-    max_cpu_usage_ms: int = 0
-    chain_id: Optional[str]
-    """
-
-    actions: pydantic.conlist(Action, min_items=1, max_items=10)
-    expiration_delay_sec: pydantic.conint(ge=0) = 600
-    delay_sec: pydantic.conint(ge=0) = 0
-    max_cpu_usage_ms: pydantic.conint(ge=0) = 0
-    max_net_usage_words: pydantic.conint(ge=0) = 0
-
-    @pydantic.validator("actions")
-    def _transform_to_tuple(cls, v):
-        new_v = tuple(v)
-        return new_v
-
-    # used to link transaction to a specified network (net)
-    # gets required info from net then returns a LinkedTransaction
-    def link(self, *, net: Net):  # block_id: str, chain_id: str):
-        net_info = net.get_info()
-        block_id = net_info["last_irreversible_block_id"]
-        chain_id = net_info["chain_id"]
-
-        ref_block_num, ref_block_prefix = _get_tapos_info(block_id=block_id)
-        expiration = dt.datetime.utcnow() + dt.timedelta(
-            seconds=self.expiration_delay_sec
-        )
-
-        new_trans = LinkedTransaction(
-            # load every action as a linkedAction with the net passed in
-            actions=[a.link(net) for a in self.actions],
-            net=net,
-            expiration_delay_sec=self.expiration_delay_sec,
-            delay_sec=self.delay_sec,
-            max_cpu_usage_ms=self.max_cpu_usage_ms,
-            max_net_usage_words=self.max_net_usage_words,
-            chain_id=chain_id,
-            ref_block_num=ref_block_num,
-            ref_block_prefix=ref_block_prefix,
-            expiration=expiration,
-        )
-
-        return new_trans
-
-    class Config:
-        extra = "forbid"
-        frozen = True
-        arbitrary_types_allowed = True
-
-
-class LinkedTransaction(Transaction):
-    """
-    Linked transaction. It can't be sent to the blockchain.
-
-    It becomes a SignedTransaction when you sign it.
-    """
-
-    actions: pydantic.conlist(LinkedAction, min_items=1, max_items=10)
-    net: Net
-    chain_id: str
-    ref_block_num: str
-    ref_block_prefix: str
-    expiration: dt.datetime
-
-    def __bytes__(self):
-        bytes_ = b""
-        bytes_ += bytes(types.UnixTimestamp(self.expiration))
-        bytes_ += bytes(types.Uint16(self.ref_block_num))
-        bytes_ += bytes(types.Uint32(self.ref_block_prefix))
-        bytes_ += bytes(types.Varuint32(self.max_net_usage_words))
-        bytes_ += bytes(types.Uint8(self.max_cpu_usage_ms))
-        bytes_ += bytes(types.Varuint32(self.delay_sec))
-        # context_free_actions
-        bytes_ += bytes(types.Array.from_dict([], type_=types.Int8))
-
-        actions_bytes = [bytes(act) for act in self.actions]
-        actions = types.Array.from_dict(actions_bytes, type_=types.Bytes)
-        bytes_ += bytes(actions)
-
-        # transaction_extensions
-        bytes_ += bytes(types.Array.from_dict([], type_=types.Int8))
-
-        return bytes_
-
-    def id(self):
-        hash256 = hashlib.sha256()
-        hash256.update(bytes(self))
-        hash256_digest = hash256.digest()
-        return hash256_digest.hex()
-
-    def sign(self, key: str):
-        signs = []
-        if hasattr(self, "signatures"):
-            signs = list(self.signatures)
-
-        chain_bytes = bytes.fromhex(self.chain_id)
-        trans_bytes = bytes(self)
-        zero_bytes = bytes.fromhex("0" * 64)
-        bytes_ = chain_bytes + trans_bytes + zero_bytes
-
-        signature = utils.sign_bytes(bytes_=bytes_, key=key)
-        signs.append(signature)
-        trans = SignedTransaction(
-            net=self.net,
-            actions=self.actions,
-            expiration_delay_sec=self.expiration_delay_sec,
-            delay_sec=self.delay_sec,
-            max_cpu_usage_ms=self.max_cpu_usage_ms,
-            max_net_usage_words=self.max_net_usage_words,
-            chain_id=self.chain_id,
-            ref_block_num=self.ref_block_num,
-            ref_block_prefix=self.ref_block_prefix,
-            expiration=self.expiration,
-            signatures=tuple(signs),
-        )
-        return trans
-
-
-class SignedTransaction(LinkedTransaction):
-    """
-    Signed transaction. You can send it to the blockchain.
-
-    Also you can sign it again.
-    """
-
-    signatures: pydantic.conlist(str, min_items=1, max_items=10)
-
-    @pydantic.validator("signatures")
-    def _transform_to_tuple(cls, v):
-        new_v = tuple(v)
-        return new_v
-
-    def pack(self):
-        bytes_ = bytes(self)
-        return bytes_.hex()
-
-    def send(self):
-        resp = self.net.push_transaction(transaction=self)
-        return resp
-
-
-__all__ = [
-    "Action",
-    "Authorization",
-    "Data",
-    "Transaction",
-    "LinkedTransaction",
-    "SignedTransaction",
-    "LinkedAction",
-]
+"""Transaction, Authorization and Action classes."""
+
+import datetime as dt
+import functools
+import hashlib
+import json
+import struct
+import time
+from typing import List, Optional, Tuple
+
+import pydantic
+
+from . import exc, types, utils
+from .net import Net
+
+
+class _Memoized(pydantic.BaseModel):
+    """Model caching the values computed from its frozen fields."""
+
+    _cache: dict = pydantic.PrivateAttr(default_factory=dict)
+
+    def _memo(self, key: str, compute):
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = compute()
+            return value
+
+    def copy(self, **kwargs):
+        # a copy with updated fields must not use the values cached
+        copied = super().copy(**kwargs)
+        copied._cache = {}
+        return copied
+
+
+@functools.lru_cache(maxsize=1024)
+def _authorization_bytes(actor: str, permission: str) -> bytes:
+    # the same few authorizations are used by most actions
+    return bytes(types.Name(actor)) + bytes(types.Name(permission))
+
+
+class Authorization(pydantic.BaseModel):
+    """
+    Authorization to be used in Action.
+
+    actor: str
+    permission: str
+    """
+
+    actor: pydantic.constr(min_length=1, max_length=13)
+    permission: pydantic.constr(min_length=1, max_length=13)
+
+    def __bytes__(self):
+        return _authorization_bytes(self.actor, self.permission)
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class Data(_Memoized):
+    """
+    Data to be used in actions.
+
+    name: the data field name
+    value: the typed value (types.AntelopeType) of the data
+    """
+
+    name: str
+    value: types.AntelopeType
+
+    def __init__(self, *args, **kwargs):
+        if len(args) == 1:
+            if isinstance(args[0], dict):
+                self = self.parse_obj(args[0])
+                return
+        super().__init__(*args, **kwargs)
+
+    @classmethod
+    def parse_obj(self, obj):
+        for field in ["name", "type", "value"]:
+            if field not in obj:
+                msg = f"Field {field} expected. {obj}"
+                raise ValueError(msg)
+        if len(obj) != 3:
+            msg = (
+                f"Object with lenght 3 was expected, but {len(obj)} "
+                f"found: {obj}"
+            )
+            raise ValueError(msg)
+        name = obj["name"]
+        type_str = obj["type"]
+        value_raw = obj["value"]
+        type_obj = types.from_string(type_str)
+        value = type_obj(value_raw)
+        return Data(name=name, value=value)
+
+    def dict(self):
+        d = dict(
+            name=self.name,
+            type=self.value.__class__.__name__,
+            value=self.value.value,
+        )
+        return d
+
+    def json(self):
+        d = self.dict()
+        j = json.dumps(d)
+        return j
+
+    def __bytes__(self):
+        return self._memo("bytes", lambda: bytes(self.value))
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+
+
+class Action(_Memoized):
+    """
+    Action to be used in Transaction.
+
+    account: str
+    name: str
+    data: list[Data]
+    authorization: list[Action]
+    """
+
+    account: pydantic.constr(max_length=13)
+    name: str
+    authorization: pydantic.conlist(Authorization, min_items=1, max_items=10)
+    data: List[Data]
+
+    @pydantic.validator("data", "authorization")
+    def transform_to_tuple(cls, v):
+        new_v = tuple(v)
+        return new_v
+
+    # returns a LinkedAction with current values and a specificed net value
+    def link(self, net: Net):
+        return LinkedAction(
+            account=self.account,
+            name=self.name,
+            authorization=self.authorization,
+            data=self.data,
+            net=net,
+        )
+
+    def __bytes__(self):
+        name = self.__class__.__name__
+        raise TypeError(f"cannot convert '{name}' object to bytes")
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+        arbitrary_types_allowed = True
+
+
+class LinkedAction(Action):
+    """
+    Action to be used in LinkedTransaction.
+
+    account: str
+    name: str
+    data: list[Data]
+    authorization: list[Authorization]
+    """
+
+    account: pydantic.constr(max_length=13)
+    name: str
+    authorization: pydantic.conlist(Authorization, min_items=1, max_items=10)
+    data: List[Data]
+    net: Net
+
+    def __bytes__(self):
+        return self._memo("bytes", self._serialize)
+
+    def _serialize(self) -> bytes:
+        bytes_ = b""
+        account_name = types.Name(value=self.account)
+        bytes_ += bytes(account_name)
+        action_name = types.Name(value=self.name)
+        bytes_ += bytes(action_name)
+        bytes_ += _sized_array([bytes(a) for a in self.authorization])
+        bytes_ += _sized_bytes(b"".join(bytes(d) for d in self.data))
+        return bytes_
+
+
+def _sized_array(items: List[bytes]) -> bytes:
+    """Serialize already serialized items as an array."""
+    return bytes(types.Varuint32(len(items))) + b"".join(items)
+
+
+def _sized_bytes(bytes_: bytes) -> bytes:
+    """Serialize bytes with their varuint32 length prefix."""
+    return bytes(types.Varuint32(len(bytes_))) + bytes_
+
+
+def _endian_reverse_u32(i: int) -> int:
+    i = i & 0xFFFFFFFF
+    r = (
+        (((i >> 0x18) & 0xFF))
+        | (((i >> 0x10) & 0xFF) << 0x08)
+        | (((i >> 0x08) & 0xFF) << 0x10)
+        | (((i) & 0xFF) << 0x18)
+    )  # NOQA BLK100, E501
+    return r
+
+
+def _get_tapos_info(block_id: str) -> Tuple[int]:
+    block_id_bin = bytes.fromhex(block_id)
+
+    hash0 = struct.unpack("<Q", block_id_bin[0:8])[0]
+    hash1 = struct.unpack("<Q", block_id_bin[8:16])[0]
+
+    ref_block_num = _endian_reverse_u32(hash0) & 0xFFFF
+    ref_block_prefix = hash1 & 0xFFFFFFFF
+    return ref_block_num, ref_block_prefix
+
+
+class Transaction(_Memoized):
+    """
+    Raw Transaction. It can't be sent to the blockchain.
+
+    It becomes a LinkedTransaction when a Net is linked
+
+    actions: list[Action]
+    delay_sec: int = 0
+    max_cpu_usage_ms: int = 0
+    chain_id: Optional[str]
+    """
+
+    actions: pydantic.conlist(Action, min_items=1, max_items=10)
+    expiration_delay_sec: pydantic.conint(ge=0) = 600
+    delay_sec: pydantic.conint(ge=0) = 0
+    max_cpu_usage_ms: pydantic.conint(ge=0) = 0
+    max_net_usage_words: pydantic.conint(ge=0) = 0
+
+    @pydantic.validator("actions")
+    def _transform_to_tuple(cls, v):
+        new_v = tuple(v)
+        return new_v
+
+    # used to link transaction to a specified network (net)
+    # gets required info from net then returns a LinkedTransaction
+    def link(self, *, net: Net):  # block_id: str, chain_id: str):
+        net_info = net.get_info()
+        block_id = net_info["last_irreversible_block_id"]
+        chain_id = net_info["chain_id"]
+
+        ref_block_num, ref_block_prefix = _get_tapos_info(block_id=block_id)
+        expiration = dt.datetime.utcnow() + dt.timedelta(
+            seconds=self.expiration_delay_sec
+        )
+
+        new_trans = LinkedTransaction(
+            # load every action as a linkedAction with the net passed in
+            actions=[a.link(net) for a in self.actions],
+            net=net,
+            expiration_delay_sec=self.expiration_delay_sec,
+            delay_sec=self.delay_sec,
+            max_cpu_usage_ms=self.max_cpu_usage_ms,
+            max_net_usage_words=self.max_net_usage_words,
+            chain_id=chain_id,
+            ref_block_num=ref_block_num,
+            ref_block_prefix=ref_block_prefix,
+            expiration=expiration,
+        )
+
+        return new_trans
+
+    class Config:
+        extra = "forbid"
+        frozen = True
+        arbitrary_types_allowed = True
+
+
+class LinkedTransaction(Transaction):
+    """
+    Linked transaction. It can't be sent to the blockchain.
+
+    It becomes a SignedTransaction when you sign it.
+    """
+
+    actions: pydantic.conlist(LinkedAction, min_items=1, max_items=10)
+    net: Net
+    chain_id: str
+    ref_block_num: str
+    ref_block_prefix: str
+    expiration: dt.datetime
+
+    def __bytes__(self):
+        return self._memo("bytes", self._serialize)
+
+    def _serialize(self) -> bytes:
+        bytes_ = b""
+        bytes_ += bytes(types.UnixTimestamp(self.expiration))
+        bytes_ += bytes(types.Uint16(self.ref_block_num))
+        bytes_ += bytes(types.Uint32(self.ref_block_prefix))
+        bytes_ += bytes(types.Varuint32(self.max_net_usage_words))
+        bytes_ += bytes(types.Uint8(self.max_cpu_usage_ms))
+        bytes_ += bytes(types.Varuint32(self.delay_sec))
+        # context_free_actions
+        bytes_ += bytes(types.Array.from_dict([], type_=types.Int8))
+
+        bytes_ += _sized_array([bytes(act) for act in self.actions])
+
+        # transaction_extensions
+        bytes_ += bytes(types.Array.from_dict([], type_=types.Int8))
+
+        return bytes_
+
+    def pack(self):
+        bytes_ = bytes(self)
+        return bytes_.hex()
+
+    def estimate(self) -> dict:
+        """
+        Execute the transaction in the node without committing it.
+
+        Return a dict with the billed "cpu_usage_us", "net_usage_words" and
+        the full "trace". Raise ValueError if the transaction fails.
+        """
+        data = self.net.compute_transaction(transaction=self)
+        processed = data.get("processed") or {}
+        if "receipt" not in processed or processed.get("except"):
+            raise ValueError(f"Transaction failed: {data}")
+        receipt = processed["receipt"]
+        estimate = dict(
+            cpu_usage_us=receipt["cpu_usage_us"],
+            net_usage_words=receipt["net_usage_words"],
+            trace=processed,
+        )
+        return estimate
+
+    def id(self):
+        def compute():
+            return hashlib.sha256(bytes(self)).hexdigest()
+
+        return self._memo("id", compute)
+
+    def _signing_digest(self) -> bytes:
+        def compute():
+            chain_bytes = bytes.fromhex(self.chain_id)
+            zero_bytes = bytes(32)
+            bytes_ = chain_bytes + bytes(self) + zero_bytes
+            return hashlib.sha256(bytes_).digest()
+
+        return self._memo("signing_digest", compute)
+
+    def sign(self, key: str):
+        return self.sign_many([key])
+
+    def sign_many(self, keys: List[str]):
+        """Sign with every key, computing the signing digest only once."""
+        signs = []
+        if hasattr(self, "signatures"):
+            signs = list(self.signatures)
+
+        digest = self._signing_digest()
+        for key in keys:
+            signs.append(utils.sign_digest(digest=digest, key=key))
+        trans = SignedTransaction(
+            net=self.net,
+            actions=self.actions,
+            expiration_delay_sec=self.expiration_delay_sec,
+            delay_sec=self.delay_sec,
+            max_cpu_usage_ms=self.max_cpu_usage_ms,
+            max_net_usage_words=self.max_net_usage_words,
+            chain_id=self.chain_id,
+            ref_block_num=self.ref_block_num,
+            ref_block_prefix=self.ref_block_prefix,
+            expiration=self.expiration,
+            signatures=tuple(signs),
+        )
+        # signatures are not serialized: bytes, id and digest are the same
+        trans._cache.update(self._cache)
+        return trans
+
+
+class SignedTransaction(LinkedTransaction):
+    """
+    Signed transaction. You can send it to the blockchain.
+
+    Also you can sign it again.
+    """
+
+    signatures: pydantic.conlist(str, min_items=1, max_items=10)
+
+    @pydantic.validator("signatures")
+    def _transform_to_tuple(cls, v):
+        new_v = tuple(v)
+        return new_v
+
+    def send(self, *, recovery: Optional["RecoveryPolicy"] = None):
+        """
+        Push the transaction to the blockchain.
+
+        Without a recovery policy the node response is returned as is.
+        With one, nodeos errors are raised as exc.NodeosError and the
+        recoverable ones are handled by the policy.
+        """
+        if recovery is not None:
+            return recovery.send(self)
+        resp = self.net.push_transaction(transaction=self)
+        return resp
+
+    def relink(self, *, keys: List[str]) -> "SignedTransaction":
+        """Return the transaction linked again (new tapos and expiration)."""
+        transaction = Transaction(
+            actions=self.actions,
+            expiration_delay_sec=self.expiration_delay_sec,
+            delay_sec=self.delay_sec,
+            max_cpu_usage_ms=self.max_cpu_usage_ms,
+            max_net_usage_words=self.max_net_usage_words,
+        ).link(net=self.net)
+        return transaction.sign_many(keys)
+
+
+class RecoveryPolicy:
+    """
+    Handle the recoverable nodeos errors when sending a transaction.
+
+    - expired transaction or invalid tapos (unknown reference block):
+      link it again and sign it with keys, then push it again
+    - duplicate transaction: it was already received, so it is a success
+      (returns {"transaction_id": id})
+    - cpu or net exhaustion: wait (backoff_sec, doubled on each attempt)
+      and push it again
+
+    Other errors, and the last one after max_attempts, are raised.
+
+    keys: list[str]
+        private keys to sign relinked transactions. Without keys expired
+        transactions are not recovered
+    max_attempts: int
+    backoff_sec: float
+    duplicate_is_success: bool
+    """
+
+    def __init__(
+        self,
+        *,
+        keys: Optional[List[str]] = None,
+        max_attempts: int = 3,
+        backoff_sec: float = 0.5,
+        duplicate_is_success: bool = True,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.keys = list(keys or [])
+        self.max_attempts = max_attempts
+        self.backoff_sec = backoff_sec
+        self.duplicate_is_success = duplicate_is_success
+
+    def send(self, transaction: SignedTransaction) -> dict:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return _push(transaction)
+            except exc.DuplicateTransactionError as e:
+                return self._duplicate(e, transaction)
+            except exc.NodeosError as e:
+                transaction = self._recover(e, transaction, attempt)
+
+    def _duplicate(self, error, transaction) -> dict:
+        if not self.duplicate_is_success:
+            raise error
+        return {"transaction_id": transaction.id()}
+
+    def _recover(self, error, transaction, attempt: int):
+        """Return the transaction to push again or raise the error."""
+        if attempt >= self.max_attempts:
+            raise error
+        relink = (exc.TransactionExpiredError, exc.InvalidTaposError)
+        if isinstance(error, relink) and self.keys:
+            return transaction.relink(keys=self.keys)
+        if isinstance(error, exc.ResourceExhaustedError):
+            time.sleep(self.backoff_sec * 2 ** (attempt - 1))
+            return transaction
+        raise error
+
+
+def _push(transaction: SignedTransaction) -> dict:
+    resp = transaction.net.push_transaction(transaction=transaction)
+    error = exc.nodeos_error(resp)
+    if error is not None:
+        raise error
+    return resp
+
+
+__all__ = [
+    "Action",
+    "Authorization",
+    "Data",
+    "Transaction",
+    "LinkedTransaction",
+    "SignedTransaction",
+    "LinkedAction",
+    "RecoveryPolicy",
+]
@@ -26,8 +26,8 @@ class Wasm(Primitive):
         return _bin_to_hex(self.value)
 
     def __bytes__(self):
-        uint8_array = _hex_to_uint8_array(self.to_hex())
-        return bytes(uint8_array)
+        # the same bytes as an array of uint8, without a model per byte
+        return bytes(primitives.Varuint32(len(self.value))) + self.value
 
     @classmethod
     def from_bytes(cls, bytes_):
@@ -140,12 +140,12 @@ class Abi(Composte):
             d.get("abi_extensions", ()), type_=primitives.String
         )
         variants = (
-            Array.from_dict(d["variants"], type_=primitives.String)
+            Array.from_dict(d["variants"], type_=_AbiVariant)
             if "variants" in d
             else None
         )
         action_results = (
-            Array.from_dict(d["action_results"], type_=primitives.String)
+            Array.from_dict(d["action_results"], type_=_AbiActionResult)
             if "action_results" in d
             else None
         )
@@ -179,6 +179,9 @@ class Abi(Composte):
         return abi_obj
 
     def to_hex(self):
+        return _bin_to_hex(self._packed())
+
+    def _packed(self) -> bytes:
         attrs = [
             self.version,
             self.types,
@@ -189,23 +192,22 @@ class Abi(Composte):
             self.error_messages,
             self.abi_extensions,
         ]
-        if self.variants is not None:
-            attrs.append(self.variants)
-        if self.action_results is not None:
-            attrs.append(self.action_results)
-        if self.kv_tables is not None:
-            attrs.append(self.kv_tables)
-
-        b = b""
-        for attr in attrs:
-            b += bytes(attr)
-        h = _bin_to_hex(b)
-        return h
+        # binary extensions: a field can only be present if the previous
+        # ones are, so the missing ones before it are written empty
+        extensions = [self.variants, self.action_results, self.kv_tables]
+        while extensions and extensions[-1] is None:
+            extensions.pop()
+        for extension in extensions:
+            if extension is None:
+                extension = Array.from_dict([], type_=primitives.String)
+            attrs.append(extension)
+
+        return b"".join(bytes(attr) for attr in attrs)
 
     def __bytes__(self):
-        hexcode = self.to_hex()
-        uint8_array = _hex_to_uint8_array(hexcode)
-        return bytes(uint8_array)
+        # the same bytes as an array of uint8, without a model per byte
+        packed = self._packed()
+        return bytes(primitives.Varuint32(len(packed))) + packed
 
     @classmethod
     def from_bytes(cls, bytes_):
@@ -339,6 +341,46 @@ class _AbiTable(Composte):
         ...
 
 
+class _AbiActionResult(Composte):
+    name: primitives.Name
+    result_type: primitives.String
+
+    @classmethod
+    def from_dict(cls, /, d: dict):
+        name = primitives.Name(d["name"])
+        result_type = primitives.String(d["result_type"])
+        o = cls(name=name, result_type=result_type)
+        return o
+
+    @classmethod
+    def from_bytes(cls, bytes_):
+        ...
+
+    def __bytes__(self):
+        b = bytes(self.name) + bytes(self.result_type)
+        return b
+
+
+class _AbiVariant(Composte):
+    name: primitives.String
+    types: Array  # an array of primitives.String
+
+    @classmethod
+    def from_dict(cls, /, d: dict):
+        name = primitives.String(d["name"])
+        types = Array.from_dict(d["types"], type_=primitives.String)
+        o = cls(name=name, types=types)
+        return o
+
+    @classmethod
+    def from_bytes(cls, bytes_):
+        ...
+
+    def __bytes__(self):
+        b = bytes(self.name) + bytes(self.types)
+        return b
+
+
 def _load_bin_from_file(*, file: Path, extension: str):
     if isinstance(file, Path):
         fullpath = file
@@ -362,26 +404,6 @@ def _bin_to_hex(bin: bytes) -> str:
     return str(binascii.hexlify(bin).decode("utf-8"))
 
 
-def _hex_to_uint8_array(hex_string: str) -> Array:
-    if len(hex_string) % 2:
-        msg = "Odd number of hex digits in input file."
-        raise ValueError(msg)
-
-    bin_len = int(len(hex_string) / 2)
-    uint8_values = []
-
-    for i in range(0, bin_len):
-        try:
-            x = int(hex_string[(i * 2) : (i * 2 + 2)], base=16)  # NOQA: E203
-        except ValueError:
-            msg = "Issue converting hex to uint 8 array, Invalid hex string."
-            raise ValueError(msg)
-        uint8_values.append(x)
-
-    uint8_array = Array.from_dict(uint8_values, type_=primitives.Uint8)
-    return uint8_array
-
-
 def _uint8_list_to_hex(uint8_list: list) -> str:
     hexcode = ""
     for int8 in uint8_list:
@@ -112,24 +112,24 @@ class Asset(Primitive):
 
     @classmethod
     def from_bytes(cls, bytes_):
-        amount_bytes = bytes_[:8]  # get first 8 bytes
-        asset_precision = bytes_[8]  # (amount of decimal places)
-        amount = str(
-            struct.unpack("<Q", amount_bytes)[0]
-        )  # amount with decimal values (no decimal splitting yet)
-        # get name (currency) from Symbol
-        name = str(Symbol.from_bytes(bytes_[8:])).split(",")[1][:-1]
-        if asset_precision == 0:
-            value = amount + " " + name
-        else:
-            value = (
-                amount[:-asset_precision]
-                + "."  # noqa: W503
-                + amount[asset_precision + 1 :]  # noqa: W503, E203
-                + " "  # noqa: W503
-                + name  # noqa: W503
-            )  # combine everything and place decimal in correct position
-        return cls(value=value)
+        return cls(value=cls._value_from_bytes(bytes_))
+
+    @staticmethod
+    def _value_from_bytes(bytes_) -> str:
+        # amount is a signed int64 with decimal values (no decimal splitting)
+        amount = Int64.from_bytes(bytes_[:8]).value
+        sign = "-" if amount < 0 else ""
+        amount = str(abs(amount))
+        symbol = Symbol.from_bytes(bytes_[8:16])
+        precision, name = symbol.value.split(",")
+        precision = int(precision)
+        if precision == 0:
+            return sign + amount + " " + name
+        # place the decimal point in the correct position
+        amount = amount.rjust(precision + 1, "0")
+        int_digits = amount[:-precision]
+        frac_digits = amount[-precision:]
+        return sign + int_digits + "." + frac_digits + " " + name
 
     @pydantic.validator("value")
     def amount_must_be_in_the_valid_range(cls, v):
@@ -263,7 +263,7 @@ class Float32(Primitive):
 
     @classmethod
     def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<f", bytes_)
+        struct_tuple = struct.unpack("<f", bytes_[:4])
         value = struct_tuple[0]
         return cls(value)
 
@@ -281,7 +281,7 @@ class Float64(Primitive):
 
     @classmethod
     def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<d", bytes_)
+        struct_tuple = struct.unpack("<d", bytes_[:8])
         value = struct_tuple[0]
         return cls(value)
 
@@ -440,21 +440,9 @@ class Symbol(Primitive):
 
     @classmethod
     def from_bytes(cls, bytes_):
-        bytes_len = len(bytes_)
-        precision = ""
-        name = ""
-        for i in range(bytes_len):
-            if chr(bytes_[i]).isupper():
-                precision = str(bytes_[0])
-                name_bytes = bytes_[i:]  # name is all bytes after precision
-                for k in range(1, len(name_bytes) + 1):
-                    if not chr(bytes_[k]).isupper():
-                        name_bytes = name_bytes[
-                            : k - 1
-                        ]  # name only goes up to the last upper case character
-                name = name_bytes.decode("utf8")
-                break
-
+        precision = str(bytes_[0])
+        # name fills the next 7 bytes, right padded with null bytes
+        name = bytes_[1:8].rstrip(b"\x00").decode("utf8")
         value = precision + "," + name
         return cls(value=value)
 
@@ -506,7 +494,7 @@ class Uint64(Primitive):
 
     @classmethod
     def from_bytes(cls, bytes_):
-        struct_tuple = struct.unpack("<Q", bytes_)
+        struct_tuple = struct.unpack("<Q", bytes_[:8])
         value = struct_tuple[0]
         return cls(value=value)
 
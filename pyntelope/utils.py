@@ -18,12 +18,14 @@ G = (Gx, Gy)
 
 def sign_bytes(*, bytes_: bytes, key: str) -> str:
     _check_bytes(bytes_)
+    return sign_digest(digest=hashlib.sha256(bytes_).digest(), key=key)
 
+
+def sign_digest(*, digest: bytes, key: str) -> str:
+    """Sign the sha256 digest of a message."""
     nonce = 0
-    sha256 = hashlib.sha256()
-    sha256.update(bytes_)
     while True:
-        v, r, s = _ecdsa_raw_sign_nonce(sha256.digest(), key, nonce)
+        v, r, s = _ecdsa_raw_sign_nonce(digest, key, nonce)
         signature = v.to_bytes(1, "big")
         signature += r.to_bytes(32, "big") + s.to_bytes(32, "big")
         if _is_canonical(signature):
@@ -46,6 +48,33 @@ def sign_bytes(*, bytes_: bytes, key: str) -> str:
     return signature
 
 
+def public_key(key: str) -> str:
+    """Return the public key (PUB_K1_ format) of a private key."""
+    x, y = _fast_multiply(G, _decode_privkey(key))
+    point = bytes([2 + (y % 2)]) + x.to_bytes(32, "big")
+    data = point + _ripmed160(point + b"K1")[:4]
+    return "PUB_K1_" + base58.b58encode(data).decode("ascii")
+
+
+def public_key_bytes(public_key: str) -> bytes:
+    """
+    Return the compressed point of a public key.
+
+    Accepts the PUB_K1_ and the legacy EOS formats.
+    """
+    if public_key.startswith("PUB_K1_"):
+        data = base58.b58decode(public_key[len("PUB_K1_") :])  # NOQA: E203
+        checksum = _ripmed160(data[:-4] + b"K1")[:4]
+    elif public_key.startswith("EOS"):
+        data = base58.b58decode(public_key[len("EOS") :])  # NOQA: E203
+        checksum = _ripmed160(data[:-4])[:4]
+    else:
+        raise ValueError(f"Unknown public key format: {public_key=}")
+    if len(data) != 37 or data[-4:] != checksum:
+        raise ValueError(f"Invalid public key: {public_key=}")
+    return data[:-4]
+
+
 def _check_bytes(bytes_):
     if len(bytes_) == 0:
         raise ValueError("Can not sign empty bytes")
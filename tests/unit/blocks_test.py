@@ -0,0 +1,178 @@
+import itertools
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+import pyntelope
+
+
+def _block_id(num, branch="a"):
+    return f"{num:08x}{branch}".ljust(64, "0")
+
+
+def _block(num, branch="a"):
+    previous = "0" * 64 if num == 1 else _block_id(num - 1, branch)
+    block_id = _block_id(num, branch)
+    return {"block_num": num, "id": block_id, "previous": previous}
+
+
+# nodeos answers blocks it doesn't have with a 400
+UNKNOWN_BLOCK = {
+    "code": 400,
+    "message": "Unknown Block",
+    "error": {
+        "code": 3100002,
+        "name": "unknown_block_exception",
+        "what": "Unknown block",
+        "details": [],
+    },
+}
+
+
+class FakeChain:
+    """Mock net with a list of blocks that can be changed between polls."""
+
+    def __init__(self, blocks, *, unknown_block_status=400):
+        self.blocks = {b["block_num"]: b for b in blocks}
+        self.lib = 1
+        self.unknown_block_status = unknown_block_status
+        self.net = Mock()
+        self.net.get_info.side_effect = self.get_info
+        self.net.get_block.side_effect = self.get_block
+        self.net.get_block_info.side_effect = self.get_block
+
+    def get_info(self):
+        return {
+            "head_block_num": max(self.blocks),
+            "last_irreversible_block_num": self.lib,
+            "head_block_time": "2020-01-01T00:00:00.000",
+        }
+
+    def get_block(self, *, block_num_or_id=None, block_num=None):
+        num = block_num_or_id or block_num
+        if num in self.blocks:
+            return self.blocks[num]
+        if self.unknown_block_status == 500:
+            return {
+                **UNKNOWN_BLOCK,
+                "code": 500,
+                "message": "Internal Service Error",
+            }
+        raise pyntelope.exc.UnknownBlockError(data=UNKNOWN_BLOCK)
+
+
+@pytest.fixture
+def no_sleep():
+    # the follower waits on its stop event between polls
+    with patch("pyntelope.blocks.threading.Event.wait") as m:
+        yield m
+
+
+def test_given_start_block_when_follow_then_yield_blocks_in_order(no_sleep):
+    chain = FakeChain([_block(n) for n in range(1, 6)])
+    follower = pyntelope.BlockFollower(chain.net, start_block=2)
+    events = list(itertools.islice(follower, 4))
+    assert all(isinstance(e, pyntelope.NewBlock) for e in events)
+    assert [e.block_num for e in events] == [2, 3, 4, 5]
+
+
+def test_given_no_start_block_when_follow_then_start_from_head(no_sleep):
+    chain = FakeChain([_block(n) for n in range(1, 6)])
+    follower = pyntelope.BlockFollower(chain.net)
+    event = next(iter(follower))
+    assert event.block_num == 5
+
+
+def test_given_irreversible_when_follow_then_start_from_lib(no_sleep):
+    chain = FakeChain([_block(n) for n in range(1, 6)])
+    chain.lib = 3
+    follower = pyntelope.BlockFollower(chain.net, irreversible=True)
+    event = next(iter(follower))
+    assert event.block_num == 3
+
+
+def test_when_caught_up_then_sleep_before_next_poll(no_sleep):
+    chain = FakeChain([_block(n) for n in range(1, 3)])
+    events = iter(pyntelope.BlockFollower(chain.net, start_block=1))
+    next(events)
+    next(events)
+    chain.blocks[3] = _block(3)
+    next(events)
+    assert no_sleep.call_count == 1
+    delay = no_sleep.call_args[0][0]
+    assert 0 < delay <= pyntelope.blocks.BLOCK_INTERVAL_SEC
+
+
+def test_given_fork_when_follow_then_yield_rollbacks_and_new_branch(no_sleep):
+    chain = FakeChain([_block(n) for n in range(1, 5)])
+    events = iter(pyntelope.BlockFollower(chain.net, start_block=1))
+    first = list(itertools.islice(events, 4))
+
+    # blocks 3 and 4 are replaced by a new branch "b", with one more block
+    chain.blocks[3] = _block(3, "b")
+    chain.blocks[3]["previous"] = first[1].id
+    chain.blocks[4] = _block(4, "b")
+    chain.blocks[5] = _block(5, "b")
+
+    after_fork = list(itertools.islice(events, 5))
+    kinds = [(type(e).__name__, e.block_num) for e in after_fork]
+    assert kinds == [
+        ("Rollback", 4),
+        ("Rollback", 3),
+        ("NewBlock", 3),
+        ("NewBlock", 4),
+        ("NewBlock", 5),
+    ]
+    assert after_fork[0].id == first[3].id
+    assert after_fork[2].id == chain.blocks[3]["id"]
+
+
+def test_given_header_only_when_follow_then_use_get_block_info(no_sleep):
+    chain = FakeChain([_block(n) for n in range(1, 3)])
+    follower = pyntelope.BlockFollower(
+        chain.net, start_block=1, header_only=True
+    )
+    list(itertools.islice(follower, 2))
+    assert chain.net.get_block_info.call_count == 2
+    assert chain.net.get_block.call_count == 0
+
+
+@pytest.mark.parametrize("unknown_block_status", [400, 500])
+def test_given_block_not_yet_available_then_retry_after_sleep(
+    no_sleep, unknown_block_status
+):
+    chain = FakeChain(
+        [_block(n) for n in range(1, 3)],
+        unknown_block_status=unknown_block_status,
+    )
+    events = iter(pyntelope.BlockFollower(chain.net, start_block=3))
+    info = chain.get_info()
+    chain.net.get_info.side_effect = [{**info, "head_block_num": 3}, info]
+
+    def add_block(_):
+        chain.blocks[3] = _block(3)
+        chain.net.get_info.side_effect = chain.get_info
+
+    no_sleep.side_effect = add_block
+    assert next(events).block_num == 3
+
+
+def test_given_follower_waiting_for_blocks_when_stop_then_it_ends_at_once(
+    monkeypatch,
+):
+    monkeypatch.setattr(pyntelope.blocks, "MIN_POLL_INTERVAL_SEC", 10)
+    monkeypatch.setattr(pyntelope.blocks, "BLOCK_INTERVAL_SEC", 10)
+    chain = FakeChain([_block(1)])
+    follower = pyntelope.BlockFollower(chain.net, start_block=1)
+    events = []
+    thread = threading.Thread(target=lambda: events.extend(follower))
+    thread.start()
+    while not events:
+        time.sleep(0.01)
+    start = time.monotonic()
+    follower.stop()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert time.monotonic() - start < 1
@@ -0,0 +1,259 @@
+import base64
+import hashlib
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import pyntelope
+
+from .contracts.valid import eosio_token as eosio_token_contract
+
+
+def _answer_chain(*, lib=100):
+    """Answer get_info and get_block."""
+
+    def answer(url, payload):
+        if url.endswith("/get_info"):
+            return 200, {"last_irreversible_block_num": lib}
+        n = payload["block_num_or_id"]
+        block_id = str(n).rjust(64, "0")
+        return 200, {"block_num": n, "id": block_id, "transactions": []}
+
+    return answer
+
+
+def _get_block_calls(mock_client):
+    calls = mock_client.post.call_args_list
+    return [c for c in calls if c.args[0].endswith("/get_block")]
+
+
+def test_given_block_cache_when_get_irreversible_block_twice_then_fetch_once(  # NOQA: E501
+    make_client,
+):
+    mock_client = make_client(_answer_chain())
+    cache = pyntelope.BlockCache()
+    net = pyntelope.Local(client=mock_client, block_cache=cache)
+    first = net.get_block(block_num_or_id=10)
+    second = net.get_block(block_num_or_id=10)
+    assert first == second
+    assert len(_get_block_calls(mock_client)) == 1
+
+
+def test_given_block_cache_when_get_reversible_block_twice_then_fetch_twice(  # NOQA: E501
+    make_client,
+):
+    mock_client = make_client(_answer_chain(lib=100))
+    cache = pyntelope.BlockCache()
+    net = pyntelope.Local(client=mock_client, block_cache=cache)
+    net.get_block(block_num_or_id=101)
+    net.get_block(block_num_or_id=101)
+    assert len(_get_block_calls(mock_client)) == 2
+
+
+def test_given_block_cache_when_lib_is_known_then_dont_call_get_info(
+    make_client,
+):
+    mock_client = make_client(_answer_chain(lib=100))
+    cache = pyntelope.BlockCache()
+    cache.update_lib(100)
+    net = pyntelope.Local(client=mock_client, block_cache=cache)
+    for n in range(1, 10):
+        net.get_block(block_num_or_id=n)
+    assert mock_client.post.call_count == 9
+
+
+def test_given_block_cache_when_get_block_by_id_then_dont_use_cache(
+    make_client,
+):
+    cache = Mock()
+    net = pyntelope.Local(
+        client=make_client(_answer_chain()), block_cache=cache
+    )
+    net.get_block(block_num_or_id=10)
+    net.get_block(block_num_or_id="a" * 64)
+    assert cache.get.call_count == 1
+
+
+def test_given_block_cache_when_modify_returned_block_then_cache_is_unchanged(  # NOQA: E501
+    make_client,
+):
+    net = pyntelope.Local(
+        client=make_client(_answer_chain()), block_cache=pyntelope.BlockCache()
+    )
+    net.get_block(block_num_or_id=10)["transactions"].append("x")
+    assert net.get_block(block_num_or_id=10)["transactions"] == []
+
+
+def test_block_cache_evicts_least_recently_used_block():
+    cache = pyntelope.BlockCache(maxsize=2)
+    cache.set(1, {"block_num": 1})
+    cache.set(2, {"block_num": 2})
+    cache.get(1)
+    cache.set(3, {"block_num": 3})
+    assert cache.get(1) is not None
+    assert cache.get(2) is None
+    assert cache.get(3) is not None
+
+
+def test_given_block_cache_with_path_then_blocks_survive_restart(tmp_path):
+    path = tmp_path / "blocks.sqlite"
+    cache = pyntelope.BlockCache(path=path)
+    cache.set(10, {"block_num": 10})
+    cache.close()
+
+    cache = pyntelope.BlockCache(path=path)
+    assert cache.get(10) == {"block_num": 10}
+    assert cache.get(11) is None
+
+
+def test_given_block_cache_with_path_then_evicted_blocks_are_read_from_disk(
+    tmp_path,
+):
+    cache = pyntelope.BlockCache(maxsize=1, path=tmp_path / "blocks.sqlite")
+    cache.set(1, {"block_num": 1})
+    cache.set(2, {"block_num": 2})
+    assert cache.get(1) == {"block_num": 1}
+
+
+def test_block_cache_with_maxsize_0_raises_value_error():
+    with pytest.raises(ValueError):
+        pyntelope.BlockCache(maxsize=0)
+
+
+class FakeAbiNet:
+    """Mock net with get_raw_abi for a single account."""
+
+    def __init__(self, abi):
+        self.downloads = 0
+        self.set_abi(abi)
+        self.net = Mock()
+        self.net.get_raw_abi.side_effect = self.get_raw_abi
+
+    def set_abi(self, abi):
+        self.raw_abi = b""
+        self.abi = None
+        if abi is not None:
+            self.raw_abi = pyntelope.types.Abi.from_dict(abi)._packed()
+            self.abi = pyntelope.decode_raw_abi(self.raw_abi)
+        self.abi_hash = hashlib.sha256(self.raw_abi).hexdigest()
+
+    def get_raw_abi(self, *, account_name, abi_hash=None):
+        data = {"account_name": account_name, "abi_hash": self.abi_hash}
+        if abi_hash != self.abi_hash:
+            self.downloads += 1
+            data["abi"] = self.raw_abi
+        return data
+
+
+@pytest.fixture
+def token_abi():
+    with open(eosio_token_contract.path_abi) as f:
+        yield json.load(f)
+
+
+def test_abi_cache_returns_the_account_abi(token_abi):
+    fake = FakeAbiNet(token_abi)
+    cache = pyntelope.AbiCache(fake.net)
+    abi = cache.get("eosio.token")
+    assert abi["structs"] == token_abi["structs"]
+    assert abi["tables"] == token_abi["tables"]
+    assert fake.downloads == 1
+
+
+def test_abi_cache_returns_abi_object(token_abi):
+    fake = FakeAbiNet(token_abi)
+    cache = pyntelope.AbiCache(fake.net)
+    abi_obj = cache.get_abi_obj("eosio.token")
+    assert isinstance(abi_obj, pyntelope.types.Abi)
+    assert cache.get_abi_obj("eosio.token") is abi_obj
+
+
+def test_given_fresh_abi_when_get_again_then_dont_call_net(token_abi):
+    fake = FakeAbiNet(token_abi)
+    cache = pyntelope.AbiCache(fake.net)
+    cache.get("eosio.token")
+    cache.get("eosio.token")
+    assert fake.net.get_raw_abi.call_count == 1
+
+
+def test_given_old_abi_with_same_hash_then_revalidate_without_download(
+    token_abi,
+):
+    fake = FakeAbiNet(token_abi)
+    cache = pyntelope.AbiCache(fake.net, max_age_sec=0)
+    cache.get("eosio.token")
+    time.sleep(0.01)
+    assert cache.get("eosio.token") == fake.abi
+    assert fake.net.get_raw_abi.call_count == 2
+    assert fake.downloads == 1
+    last_call = fake.net.get_raw_abi.call_args
+    assert last_call.kwargs["abi_hash"] == fake.abi_hash
+
+
+def test_given_old_abi_with_new_hash_then_download_abi_again(token_abi):
+    fake = FakeAbiNet(token_abi)
+    cache = pyntelope.AbiCache(fake.net, max_age_sec=0)
+    cache.get("eosio.token")
+    new_abi = {**token_abi, "version": "eosio::abi/1.2"}
+    fake.set_abi(new_abi)
+    time.sleep(0.01)
+    assert cache.get("eosio.token")["version"] == "eosio::abi/1.2"
+    assert fake.downloads == 2
+
+
+def test_given_account_without_abi_then_abi_cache_returns_none():
+    fake = FakeAbiNet(None)
+    cache = pyntelope.AbiCache(fake.net)
+    assert cache.get("user1") is None
+    assert cache.get_abi_obj("user1") is None
+
+
+def test_given_net_error_then_abi_cache_raises_value_error():
+    net = Mock()
+    net.get_raw_abi.return_value = {"code": 500, "error": {}}
+    cache = pyntelope.AbiCache(net)
+    with pytest.raises(ValueError):
+        cache.get("xxx")
+
+
+def test_abi_cache_evicts_least_recently_used_abi(token_abi):
+    fake = FakeAbiNet(token_abi)
+    cache = pyntelope.AbiCache(fake.net, maxsize=1)
+    cache.get("user1")
+    cache.get("user2")
+    cache.get("user1")
+    assert fake.downloads == 3
+
+
+def test_given_abi_cache_with_path_then_abis_survive_restart(
+    token_abi, tmp_path
+):
+    path = tmp_path / "abis.sqlite"
+    fake = FakeAbiNet(token_abi)
+    cache = pyntelope.AbiCache(fake.net, path=path)
+    cache.get("eosio.token")
+    cache.close()
+
+    cache = pyntelope.AbiCache(fake.net, path=path)
+    assert cache.get("eosio.token") == fake.abi
+    assert fake.downloads == 1
+    assert fake.net.get_raw_abi.call_count == 2
+
+
+def test_get_raw_abi_decodes_base64_abi():
+    mock_client = Mock()
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {
+        "account_name": "user2",
+        "abi_hash": "a" * 64,
+        "abi": base64.b64encode(b"abi bytes").decode(),
+    }
+    mock_client.post.return_value = response
+    net = pyntelope.Local(client=mock_client)
+    data = net.get_raw_abi(account_name="user2", abi_hash="b" * 64)
+    assert data["abi"] == b"abi bytes"
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert payload == {"account_name": "user2", "abi_hash": "b" * 64}
@@ -0,0 +1,88 @@
+import time
+
+import httpx
+import pytest
+
+import pyntelope
+
+
+def _record(path, fake, calls):
+    transport = pyntelope.RecordingTransport(path, transport=fake.transport())
+    net = pyntelope.Net(
+        host=fake.host, client=httpx.Client(transport=transport)
+    )
+    results = [call(net) for call in calls]
+    transport.close()
+    return results
+
+
+def _replay_net(path, **kwargs):
+    transport = pyntelope.ReplayTransport(path, **kwargs)
+    return pyntelope.Net(
+        host=pyntelope.FakeNode.host, client=httpx.Client(transport=transport)
+    )
+
+
+@pytest.mark.parametrize("name", ["cassette.jsonl", "cassette.jsonl.gz"])
+def test_replay_returns_the_recorded_responses(tmp_path, name):
+    path = tmp_path / name
+    fake = pyntelope.FakeNode()
+    recorded = _record(
+        path,
+        fake,
+        [
+            lambda net: net.get_info(),
+            lambda net: net.get_block(block_num_or_id=1),
+        ],
+    )
+    net = _replay_net(path, speed=None)
+    assert net.get_block(block_num_or_id=1) == recorded[1]
+    assert net.get_info() == recorded[0]
+
+
+def test_cassette_entries_have_timing(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    fake = pyntelope.FakeNode(latency_sec=0.05)
+    _record(path, fake, [lambda net: net.get_info()])
+    (entry,) = pyntelope.read_cassette(path)
+    assert entry["duration_sec"] >= 0.05
+    assert entry["method"] == "POST"
+    assert entry["url"].endswith("/v1/chain/get_info")
+    assert entry["status_code"] == 200
+
+
+def test_given_speed_then_replay_is_accelerated(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    fake = pyntelope.FakeNode(latency_sec=0.2)
+    _record(path, fake, [lambda net: net.get_info()])
+    net = _replay_net(path, speed=10)
+    start = time.monotonic()
+    net.get_info()
+    assert 0.02 <= time.monotonic() - start < 0.15
+
+
+def test_given_repeated_request_then_replay_in_recorded_order(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    now = [0.0]
+    fake = pyntelope.FakeNode(clock=lambda: now[0])
+
+    def get_info_and_produce_block(net):
+        info = net.get_info()
+        now[0] += 1
+        return info
+
+    recorded = _record(path, fake, [get_info_and_produce_block] * 2)
+    net = _replay_net(path, speed=None)
+    replayed = [net.get_info() for _ in range(3)]
+    assert replayed == [recorded[0], recorded[1], recorded[1]]
+    assert recorded[0] != recorded[1]
+
+
+def test_given_request_not_recorded_then_replay_raises_value_error(
+    tmp_path,
+):
+    path = tmp_path / "cassette.jsonl"
+    _record(path, pyntelope.FakeNode(), [lambda net: net.get_info()])
+    net = _replay_net(path, speed=None)
+    with pytest.raises(ValueError):
+        net.get_block(block_num_or_id=1)
@@ -1,3 +1,8 @@
+import copy
+import threading
+import time
+from unittest.mock import Mock
+
 import pytest
 
 import pyntelope
@@ -13,3 +18,77 @@ def net():
 def auth():
     auth = pyntelope.Authorization(actor="user2", permission="active")
     yield auth
+
+
+@pytest.fixture
+def key():
+    """Private key of the user2 active permission."""
+    yield "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+
+
+@pytest.fixture
+def transfer(auth):
+    """Unsigned transaction with a token transfer authorized by user2."""
+    action = pyntelope.Action(
+        account="eosio.token",
+        name="transfer",
+        data=[pyntelope.Data(name="memo", value=pyntelope.types.String("x"))],
+        authorization=[auth],
+    )
+    yield pyntelope.Transaction(actions=[action])
+
+
+class FakeClock:
+    """Clock for FakeNode and the caches, moved by setting now."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    yield FakeClock()
+
+
+@pytest.fixture
+def make_client():
+    """
+    Return a factory of mock httpx clients.
+
+    answer(url, payload) returns the status code and the json of the
+    response to each post, or raises; like httpx, each json() call parses
+    a new copy. Each post takes delay seconds (a
+    number or a function returning it). The max_in_flight of a client is
+    the highest number of posts it answered at the same time.
+    """
+
+    def make(answer, *, delay=0):
+        mock_client = Mock()
+        mock_client.max_in_flight = 0
+        in_flight = []
+        lock = threading.Lock()
+
+        def post(url, json=None, **kwargs):
+            with lock:
+                in_flight.append(url)
+                mock_client.max_in_flight = max(
+                    mock_client.max_in_flight, len(in_flight)
+                )
+            try:
+                time.sleep(delay() if callable(delay) else delay)
+                status_code, data = answer(url, json)
+            finally:
+                with lock:
+                    in_flight.pop()
+            response = Mock()
+            response.status_code = status_code
+            response.json.side_effect = lambda: copy.deepcopy(data)
+            return response
+
+        mock_client.post.side_effect = post
+        return mock_client
+
+    yield make
@@ -0,0 +1,216 @@
+import datetime as dt
+import json
+
+import base58
+import pytest
+
+import pyntelope
+from pyntelope import types
+
+from .contracts.valid import eosio_token as eosio_token_contract
+from .contracts.valid import simplecontract as simple_contract
+
+
+@pytest.fixture
+def token_decoder():
+    abi = types.Abi.from_file(eosio_token_contract.path_abi)
+    yield pyntelope.AbiDecoder(abi)
+
+
+@pytest.fixture
+def custom_abi():
+    abi = {
+        "version": "eosio::abi/1.1",
+        "types": [{"new_type_name": "account_name", "type": "name"}],
+        "structs": [
+            {
+                "name": "base",
+                "base": "",
+                "fields": [{"name": "id", "type": "uint64"}],
+            },
+            {
+                "name": "row",
+                "base": "base",
+                "fields": [
+                    {"name": "owner", "type": "account_name"},
+                    {"name": "balances", "type": "asset[]"},
+                    {"name": "memo", "type": "string?"},
+                    {"name": "hash", "type": "checksum256"},
+                    {"name": "created", "type": "time_point_sec"},
+                    {"name": "flag", "type": "bool$"},
+                ],
+            },
+        ],
+        "actions": [],
+        "tables": [
+            {
+                "name": "rows",
+                "index_type": "i64",
+                "key_names": [],
+                "key_types": [],
+                "type": "row",
+            }
+        ],
+    }
+    yield abi
+
+
+def test_decode_accounts_table_row(token_decoder):
+    row = bytes(types.Asset("10.0000 WAX")).hex()
+    decoded = token_decoder.decode_table_row("accounts", row)
+    assert decoded == {"balance": "10.0000 WAX"}
+
+
+def test_decode_stat_table_row(token_decoder):
+    row = (
+        bytes(types.Asset("1.00000000 WAX"))
+        + bytes(types.Asset("100.00000000 WAX"))
+        + bytes(types.Name("eosio"))
+    )
+    decoded = token_decoder.decode_table_row("stat", row)
+    assert decoded == {
+        "supply": "1.00000000 WAX",
+        "max_supply": "100.00000000 WAX",
+        "issuer": "eosio",
+    }
+
+
+def test_decode_table_row_with_payer(token_decoder):
+    row = {"data": bytes(types.Asset("1 WAX")).hex(), "payer": "user2"}
+    decoded = token_decoder.decode_table_row("accounts", row)
+    assert decoded == {"data": {"balance": "1 WAX"}, "payer": "user2"}
+
+
+def test_decode_table_row_from_unknown_table_raises_value_error(
+    token_decoder,
+):
+    with pytest.raises(ValueError):
+        token_decoder.decode_table_row("xxx", "")
+
+
+def test_decode_action_data_from_dict_abi():
+    with open(simple_contract.path_abi) as f:
+        decoder = pyntelope.AbiDecoder(json.load(f))
+    data = bytes(types.Name("user2")) + bytes(types.String("hello"))
+    decoded = decoder.decode("sendmsg", data)
+    assert decoded == {"from": "user2", "message": "hello"}
+
+
+def test_decode_struct_with_base_alias_array_optional_and_extension(
+    custom_abi,
+):
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    created = dt.datetime(2022, 1, 2, 3, 4, 5)
+    row = (
+        bytes(types.Uint64(7))
+        + bytes(types.Name("user2"))
+        + bytes(types.Varuint32(2))
+        + bytes(types.Asset("1.0000 WAX"))
+        + bytes(types.Asset("2 EOS"))
+        + b"\x01"
+        + bytes(types.String("hi"))
+        + b"\xab" * 32
+        + bytes(types.UnixTimestamp(created))
+    )
+    decoded = decoder.decode_table_row("rows", row)
+    assert decoded == {
+        "id": 7,
+        "owner": "user2",
+        "balances": ["1.0000 WAX", "2 EOS"],
+        "memo": "hi",
+        "hash": "ab" * 32,
+        "created": created,
+        "flag": None,
+    }
+
+
+def test_decode_empty_optional(custom_abi):
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    assert decoder.decode("string?", b"\x00") is None
+
+
+def test_decode_multi_byte_utf8_string(custom_abi):
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    text = "olá 🌍".encode("utf8")
+    assert decoder.decode("string", bytes([len(text)]) + text) == "olá 🌍"
+
+
+def test_decode_unknown_type_raises_value_error(custom_abi):
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    with pytest.raises(ValueError):
+        decoder.decode("xxx", b"\x00")
+
+
+def test_decode_truncated_data_raises_value_error(custom_abi):
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    with pytest.raises(ValueError):
+        decoder.decode("uint64", b"\x00\x00")
+
+
+def test_decode_variant(custom_abi):
+    custom_abi["variants"] = [
+        {"name": "value", "types": ["uint8", "string"]},
+    ]
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    assert decoder.decode("value", b"\x00\x07") == ["uint8", 7]
+    assert decoder.decode("value", b"\x01\x02hi") == ["string", "hi"]
+    with pytest.raises(ValueError):
+        decoder.decode("value", b"\x02\x00")
+
+
+@pytest.mark.parametrize(
+    "type_, bytes_, expected",
+    [
+        ("varint32", b"\x03", -2),
+        ("int128", b"\xff" * 16, -1),
+        ("uint128", b"\x01" + b"\x00" * 15, 1),
+        (
+            "block_timestamp_type",
+            b"\x03\x00\x00\x00",
+            dt.datetime(2000, 1, 1, 0, 0, 1, 500000),
+        ),
+    ],
+)
+def test_decode_builtin_types(custom_abi, type_, bytes_, expected):
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    assert decoder.decode(type_, bytes_) == expected
+
+
+def test_decode_public_key_and_signature(custom_abi, key):
+    public_key = pyntelope.utils.public_key(key)
+    signature = pyntelope.utils.sign_bytes(bytes_=b"a", key=key)
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    public_key_bytes = b"\x00" + pyntelope.utils.public_key_bytes(public_key)
+    assert decoder.decode("public_key", public_key_bytes) == public_key
+    signature_bytes = b"\x00" + base58.b58decode(signature[7:])[:-4]
+    assert decoder.decode("signature", signature_bytes) == signature
+
+
+def test_decode_negative_asset(custom_abi):
+    amount = bytes(types.Int64(-5))
+    symbol = bytes(types.Symbol("4,EOS"))
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    assert decoder.decode("asset", amount + symbol) == "-0.0005 EOS"
+
+
+def test_decode_symbol_code_extended_asset_and_float128(custom_abi):
+    decoder = pyntelope.AbiDecoder(custom_abi)
+    assert decoder.decode("symbol_code", b"EOS" + bytes(5)) == "EOS"
+    quantity = bytes(types.Asset("1.5000 EOS"))
+    contract = bytes(types.Name("eosio.token"))
+    assert decoder.decode("extended_asset", quantity + contract) == {
+        "quantity": "1.5000 EOS",
+        "contract": "eosio.token",
+    }
+    float128 = bytes(range(16))
+    assert decoder.decode("float128", float128) == "0x" + float128.hex()
+
+
+def test_decode_raw_abi_returns_the_abi_as_a_dict():
+    with open(eosio_token_contract.path_abi) as f:
+        token_abi = json.load(f)
+    raw_abi = types.Abi.from_dict(token_abi)._packed()
+    abi = pyntelope.decode_raw_abi(raw_abi)
+    for field in ["version", "types", "structs", "actions", "tables"]:
+        assert abi[field] == token_abi[field]
+    assert abi["variants"] == []
@@ -0,0 +1,38 @@
+"""exc tests."""
+
+import pytest
+
+import pyntelope
+
+
+def _error_data(code, name="error"):
+    return {"code": 500, "error": {"code": code, "name": name, "what": "x"}}
+
+
+@pytest.mark.parametrize(
+    "code, error_class",
+    [
+        (3040005, pyntelope.exc.TransactionExpiredError),
+        (3040007, pyntelope.exc.InvalidTaposError),
+        (3040008, pyntelope.exc.DuplicateTransactionError),
+        (3050003, pyntelope.exc.ContractAssertionError),
+        (3080001, pyntelope.exc.RamUsageExceededError),
+        (3080004, pyntelope.exc.ResourceExhaustedError),
+        (3080006, pyntelope.exc.ResourceExhaustedError),
+        (3081001, pyntelope.exc.ResourceExhaustedError),
+        (3090003, pyntelope.exc.AuthorizationError),
+        (3100002, pyntelope.exc.UnknownBlockError),
+        (1234567, pyntelope.exc.NodeosError),
+    ],
+)
+def test_nodeos_error_is_classified_by_code(code, error_class):
+    error = pyntelope.exc.nodeos_error(_error_data(code, "some_exception"))
+    assert type(error) is error_class
+    assert error.code == code
+    assert error.name == "some_exception"
+    assert isinstance(error, pyntelope.exc.ConnectionError)
+
+
+@pytest.mark.parametrize("data", [{"id": "abc"}, [], "text", {"error": "x"}])
+def test_given_no_nodeos_error_then_nodeos_error_returns_none(data):
+    assert pyntelope.exc.nodeos_error(data) is None
@@ -0,0 +1,259 @@
+import datetime as dt
+import time
+
+import httpx
+import pytest
+
+import pyntelope
+
+
+@pytest.fixture
+def fake(clock):
+    yield pyntelope.FakeNode(clock=clock, irreversible_lag=3)
+
+
+def _signed_transaction(net, transfer, key, expiration_delay_sec=600):
+    update = {"expiration_delay_sec": expiration_delay_sec}
+    transaction = transfer.copy(update=update)
+    return transaction.link(net=net).sign(key=key)
+
+
+def test_fake_node_produces_blocks_with_the_clock(fake, clock):
+    net = fake.net()
+    assert net.get_info()["head_block_num"] == 1
+    clock.now = 10
+    info = net.get_info()
+    assert info["head_block_num"] == 21
+    assert info["last_irreversible_block_num"] == 18
+    assert info["chain_id"] == fake.chain_id
+
+
+def test_fake_node_blocks_are_chained(fake, clock):
+    clock.now = 5
+    net = fake.net()
+    block = net.get_block(block_num_or_id=5)
+    previous = net.get_block(block_num_or_id=4)
+    assert block["previous"] == previous["id"]
+    assert net.get_block(block_num_or_id=block["id"]) == block
+    assert net.get_block_info(block_num=5)["id"] == block["id"]
+
+
+def test_given_future_block_then_fake_node_answers_unknown_block_400(fake):
+    resp = fake.client().post(
+        fake.host + "/v1/chain/get_block", json={"block_num_or_id": 100}
+    )
+    assert resp.status_code == 400
+    assert resp.json()["message"] == "Unknown Block"
+    with pytest.raises(pyntelope.exc.UnknownBlockError):
+        fake.net().get_block(block_num_or_id=100)
+
+
+def test_given_pushed_transaction_then_it_is_included_in_next_block(
+    fake, clock, transfer, key
+):
+    net = fake.net()
+    transaction = _signed_transaction(net, transfer, key)
+    resp = transaction.send()
+    assert resp["transaction_id"] == transaction.id()
+    block_num = resp["processed"]["block_num"]
+    clock.now = 1
+    block = net.get_block(block_num_or_id=block_num)
+    assert block["transactions"][0]["trx"]["id"] == transaction.id()
+
+
+def test_given_duplicated_transaction_then_fake_node_refuses_it(
+    fake, transfer, key
+):
+    net = fake.net()
+    transaction = _signed_transaction(net, transfer, key)
+    transaction.send()
+    with pytest.raises(pyntelope.exc.ConnectionError):
+        transaction.send()
+
+
+def test_given_compressed_transaction_then_fake_node_accepts_it(
+    fake, transfer, key
+):
+    net = fake.net()
+    transaction = _signed_transaction(net, transfer, key)
+    resp = net.push_transaction(transaction=transaction, compression=True)
+    assert resp["transaction_id"] == transaction.id()
+
+
+def test_given_expired_transaction_then_fake_node_returns_expired_error(
+    fake, clock, transfer, key
+):
+    net = fake.net()
+    transaction = _signed_transaction(
+        net, transfer, key, expiration_delay_sec=1
+    )
+    clock.now = 10
+    # like nodeos, answered with a 500 that is returned as data
+    resp = transaction.send()
+    assert resp["code"] == 500
+    assert resp["error"]["name"] == "expired_tx_exception"
+    assert resp["error"]["what"] == "Expired Transaction"
+
+
+def test_given_missing_key_then_fake_node_answers_unauthorized_401(
+    fake, transfer
+):
+    net = fake.net()
+    with pytest.raises(pyntelope.exc.AuthorizationError) as e:
+        net.get_required_keys(
+            transaction=transfer.link(net=net), available_keys=[]
+        )
+    assert e.value.data["code"] == 401
+    assert e.value.data["message"] == "UnAuthorized"
+
+
+def test_fake_node_table_rows_pagination(fake):
+    rows = [{"id": i, "value": i * 10} for i in range(25)]
+    fake.set_table_rows(code="c", table="t", rows=rows)
+    client = fake.client()
+    url = fake.host + "/v1/chain/get_table_rows"
+    payload = {"code": "c", "table": "t", "scope": "c", "limit": 10}
+    data = client.post(url, json=payload).json()
+    assert data["rows"] == rows[:10]
+    assert data["more"] is True
+    assert data["next_key"] == "10"
+
+    net = fake.net()
+    all_rows = net.get_table_rows(
+        code="c", table="t", scope="c", limit=10, full=True
+    )
+    assert all_rows == rows
+
+
+def test_fake_node_get_abi(fake):
+    fake.set_abi("eosio.token", {"version": "eosio::abi/1.1"})
+    net = fake.net()
+    data = net.get_abi(account_name="eosio.token")
+    assert data["abi"] == {"version": "eosio::abi/1.1"}
+    assert net.get_abi(account_name="user2") is None
+
+
+def test_fake_node_raw_abi_with_known_hash_omits_the_abi(fake):
+    fake.set_abi("eosio.token", {"version": "eosio::abi/1.1"})
+    net = fake.net()
+    abi_hash = net.get_raw_abi(account_name="eosio.token")["abi_hash"]
+    data = net.get_raw_abi(account_name="eosio.token", abi_hash=abi_hash)
+    assert "abi" not in data
+
+
+def test_given_fail_next_then_fake_node_answers_with_error(fake):
+    fake.fail_next(2, status_code=429)
+    net = fake.net()
+    for _ in range(2):
+        with pytest.raises(pyntelope.exc.ConnectionError):
+            net.get_info()
+    assert "chain_id" in net.get_info()
+
+
+@pytest.mark.parametrize("status_code", [502, 503])
+def test_given_fail_next_with_any_status_code_then_answers_with_error(
+    fake, status_code
+):
+    fake.fail_next(status_code=status_code)
+    net = fake.net()
+    with pytest.raises(pyntelope.exc.ConnectionError, match="injected"):
+        net.get_info()
+    assert "chain_id" in net.get_info()
+
+
+def test_given_error_rate_then_fake_node_fails_some_requests(clock):
+    fake = pyntelope.FakeNode(clock=clock, error_rate=0.5, seed=1)
+    net = fake.net()
+    errors = sum("code" in net.get_info() for _ in range(100))
+    assert 20 < errors < 80
+
+
+def test_given_max_requests_per_sec_then_fake_node_answers_429(fake, clock):
+    fake.max_requests_per_sec = 3
+    client = fake.client()
+    url = fake.host + "/v1/chain/get_info"
+    codes = [client.post(url, json={}).status_code for _ in range(4)]
+    assert codes == [200, 200, 200, 429]
+    clock.now = 1.5
+    assert client.post(url, json={}).status_code == 200
+
+
+def test_given_latency_then_fake_node_waits_before_answering():
+    fake = pyntelope.FakeNode(latency_sec=0.05)
+    start = time.monotonic()
+    fake.net().get_info()
+    assert time.monotonic() - start >= 0.05
+
+
+def test_fake_node_unknown_endpoint_returns_404(fake):
+    resp = fake.client().post(fake.host + "/v1/chain/xxx", json={})
+    assert resp.status_code == 404
+
+
+def test_fake_node_serves_http(fake):
+    url = fake.serve()
+    try:
+        net = pyntelope.Net(host=url, client=httpx.Client())
+        assert net.get_info()["chain_id"] == fake.chain_id
+    finally:
+        fake.shutdown()
+
+
+def test_fake_node_block_time_is_close_to_now(fake):
+    info = fake.net().get_info()
+    head_block_time = dt.datetime.fromisoformat(info["head_block_time"])
+    assert abs(head_block_time - dt.datetime.utcnow()).total_seconds() < 5
+
+
+def test_given_duplicated_transaction_then_typed_error_is_raised(
+    fake, transfer, key
+):
+    net = fake.net()
+    transaction = _signed_transaction(net, transfer, key)
+    transaction.send()
+    with pytest.raises(pyntelope.exc.DuplicateTransactionError) as e:
+        transaction.send()
+    assert e.value.code == 3040008
+
+
+def test_given_recovery_and_duplicated_transaction_then_it_is_a_success(
+    fake, transfer, key
+):
+    net = fake.net()
+    transaction = _signed_transaction(net, transfer, key)
+    transaction.send()
+    resp = transaction.send(recovery=pyntelope.RecoveryPolicy())
+    assert resp == {"transaction_id": transaction.id()}
+
+
+def test_given_recovery_with_keys_and_expired_transaction_then_it_is_relinked(  # NOQA: E501
+    transfer, key, monkeypatch
+):
+    net = pyntelope.FakeNode().net()
+    transaction = _signed_transaction(net, transfer, key)
+    expired = {
+        "code": 500,
+        "error": {"code": 3040005, "name": "expired_tx_exception"},
+    }
+    responses = [expired]
+    push_transaction = net.push_transaction
+    monkeypatch.setattr(
+        net,
+        "push_transaction",
+        lambda **kw: responses.pop() if responses else push_transaction(**kw),
+    )
+    resp = transaction.send(recovery=pyntelope.RecoveryPolicy(keys=[key]))
+    assert resp["processed"]["receipt"]["status"] == "executed"
+    assert not responses
+
+
+def test_given_recovery_without_keys_and_expired_transaction_then_error_is_raised(  # NOQA: E501
+    fake, clock, transfer, key
+):
+    net = fake.net()
+    transaction = _signed_transaction(
+        net, transfer, key, expiration_delay_sec=1
+    )
+    clock.now = 10
+    with pytest.raises(pyntelope.exc.TransactionExpiredError):
+        transaction.send(recovery=pyntelope.RecoveryPolicy())
@@ -0,0 +1,153 @@
+import datetime as dt
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import pyntelope
+
+EXPIRATION = dt.datetime(2020, 1, 1, 0, 10)
+
+
+def _new_block(num, transaction_ids=(), timestamp="2020-01-01T00:00:00.000"):
+    transactions = [
+        {"status": "executed", "trx": {"id": i}} for i in transaction_ids
+    ]
+    block = {"timestamp": timestamp, "transactions": transactions}
+    return pyntelope.NewBlock(block_num=num, id=str(num), block=block)
+
+
+@pytest.fixture
+def tracker():
+    yield pyntelope.FinalityTracker(net=pyntelope.FakeNode().net())
+
+
+def test_given_included_transaction_when_lib_reaches_it_then_resolve_irreversible(  # NOQA: E501
+    tracker,
+):
+    events = []
+    future = tracker.track("a", expiration=EXPIRATION, callback=events.append)
+    tracker.process(_new_block(10, ["b", "a"]))
+    assert [e.status for e in events] == ["included"]
+    assert not future.done()
+
+    tracker.set_last_irreversible_block_num(9)
+    assert not future.done()
+    tracker.set_last_irreversible_block_num(10)
+    event = future.result(timeout=0)
+    assert event.status == "irreversible"
+    assert event.block_num == 10
+    assert tracker.pending_count() == 0
+    assert len(tracker.inclusion_latencies) == 1
+    assert len(tracker.finality_latencies) == 1
+
+
+def test_given_forked_out_transaction_then_it_is_pending_again(tracker):
+    events = []
+    future = tracker.track("a", expiration=EXPIRATION, callback=events.append)
+    tracker.process(_new_block(10, ["a"]))
+    tracker.process(pyntelope.Rollback(block_num=10, id="10"))
+    tracker.process(_new_block(10))
+    tracker.process(_new_block(11, ["a"]))
+    tracker.set_last_irreversible_block_num(11)
+    statuses = [(e.status, e.block_num) for e in events]
+    assert statuses == [
+        ("included", 10),
+        ("forked_out", 10),
+        ("included", 11),
+        ("irreversible", 11),
+    ]
+    assert future.result(timeout=0).block_num == 11
+
+
+def test_given_block_after_expiration_then_resolve_expired(tracker):
+    future = tracker.track("a", expiration=EXPIRATION)
+    tracker.process(_new_block(10, timestamp="2020-01-01T00:10:00.000"))
+    assert not future.done()
+    tracker.process(_new_block(11, timestamp="2020-01-01T00:10:00.500"))
+    event = future.result(timeout=0)
+    assert event.status == "expired"
+    assert event.block_num is None
+
+
+def test_given_included_transaction_then_it_doesnt_expire(tracker):
+    future = tracker.track("a", expiration=EXPIRATION)
+    tracker.process(_new_block(10, ["a"]))
+    tracker.process(_new_block(11, timestamp="2020-01-01T01:00:00.000"))
+    assert not future.done()
+
+
+def test_finality_tracker_follows_the_chain(transfer, key):
+    fake = pyntelope.FakeNode(block_interval_sec=0.05, irreversible_lag=2)
+    net = fake.net()
+    tracker = pyntelope.FinalityTracker(net)
+    signed_transaction = transfer.link(net=net).sign(key=key)
+    tracker.start()
+    try:
+        future = tracker.track(
+            signed_transaction.id(), expiration=signed_transaction.expiration
+        )
+        resp = signed_transaction.send()
+        event = future.result(timeout=5)
+    finally:
+        tracker.stop()
+    assert event.status == "irreversible"
+    assert event.block_num == resp["processed"]["block_num"]
+
+
+def test_given_tracked_transaction_when_track_again_then_same_future(tracker):
+    future = tracker.track("a", expiration=EXPIRATION)
+    assert tracker.track("a", expiration=EXPIRATION) is future
+    assert tracker.pending_count() == 1
+
+
+def test_given_failing_callback_then_future_is_resolved(tracker, caplog):
+    def callback(event):
+        raise RuntimeError("callback error")
+
+    future = tracker.track("a", expiration=EXPIRATION, callback=callback)
+    tracker.process(_new_block(10, ["a"]))
+    tracker.set_last_irreversible_block_num(10)
+    assert future.result(timeout=0).status == "irreversible"
+    assert "callback error" in caplog.text
+
+
+def test_given_request_errors_then_tracker_retries(monkeypatch, caplog):
+    monkeypatch.setattr(pyntelope.finality, "BLOCK_INTERVAL_SEC", 0.01)
+    fake = pyntelope.FakeNode(block_interval_sec=0.05, irreversible_lag=2)
+    fake.fail_next(2, status_code=503)
+    tracker = pyntelope.FinalityTracker(fake.net())
+    tracker.start()
+    try:
+        block_num = fake.head_block_num() + 1
+        future = tracker.track("a", expiration=dt.datetime(2100, 1, 1))
+        deadline = time.monotonic() + 5
+        while tracker.last_irreversible_block_num < block_num:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        tracker.stop()
+    assert not future.done()
+    assert "Following the chain failed" in caplog.text
+
+
+def test_given_unexpected_error_then_pending_futures_get_it():
+    net = Mock()
+    net.get_info.return_value = {}
+    tracker = pyntelope.FinalityTracker(net)
+    future = tracker.track("a", expiration=EXPIRATION)
+    with pytest.raises(KeyError):
+        tracker.run()
+    assert isinstance(future.exception(timeout=0), KeyError)
+
+
+def test_given_stalled_node_when_stop_then_tracker_stops():
+    # the fake clock doesn't advance: no new blocks are produced
+    tracker = pyntelope.FinalityTracker(
+        pyntelope.FakeNode(clock=lambda: 0).net()
+    )
+    tracker.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    tracker.stop()
+    assert time.monotonic() - started < 1
@@ -0,0 +1,97 @@
+import pytest
+
+import pyntelope
+
+KEY_1 = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+KEY_2 = "5HsVgxhxdL9gvgcAAyCZSWNgtLxAhGfEX2YU98w6QSkePoVvPNK"
+KEY_3 = "5K5UHY2LjHw2QQFJKCd2PdF7hxPJnknMfQLhxbEguJJttr1DFdp"
+
+
+@pytest.fixture
+def fake():
+    fake = pyntelope.FakeNode()
+    # legacy format, as answered by older nodes
+    fake.set_permission_keys(
+        "alice",
+        "active",
+        ["EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"],
+    )
+    fake.set_permission_keys(
+        "bob", "active", [pyntelope.utils.public_key(KEY_2)]
+    )
+    yield fake
+
+
+def _linked_transaction(net, *actors):
+    actions = [
+        pyntelope.Action(
+            account="eosio.token",
+            name="transfer",
+            data=[],
+            authorization=[
+                pyntelope.Authorization(actor=actor, permission="active")
+            ],
+        )
+        for actor in actors
+    ]
+    return pyntelope.Transaction(actions=actions).link(net=net)
+
+
+def test_keyring_signs_with_the_required_keys_only(fake):
+    keyring = pyntelope.Keyring([KEY_1, KEY_2, KEY_3])
+    transaction = _linked_transaction(fake.net(), "alice")
+    signed = keyring.sign(transaction)
+    assert signed.signatures == transaction.sign(key=KEY_1).signatures
+
+
+def test_keyring_signs_with_the_keys_of_every_authorization(fake):
+    keyring = pyntelope.Keyring([KEY_1, KEY_2, KEY_3])
+    transaction = _linked_transaction(fake.net(), "alice", "bob")
+    signed = keyring.sign(transaction)
+    expected = transaction.sign(key=KEY_1).sign(key=KEY_2)
+    assert signed.signatures == expected.signatures
+    signed.send()
+
+
+def test_keyring_caches_required_keys_by_authorizations(fake, clock):
+    keyring = pyntelope.Keyring([KEY_1, KEY_2], ttl_sec=10, clock=clock)
+    net = fake.net()
+    keyring.sign(_linked_transaction(net, "alice"))
+    count = fake.request_count
+    keyring.sign(_linked_transaction(net, "alice"))
+    assert fake.request_count == count + 1  # only get_info to link
+    keyring.sign(_linked_transaction(net, "bob"))
+    assert fake.request_count == count + 3
+
+
+def test_given_ttl_passed_then_keyring_asks_required_keys_again(fake, clock):
+    keyring = pyntelope.Keyring([KEY_1], ttl_sec=10, clock=clock)
+    transaction = _linked_transaction(fake.net(), "alice")
+    keyring.required_keys(transaction)
+    count = fake.request_count
+    clock.now = 11
+    assert keyring.required_keys(transaction) == [KEY_1]
+    assert fake.request_count == count + 1
+
+
+def test_given_new_key_then_keyring_cache_is_cleared(fake, clock):
+    keyring = pyntelope.Keyring([KEY_1], clock=clock)
+    transaction = _linked_transaction(fake.net(), "alice")
+    keyring.required_keys(transaction)
+    keyring.add(KEY_2)
+    count = fake.request_count
+    keyring.required_keys(transaction)
+    assert fake.request_count == count + 1
+    assert len(keyring.public_keys()) == 2
+
+
+def test_given_missing_key_then_keyring_raises_authorization_error(fake):
+    keyring = pyntelope.Keyring([KEY_3])
+    transaction = _linked_transaction(fake.net(), "alice")
+    with pytest.raises(pyntelope.exc.AuthorizationError):
+        keyring.sign(transaction)
+
+
+def test_given_duplicated_key_then_keyring_keeps_it_once():
+    keyring = pyntelope.Keyring([KEY_1, KEY_1])
+    assert keyring.public_keys() == [pyntelope.utils.public_key(KEY_1)]
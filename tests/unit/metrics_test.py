@@ -0,0 +1,96 @@
+import httpx
+
+import pyntelope
+
+
+def _client(status_code=200, error=None):
+    def handler(request):
+        if error is not None:
+            raise error
+        return httpx.Response(status_code, json={"head_block_num": 1})
+
+    return httpx.Client(transport=httpx.MockTransport(handler))
+
+
+def test_given_metrics_when_request_then_count_bytes_and_latency():
+    metrics = pyntelope.Metrics()
+    net = pyntelope.Local(client=_client(), metrics=metrics)
+    net.get_info()
+    net.get_info()
+    (series,) = metrics.snapshot()
+    assert series["host"] == net.host
+    assert series["api"] == "/v1/chain/get_info"
+    assert series["requests"] == {"200": 2}
+    assert series["bytes_sent"] == 4  # "{}" twice
+    assert series["bytes_received"] == 2 * len('{"head_block_num":1}')
+    assert series["latency"]["count"] == 2
+    assert series["latency"]["buckets"][float("inf")] == 2
+
+
+def test_given_metrics_when_http_error_then_count_status_code():
+    metrics = pyntelope.Metrics()
+    net = pyntelope.Local(client=_client(status_code=429), metrics=metrics)
+    try:
+        net.get_info()
+    except pyntelope.exc.ConnectionError:
+        pass
+    assert metrics.snapshot()[0]["requests"] == {"429": 1}
+
+
+def test_given_metrics_when_transport_error_then_count_error_class():
+    metrics = pyntelope.Metrics()
+    error = httpx.ConnectTimeout("timeout")
+    net = pyntelope.Local(client=_client(error=error), metrics=metrics)
+    try:
+        net.get_info()
+    except pyntelope.exc.ConnectionError:
+        pass
+    assert metrics.snapshot()[0]["requests"] == {"ConnectTimeout": 1}
+
+
+def test_metrics_latency_buckets_are_cumulative():
+    metrics = pyntelope.Metrics()
+    for duration_sec in [0.001, 0.002, 0.2, 30]:
+        metrics.record(
+            host="h", api="/a", status="200", duration_sec=duration_sec
+        )
+    buckets = metrics.snapshot()[0]["latency"]["buckets"]
+    assert buckets[0.005] == 2
+    assert buckets[0.25] == 3
+    assert buckets[10.0] == 3
+    assert buckets[float("inf")] == 4
+
+
+def test_metrics_to_prometheus():
+    metrics = pyntelope.Metrics()
+    metrics.record(
+        host='http://a"b',
+        api="/v1/chain/get_info",
+        status="200",
+        duration_sec=0.02,
+        bytes_sent=2,
+        bytes_received=10,
+    )
+    text = metrics.to_prometheus()
+    labels = 'host="http://a\\"b",api="/v1/chain/get_info"'
+    assert f'pyntelope_requests_total{{{labels},status="200"}} 1\n' in text
+    assert f"pyntelope_bytes_sent_total{{{labels}}} 2\n" in text
+    assert f"pyntelope_bytes_received_total{{{labels}}} 10\n" in text
+    bucket = "pyntelope_request_duration_seconds_bucket"
+    assert f'{bucket}{{{labels},le="0.01"}} 0\n' in text
+    assert f'{bucket}{{{labels},le="0.025"}} 1\n' in text
+    assert f'{bucket}{{{labels},le="+Inf"}} 1\n' in text
+    assert "# TYPE pyntelope_request_duration_seconds histogram\n" in text
+
+
+def test_given_net_without_metrics_then_nothing_is_recorded():
+    net = pyntelope.Local(client=_client())
+    net.get_info()
+    assert net.metrics is None
+
+
+def test_metrics_reset():
+    metrics = pyntelope.Metrics()
+    metrics.record(host="h", api="/a", status="200", duration_sec=0.1)
+    metrics.reset()
+    assert metrics.snapshot() == []
@@ -1,4 +1,11 @@
+import asyncio
+import importlib.util
+import os
+import random
 import re
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import httpx
@@ -493,3 +500,501 @@ def test_given_net_with_context_manager_when_make_two_requests_then_client_facto
             net.get_info()
 
         assert mock_httpx_client.call_count == 0
+
+
+def _answer(data):
+    """Answer every request with the same json."""
+    return lambda url, payload: (200, data)
+
+
+INFO = {"head_block_num": 1}
+
+
+def test_given_concurrent_identical_requests_then_client_post_is_called_once(  # NOQA: E501
+    make_client,
+):
+    mock_client = make_client(_answer(INFO), delay=0.2)
+    net = pyntelope.Local(client=mock_client)
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = [executor.submit(net.get_info) for _ in range(10)]
+        results = [f.result() for f in futures]
+    assert mock_client.post.call_count == 1
+    assert all(r == {"head_block_num": 1} for r in results)
+
+
+def test_given_concurrent_identical_requests_then_each_caller_gets_its_own_dict(  # NOQA: E501
+    make_client,
+):
+    net = pyntelope.Local(client=make_client(_answer(INFO), delay=0.2))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(net.get_info) for _ in range(2)]
+        results = [f.result() for f in futures]
+    assert results[0] is not results[1]
+
+
+def test_given_concurrent_requests_with_different_payloads_then_none_is_coalesced(  # NOQA: E501
+    make_client,
+):
+    mock_client = make_client(_answer(INFO), delay=0.2)
+    net = pyntelope.Local(client=mock_client)
+    names = ["user1", "user2", "user3"]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        for name in names:
+            executor.submit(net.get_account, account_name=name)
+    assert mock_client.post.call_count == 3
+
+
+def test_given_coalesce_false_then_concurrent_identical_requests_are_all_made(  # NOQA: E501
+    make_client,
+):
+    mock_client = make_client(_answer(INFO), delay=0.2)
+    net = pyntelope.Local(client=mock_client, coalesce=False)
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        for _ in range(5):
+            executor.submit(net.get_info)
+    assert mock_client.post.call_count == 5
+
+
+def test_given_sequential_identical_requests_then_none_is_coalesced(
+    make_client,
+):
+    mock_client = make_client(_answer(INFO))
+    net = pyntelope.Local(client=mock_client)
+    net.get_info()
+    net.get_info()
+    assert mock_client.post.call_count == 2
+
+
+def test_given_concurrent_identical_pushes_then_none_is_coalesced(make_client):
+    mock_client = make_client(_answer(INFO), delay=0.2)
+    net = pyntelope.Local(client=mock_client)
+    transaction = Mock()
+    transaction.signatures = ["SIG_K1_a"]
+    transaction.pack.return_value = "00"
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        for _ in range(3):
+            executor.submit(net.push_transaction, transaction=transaction)
+    assert mock_client.post.call_count == 3
+
+
+def test_given_concurrent_identical_requests_when_request_fails_then_all_callers_raise():  # NOQA: E501
+    mock_client = Mock()
+
+    def post(*args, **kwargs):
+        time.sleep(0.2)
+        raise httpx.ConnectError("")
+
+    mock_client.post.side_effect = post
+    net = pyntelope.Local(client=mock_client)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(net.get_info) for _ in range(3)]
+        for future in futures:
+            with pytest.raises(pyntelope.exc.ConnectionError):
+                future.result()
+    assert mock_client.post.call_count == 1
+
+
+def test_given_concurrent_identical_requests_from_async_tasks_then_client_post_is_called_once(  # NOQA: E501
+    make_client,
+):
+    mock_client = make_client(_answer(INFO), delay=0.2)
+    net = pyntelope.Local(client=mock_client)
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        tasks = [loop.run_in_executor(None, net.get_info) for _ in range(5)]
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(main())
+    assert mock_client.post.call_count == 1
+    assert len(results) == 5
+
+
+def _answer_block(url, payload):
+    time.sleep(random.random() * 0.05)
+    block_num = payload.get("block_num_or_id", payload.get("block_num"))
+    return 200, {"block_num": block_num, "url": url}
+
+
+def test_iter_blocks_yields_blocks_in_order(make_client):
+    net = pyntelope.Local(client=make_client(_answer_block))
+    blocks = net.iter_blocks(10, 60, concurrency=8)
+    assert [b["block_num"] for b in blocks] == list(range(10, 60))
+
+
+def test_iter_blocks_keeps_at_most_concurrency_requests_in_flight(make_client):
+    mock_client = make_client(_answer_block)
+    net = pyntelope.Local(client=mock_client)
+    list(net.iter_blocks(1, 50, concurrency=4))
+    assert 1 < mock_client.max_in_flight <= 4
+
+
+def test_iter_blocks_with_empty_range_yields_nothing(make_client):
+    net = pyntelope.Local(client=make_client(_answer_block))
+    assert list(net.iter_blocks(10, 10)) == []
+
+
+def test_iter_blocks_with_header_only_uses_get_block_info(make_client):
+    net = pyntelope.Local(client=make_client(_answer_block))
+    blocks = list(net.iter_blocks(1, 5, header_only=True))
+    assert all(b["url"].endswith("/get_block_info") for b in blocks)
+
+
+def test_iter_blocks_with_extra_nets_spreads_requests_between_them(
+    make_client,
+):
+    mock_client_1 = make_client(_answer_block)
+    mock_client_2 = make_client(_answer_block)
+    net = pyntelope.Local(client=mock_client_1)
+    other_net = pyntelope.Local(client=mock_client_2)
+    blocks = list(net.iter_blocks(1, 21, nets=[other_net]))
+    assert [b["block_num"] for b in blocks] == list(range(1, 21))
+    assert mock_client_1.post.call_count == 10
+    assert mock_client_2.post.call_count == 10
+
+
+def test_iter_blocks_with_concurrency_0_raises_value_error(make_client):
+    net = pyntelope.Local(client=make_client(_answer_block))
+    with pytest.raises(ValueError):
+        list(net.iter_blocks(1, 5, concurrency=0))
+
+
+def _signed_transaction_mock(packed_trx="00"):
+    transaction = Mock()
+    transaction.signatures = ("SIG_K1_a",)
+    transaction.pack.return_value = packed_trx
+    return transaction
+
+
+def test_push_transactions_sends_a_list_of_packed_transactions(make_client):
+    mock_client = make_client(_answer([{"transaction_id": "a"}]))
+    net = pyntelope.Local(client=mock_client)
+    transactions = [_signed_transaction_mock(h) for h in ("aa", "bb")]
+    net.push_transactions(transactions=transactions)
+    url = mock_client.post.call_args.args[0]
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert url.endswith("/v1/chain/push_transactions")
+    assert [p["packed_trx"] for p in payload] == ["aa", "bb"]
+    assert all(p["signatures"] == ("SIG_K1_a",) for p in payload)
+
+
+def test_push_transactions_returns_the_list_of_results(make_client):
+    results = [{"transaction_id": "a"}, {"transaction_id": "b"}]
+    net = pyntelope.Local(client=make_client(_answer(results)))
+    transactions = [_signed_transaction_mock() for _ in range(2)]
+    resp = net.push_transactions(transactions=transactions)
+    assert resp == results
+
+
+def test_send_transaction2_sends_retry_options_and_packed_transaction(
+    make_client,
+):
+    mock_client = make_client(_answer({"transaction_id": "a"}))
+    net = pyntelope.Local(client=mock_client)
+    net.send_transaction2(
+        transaction=_signed_transaction_mock("aa"),
+        retry_trx=True,
+        retry_trx_num_blocks=3,
+        return_failure_trace=False,
+    )
+    url = mock_client.post.call_args.args[0]
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert url.endswith("/v1/chain/send_transaction2")
+    assert payload["retry_trx"] is True
+    assert payload["retry_trx_num_blocks"] == 3
+    assert payload["return_failure_trace"] is False
+    assert payload["transaction"]["packed_trx"] == "aa"
+
+
+def test_send_transaction2_without_retry_blocks_doesnt_send_it(make_client):
+    mock_client = make_client(_answer({"transaction_id": "a"}))
+    net = pyntelope.Local(client=mock_client)
+    net.send_transaction2(transaction=_signed_transaction_mock())
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert "retry_trx_num_blocks" not in payload
+
+
+def test_given_small_transaction_when_push_then_dont_compress_it(make_client):
+    mock_client = make_client(_answer({}))
+    net = pyntelope.Local(client=mock_client)
+    net.push_transaction(transaction=_signed_transaction_mock("aa" * 100))
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert payload["compression"] is False
+    assert payload["packed_trx"] == "aa" * 100
+
+
+def test_given_big_transaction_when_push_then_zlib_compress_it(make_client):
+    mock_client = make_client(_answer({}))
+    net = pyntelope.Local(client=mock_client)
+    packed_trx = "aa" * pyntelope.net.COMPRESSION_THRESHOLD_BYTES
+    net.push_transaction(transaction=_signed_transaction_mock(packed_trx))
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert payload["compression"] is True
+    assert len(payload["packed_trx"]) < len(packed_trx)
+    decompressed = zlib.decompress(bytes.fromhex(payload["packed_trx"]))
+    assert decompressed.hex() == packed_trx
+
+
+def test_given_compression_true_when_push_then_compress_context_free_data(
+    make_client,
+):
+    mock_client = make_client(_answer({}))
+    net = pyntelope.Local(client=mock_client)
+    net.push_transaction(
+        transaction=_signed_transaction_mock("aa"),
+        compression=True,
+        packed_context_free_data="bbbb",
+    )
+    payload = mock_client.post.call_args.kwargs["json"]
+    packed_trx = zlib.decompress(bytes.fromhex(payload["packed_trx"]))
+    cfd = zlib.decompress(bytes.fromhex(payload["packed_context_free_data"]))
+    assert packed_trx == b"\xaa"
+    assert cfd == b"\xbb\xbb"
+
+
+def test_given_compression_false_when_push_big_transaction_then_dont_compress_it(  # NOQA: E501
+    make_client,
+):
+    mock_client = make_client(_answer({}))
+    net = pyntelope.Local(client=mock_client)
+    packed_trx = "aa" * pyntelope.net.COMPRESSION_THRESHOLD_BYTES
+    net.push_transaction(
+        transaction=_signed_transaction_mock(packed_trx), compression=False
+    )
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert payload["compression"] is False
+    assert payload["packed_trx"] == packed_trx
+
+
+def _answer_account(*, fail=(), missing=()):
+    """Answer get_account and get_currency_balance."""
+
+    def answer(url, payload):
+        account = payload.get("account_name", payload.get("account"))
+        if account in fail:
+            raise httpx.ConnectTimeout("timeout")
+        if account in missing:
+            return 500, {
+                "code": 500,
+                "message": "Internal Service Error",
+                "error": {
+                    "code": 0,
+                    "name": "exception",
+                    "what": "unknown key",
+                },
+            }
+        if url.endswith("/get_currency_balance"):
+            return 200, [f"{len(account)}.0000 WAX"]
+        return 200, {"account_name": account}
+
+    return answer
+
+
+def test_get_accounts_returns_a_dict_by_account_name(make_client):
+    net = pyntelope.Local(client=make_client(_answer_account()))
+    accounts = net.get_accounts(["user1", "user22"])
+    assert accounts == {
+        "user1": {"account_name": "user1"},
+        "user22": {"account_name": "user22"},
+    }
+
+
+def test_get_accounts_requests_repeated_names_once(make_client):
+    mock_client = make_client(_answer_account())
+    net = pyntelope.Local(client=mock_client, coalesce=False)
+    accounts = net.get_accounts(["user1", "user2", "user1"], concurrency=1)
+    assert list(accounts) == ["user1", "user2"]
+    assert mock_client.post.call_count == 2
+
+
+def test_given_request_error_then_get_accounts_returns_it_for_that_account(
+    make_client,
+):
+    net = pyntelope.Local(client=make_client(_answer_account(fail={"user2"})))
+    accounts = net.get_accounts(["user1", "user2", "user3"])
+    assert accounts["user1"] == {"account_name": "user1"}
+    assert isinstance(accounts["user2"], pyntelope.exc.ConnectionError)
+    assert accounts["user3"] == {"account_name": "user3"}
+
+
+def test_given_missing_account_then_get_accounts_returns_a_nodeos_error(
+    make_client,
+):
+    net = pyntelope.Local(
+        client=make_client(_answer_account(missing={"nobody"}))
+    )
+    accounts = net.get_accounts(["user1", "nobody"])
+    assert accounts["user1"] == {"account_name": "user1"}
+    assert isinstance(accounts["nobody"], pyntelope.exc.NodeosError)
+    assert accounts["nobody"].what == "unknown key"
+
+
+def test_get_accounts_keeps_at_most_concurrency_requests_in_flight(
+    make_client,
+):
+    mock_client = make_client(_answer_block)
+    net = pyntelope.Local(client=mock_client)
+    net.get_accounts([f"user{i}" for i in range(20)], concurrency=3)
+    assert mock_client.post.call_count == 20
+    assert mock_client.max_in_flight <= 3
+
+
+def test_get_currency_balances_returns_a_dict_by_account(make_client):
+    mock_client = make_client(_answer_account())
+    net = pyntelope.Local(client=mock_client)
+    balances = net.get_currency_balances(
+        code="eosio.token", accounts=["user1", "user22"], symbol="WAX"
+    )
+    assert balances == {"user1": ["5.0000 WAX"], "user22": ["6.0000 WAX"]}
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert payload["code"] == "eosio.token"
+    assert payload["symbol"] == "WAX"
+
+
+def test_get_accounts_with_concurrency_0_raises_value_error(make_client):
+    net = pyntelope.Local(client=make_client(_answer_account()))
+    with pytest.raises(ValueError):
+        net.get_accounts(["user1"], concurrency=0)
+
+
+def test_compute_transaction_sends_the_packed_transaction(make_client):
+    mock_client = make_client(_answer({"processed": {}}))
+    net = pyntelope.Local(client=mock_client)
+    transaction = _signed_transaction_mock(packed_trx="abcd")
+    net.compute_transaction(transaction=transaction)
+    url = mock_client.post.call_args.args[0]
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert url.endswith("/v1/chain/compute_transaction")
+    assert payload["transaction"]["packed_trx"] == "abcd"
+    assert payload["transaction"]["compression"] is False
+
+
+def test_send_read_only_transaction_sends_the_uncompressed_transaction(
+    make_client,
+):
+    mock_client = make_client(_answer({"processed": {}}))
+    net = pyntelope.Local(client=mock_client)
+    transaction = Mock(spec=["pack"])
+    transaction.pack.return_value = "ab" * 2000
+    net.send_read_only_transaction(transaction=transaction)
+    url = mock_client.post.call_args.args[0]
+    payload = mock_client.post.call_args.kwargs["json"]
+    assert url.endswith("/v1/chain/send_read_only_transaction")
+    assert payload["transaction"]["packed_trx"] == "ab" * 2000
+    assert payload["transaction"]["signatures"] == ()
+
+
+def test_given_net_with_own_client_when_fork_then_child_gets_new_client():
+    with pyntelope.Local() as net:
+        parent_client = net.client
+        parent_inflight = net._inflight
+        net._reset_after_fork()
+        assert net.client is not parent_client
+        assert net._inflight is not parent_inflight
+        assert not parent_client.is_closed
+
+
+def test_given_net_with_user_client_when_fork_then_client_is_kept(caplog):
+    client = httpx.Client()
+    net = pyntelope.Local(client=client)
+    net._reset_after_fork()
+    assert net.client is client
+    assert "parent process" in caplog.text
+
+
+def test_given_rate_limiter_when_fork_then_its_locks_are_recreated():
+    limiter = pyntelope.RateLimiter(requests_per_sec=10, max_concurrent=1)
+    net = pyntelope.Local(rate_limiter=limiter)
+    limiter.acquire()  # held by the parent
+    net._reset_after_fork()
+    with limiter:
+        pass
+    assert net.rate_limiter is limiter
+
+
+def test_given_block_cache_when_fork_then_child_gets_new_locks_and_db(
+    tmp_path,
+):
+    cache = pyntelope.BlockCache(path=tmp_path / "blocks.sqlite")
+    cache.set(1, {"block_num": 1})
+    net = pyntelope.Local(block_cache=cache)
+    parent_db = cache._disk._db
+    cache._memory._lock.acquire()  # held by the parent
+    cache._disk._lock.acquire()
+    net._reset_after_fork()
+    assert cache._disk._db is not parent_db
+    assert cache.get(1) == {"block_num": 1}
+    parent_db.close()
+
+
+def test_given_routers_when_fork_then_their_nets_are_reset():
+    with pyntelope.Local() as push_net, pyntelope.Local() as read_net:
+        router = pyntelope.ProducerRouter(pyntelope.Local(), {"a": push_net})
+        pool = pyntelope.NetPool([read_net])
+        net = pyntelope.Local(router=router, read_router=pool)
+        clients = [push_net.client, read_net.client]
+        router._lock.acquire()  # held by the parent
+        net._reset_after_fork()
+        assert push_net.client is not clients[0]
+        assert read_net.client is not clients[1]
+        with router._lock:
+            pass
+
+
+def test_given_router_routing_back_to_the_net_when_fork_then_reset_ends():
+    net = pyntelope.Local()
+    net.router = pyntelope.NetPool([net])
+    inflight = net._inflight
+    net._reset_after_fork()
+    assert net._inflight is not inflight
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_given_net_used_in_parent_when_fork_then_child_can_request():
+    fake = pyntelope.FakeNode()
+    url = fake.serve()
+    read_fd, write_fd = os.pipe()
+    try:
+        with pyntelope.Net(host=url) as net:
+            net.get_info()
+            pid = os.fork()
+            if pid == 0:  # child
+                ok = False
+                try:
+                    ok = net.get_info()["chain_id"] == fake.chain_id
+                finally:
+                    os.write(write_fd, b"1" if ok else b"0")
+                    os._exit(0)
+            os.waitpid(pid, 0)
+            assert os.read(read_fd, 1) == b"1"
+            assert net.get_info()["chain_id"] == fake.chain_id
+    finally:
+        fake.shutdown()
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_given_http2_without_h2_then_net_raises_import_error(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ImportError, match="h2"):
+        pyntelope.Local(http2=True)
+
+
+def test_given_http2_then_net_keeps_one_http2_client_for_all_requests(
+    monkeypatch, make_client
+):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: Mock())
+    mock_client = make_client(_answer(INFO))
+    with patch("httpx.Client", return_value=mock_client) as client_class:
+        net = pyntelope.Local(http2=True)
+        net.get_info()
+        net.get_info()
+    client_class.assert_called_once_with(http2=True)
+    assert net.client is mock_client
+    assert mock_client.post.call_count == 2
+
+
+def test_given_http2_and_client_then_client_is_used_as_is():
+    client = httpx.Client()
+    net = pyntelope.Local(http2=True, client=client)
+    assert net.client is client
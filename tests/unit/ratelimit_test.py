@@ -0,0 +1,94 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+import pyntelope
+
+
+def _concurrency_client(delay_sec=0.02):
+    """Mock client that records the max number of concurrent posts."""
+    mock_client = Mock()
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def post(*args, **kwargs):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(delay_sec)
+        with lock:
+            state["running"] -= 1
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {}
+        return response
+
+    mock_client.post.side_effect = post
+    return mock_client, state
+
+
+def test_given_rate_limit_when_many_requests_then_they_are_paced():
+    limiter = pyntelope.RateLimiter(requests_per_sec=50)
+    mock_client, _ = _concurrency_client(delay_sec=0)
+    net = pyntelope.Local(client=mock_client, rate_limiter=limiter)
+    start = time.monotonic()
+    for _ in range(6):
+        net.get_info()
+    # the first request is free, each of the next 5 waits 1/50 sec
+    assert time.monotonic() - start >= 0.09
+
+
+def test_given_rate_limit_with_burst_then_first_requests_dont_wait():
+    limiter = pyntelope.RateLimiter(requests_per_sec=1, burst=5)
+    start = time.monotonic()
+    for _ in range(5):
+        with limiter:
+            pass
+    assert time.monotonic() - start < 0.5
+
+
+def test_given_rate_limit_shared_between_threads_then_global_rate_is_kept():
+    limiter = pyntelope.RateLimiter(requests_per_sec=100)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        for _ in range(11):
+            executor.submit(limiter.acquire)
+    assert time.monotonic() - start >= 0.09
+
+
+def test_given_max_concurrent_then_requests_in_flight_are_limited():
+    limiter = pyntelope.RateLimiter(max_concurrent=2)
+    mock_client, state = _concurrency_client()
+    net = pyntelope.Local(
+        client=mock_client, rate_limiter=limiter, coalesce=False
+    )
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: net.get_info(), range(8)))
+    assert mock_client.post.call_count == 8
+    assert state["peak"] == 2
+
+
+def test_given_request_error_then_concurrency_slot_is_released():
+    limiter = pyntelope.RateLimiter(max_concurrent=1)
+    mock_client = Mock()
+    mock_client.post.side_effect = RuntimeError
+    net = pyntelope.Local(client=mock_client, rate_limiter=limiter)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            net.get_info()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"requests_per_sec": 0},
+        {"burst": 0},
+        {"max_concurrent": 0},
+    ],
+)
+def test_rate_limiter_with_invalid_values_raises_value_error(kwargs):
+    with pytest.raises(ValueError):
+        pyntelope.RateLimiter(**kwargs)
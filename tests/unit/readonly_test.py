@@ -0,0 +1,112 @@
+import pytest
+
+import pyntelope
+from pyntelope import types
+
+ABI = {
+    "version": "eosio::abi/1.2",
+    "structs": [
+        {
+            "name": "getbalance",
+            "base": "",
+            "fields": [{"name": "owner", "type": "name"}],
+        }
+    ],
+    "actions": [
+        {"name": "getbalance", "type": "getbalance", "ricardian_contract": ""}
+    ],
+    "action_results": [{"name": "getbalance", "result_type": "asset"}],
+}
+
+
+def _action(owner):
+    return pyntelope.Action(
+        account="token",
+        name="getbalance",
+        data=[pyntelope.Data(name="owner", value=types.Name(owner))],
+        authorization=[
+            pyntelope.Authorization(actor="token", permission="active")
+        ],
+    )
+
+
+def _trace(return_value_hex_data):
+    action_trace = {"return_value_hex_data": return_value_hex_data}
+    return {"processed": {"action_traces": [action_trace], "except": None}}
+
+
+@pytest.fixture
+def fake():
+    fake = pyntelope.FakeNode()
+    fake.set_abi("token", ABI)
+    yield fake
+
+
+@pytest.fixture
+def net(fake):
+    """Net whose read-only calls return the balance of the owner."""
+    net = fake.net()
+    net.sent = []
+
+    def send_read_only_transaction(*, transaction):
+        net.sent.append(transaction)
+        owner = transaction.actions[0].data[0].value.value
+        if owner == "user3":
+            return {
+                "code": 500,
+                "message": "Internal Service Error",
+                "error": {
+                    "code": 3050003,
+                    "name": "eosio_assert_message_exception",
+                    "what": "eosio_assert_message assertion failure",
+                    "details": [],
+                },
+            }
+        if owner == "user4":
+            return {"processed": {"action_traces": [], "except": {}}}
+        balance = types.Asset(f"{len(owner)}.0000 WAX")
+        return _trace(bytes(balance).hex())
+
+    net.send_read_only_transaction = send_read_only_transaction
+    yield net
+
+
+def test_call_read_only_returns_decoded_values_in_order(net):
+    actions = [_action("user1"), _action("user22")]
+    values = pyntelope.call_read_only(net, actions)
+    assert values == ["5.0000 WAX", "6.0000 WAX"]
+
+
+def test_call_read_only_sends_unsigned_linked_transactions(net):
+    pyntelope.call_read_only(net, [_action("user1"), _action("user2")])
+    for transaction in net.sent:
+        assert isinstance(transaction, pyntelope.LinkedTransaction)
+        assert not hasattr(transaction, "signatures")
+    assert net.sent[0].id() != net.sent[1].id()
+
+
+def test_given_failed_call_then_its_item_is_the_exception(net):
+    actions = [_action("user1"), _action("user3"), _action("user22")]
+    values = pyntelope.call_read_only(net, actions, concurrency=2)
+    assert values[0] == "5.0000 WAX"
+    assert isinstance(values[1], pyntelope.exc.ContractAssertionError)
+    assert values[2] == "6.0000 WAX"
+
+
+def test_given_transaction_with_exception_then_its_item_is_a_value_error(
+    net,
+):
+    values = pyntelope.call_read_only(net, [_action("user4")])
+    assert isinstance(values[0], ValueError)
+
+
+def test_call_read_only_with_no_actions_returns_empty_list(net):
+    assert pyntelope.call_read_only(net, []) == []
+
+
+def test_abi_decoder_decodes_action_results():
+    decoder = pyntelope.AbiDecoder(ABI)
+    data = bytes(types.Asset("1.0000 WAX")).hex()
+    assert decoder.decode_action_result("getbalance", data) == "1.0000 WAX"
+    with pytest.raises(ValueError):
+        decoder.decode_action_result("xxx", data)
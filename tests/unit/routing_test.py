@@ -0,0 +1,124 @@
+import datetime as dt
+from unittest.mock import Mock
+
+import pytest
+
+import pyntelope
+
+# block slot 1262304000, the first slot of a prod1 round
+ROUND_START = dt.datetime(2020, 1, 1)
+PRODUCERS = ["prod1", "prod2", "prod3"]
+
+
+@pytest.fixture
+def fake(clock):
+    yield pyntelope.FakeNode(
+        clock=clock, producers=PRODUCERS, start_time=ROUND_START
+    )
+
+
+@pytest.fixture
+def router(fake):
+    nets = {p: fake.net() for p in ["prod1", "prod2", "prod3"]}
+    yield pyntelope.ProducerRouter(fake.net(), nets, refresh_sec=0)
+
+
+@pytest.mark.parametrize(
+    "times_and_producers",
+    [
+        # prod1 produces blocks 1-12, prod2 13-24, prod3 25-36
+        [(0, "prod1"), (4.5, "prod1"), (5, "prod2"), (6, "prod2")],
+        [(6, "prod2"), (11.5, "prod3"), (12, "prod3")],
+        [(12, "prod3"), (17.5, "prod1")],
+        [(0, "prod1"), (11.5, "prod3")],
+    ],
+)
+def test_router_chooses_the_producer_of_the_next_blocks(
+    router, clock, times_and_producers
+):
+    for now, producer in times_and_producers:
+        clock.now = now
+        assert router.next_producer() == producer
+        assert router.net() is router.nets[producer]
+
+
+@pytest.mark.parametrize(
+    "start_sec, producer",
+    [
+        # block 1 is the 11th block of prod1: only one left in its round
+        (5, "prod2"),
+        (4.5, "prod1"),
+        (6, "prod2"),
+        (17.5, "prod1"),
+    ],
+)
+def test_given_chain_started_mid_round_then_router_chooses_the_next_producer(
+    clock, start_sec, producer
+):
+    start_time = ROUND_START + dt.timedelta(seconds=start_sec)
+    fake = pyntelope.FakeNode(
+        clock=clock, producers=PRODUCERS, start_time=start_time
+    )
+    router = pyntelope.ProducerRouter(fake.net(), {})
+    assert router.next_producer() == producer
+
+
+def test_given_producer_without_net_then_router_uses_default_net(fake):
+    default = fake.net()
+    router = pyntelope.ProducerRouter(default, {"prod2": fake.net()})
+    assert router.net() is default
+
+
+def test_router_caches_get_info_for_refresh_sec(fake):
+    default = Mock(wraps=fake.net())
+    router = pyntelope.ProducerRouter(default, {}, refresh_sec=60)
+    router.net()
+    router.net()
+    assert default.get_info.call_count == 1
+    assert default.get_producer_schedule.call_count == 1
+
+
+def test_given_net_with_router_when_push_then_use_the_chosen_net(fake):
+    mock_client = Mock()
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"transaction_id": "a"}
+    mock_client.post.return_value = response
+    chosen_net = pyntelope.Net(host="http://prod1.local", client=mock_client)
+    router = pyntelope.ProducerRouter(fake.net(), {"prod1": chosen_net})
+    net = fake.net(router=router)
+    transaction = Mock()
+    transaction.pack.return_value = "00"
+    assert net.push_transaction(transaction=transaction) == {
+        "transaction_id": "a"
+    }
+    url = mock_client.post.call_args.args[0]
+    assert url == "http://prod1.local/v1/chain/push_transaction"
+
+
+def test_net_pool_uses_its_nets_in_turn():
+    nets = [pyntelope.Net(host=f"http://node{i}.local") for i in range(3)]
+    pool = pyntelope.NetPool(nets)
+    assert [pool.net() for _ in range(4)] == nets + nets[:1]
+
+
+def test_given_no_nets_then_net_pool_raises_value_error():
+    with pytest.raises(ValueError):
+        pyntelope.NetPool([])
+
+
+def test_given_read_and_write_pools_then_net_splits_the_requests(
+    clock, transfer, key
+):
+    readers = [pyntelope.FakeNode(clock=clock) for _ in range(2)]
+    writer = pyntelope.FakeNode(clock=clock)
+    net = pyntelope.Net(
+        host="http://main.local",
+        read_router=pyntelope.NetPool([r.net() for r in readers]),
+        router=pyntelope.NetPool([writer.net()]),
+    )
+    transaction = transfer.link(net=net)
+    net.get_block(block_num_or_id=1)
+    transaction.sign(key=key).send()
+    assert [r.request_count for r in readers] == [1, 1]
+    assert writer.request_count == 1
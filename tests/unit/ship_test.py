@@ -0,0 +1,116 @@
+import pytest
+
+import pyntelope
+
+pytest.importorskip("websockets")
+
+
+@pytest.fixture
+def node(clock):
+    node = pyntelope.FakeNode(clock=clock, irreversible_lag=3)
+    clock.now = 10  # 21 blocks
+    yield node
+
+
+@pytest.fixture
+def url(node):
+    ship = pyntelope.FakeShip(node, poll_sec=0.01)
+    yield ship.serve()
+    ship.shutdown()
+
+
+def _push_transaction(net, transfer, key):
+    transaction = transfer.link(net=net).sign(key=key)
+    transaction.send()
+    return transaction
+
+
+def test_ship_client_get_status(node, url):
+    with pyntelope.ShipClient(url) as client:
+        status = client.get_status()
+    assert status["head"]["block_num"] == 21
+    assert status["last_irreversible"]["block_num"] == 18
+    assert status["chain_id"] == node.chain_id
+
+
+def test_ship_client_yields_the_requested_blocks(node, url):
+    client = pyntelope.ShipClient(url, start_block=2, end_block=20)
+    with client:
+        blocks = list(client)
+    assert [b.block_num for b in blocks] == list(range(2, 20))
+    for block in blocks:
+        assert block.block_id == node.block_id(block.block_num)
+        assert block.prev_block_id == node.block_id(block.block_num - 1)
+        assert block.block["previous"] == block.prev_block_id
+        assert block.block["producer"] == "eosio"
+        assert block.head_block_num == 21
+        assert block.traces is None
+
+
+def test_given_small_window_then_ship_client_acknowledges_blocks(url):
+    client = pyntelope.ShipClient(
+        url, start_block=1, end_block=21, max_messages_in_flight=1
+    )
+    with client:
+        assert len(list(client)) == 20
+
+
+def test_ship_client_decodes_transactions_and_traces(node, url, transfer, key):
+    transaction = _push_transaction(node.net(), transfer, key)
+    client = pyntelope.ShipClient(
+        url,
+        start_block=22,
+        end_block=23,
+        fetch_traces=True,
+        fetch_deltas=True,
+    )
+    node.clock.now = 11
+    with client:
+        (block,) = list(client)
+    (receipt,) = block.block["transactions"]
+    assert receipt["trx"][0] == "packed_transaction"
+    assert receipt["trx"][1]["signatures"] == list(transaction.signatures)
+    assert receipt["trx"][1]["packed_trx"].hex() == transaction.pack()
+    ((version, trace),) = block.traces
+    assert version == "transaction_trace_v0"
+    assert trace["id"] == transaction.id()
+    assert block.deltas == []
+
+
+def test_given_no_decode_then_ship_client_yields_bytes(url):
+    client = pyntelope.ShipClient(
+        url, start_block=5, end_block=6, decode=False
+    )
+    with client:
+        (block,) = list(client)
+        assert isinstance(block.block, bytes)
+        decoded = client.decode_block(block.block)
+    assert decoded["producer"] == "eosio"
+
+
+def test_given_irreversible_only_then_ship_client_waits_for_lib(node, url):
+    client = pyntelope.ShipClient(
+        url, start_block=18, end_block=20, irreversible_only=True
+    )
+    with client:
+        blocks = iter(client)
+        assert next(blocks).block_num == 18
+        node.clock.now = 10.5
+        assert next(blocks).block_num == 19
+
+
+def test_given_no_websockets_then_ship_client_raises_import_error(
+    monkeypatch,
+):
+    import builtins
+
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name.startswith("websockets"):
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+    with pytest.raises(ImportError, match=r"pip install pyntelope\[ship\]"):
+        pyntelope.ShipClient("ws://127.0.0.1:1").connect()
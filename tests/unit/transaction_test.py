@@ -457,3 +457,110 @@ def test_e2e_with_transaction_signed_with_the_wrong_key(net):
     assert "error" in resp
     assert "details" in resp["error"]
     assert len(resp["error"]["details"]) == 1
+
+
+def test_linked_transaction_estimate_returns_billed_cpu_and_net(transfer):
+    net = pyntelope.FakeNode().net()
+    estimate = transfer.link(net=net).estimate()
+    assert estimate["cpu_usage_us"] > 0
+    assert estimate["net_usage_words"] > 0
+    assert "action_traces" in estimate["trace"]
+
+
+def test_estimate_doesnt_commit_the_transaction(transfer, key):
+    net = pyntelope.FakeNode().net()
+    signed_transaction = transfer.link(net=net).sign(key=key)
+    signed_transaction.estimate()
+    resp = signed_transaction.send()
+    assert resp["transaction_id"] == signed_transaction.id()
+
+
+def test_given_failed_transaction_when_estimate_then_raise_value_error(
+    transfer,
+):
+    fake = pyntelope.FakeNode()
+    linked_transaction = transfer.link(net=fake.net())
+    fake.fail_next(status_code=500)
+    with pytest.raises(ValueError):
+        linked_transaction.estimate()
+
+
+def test_given_recovery_and_exhausted_cpu_then_transaction_is_pushed_again(
+    transfer, key, monkeypatch
+):
+    net = pyntelope.FakeNode().net()
+    transaction = transfer.link(net=net).sign(key=key)
+    exhausted = {"code": 500, "error": {"code": 3080004, "name": "tx_cpu"}}
+    responses = [exhausted, exhausted]
+    push_transaction = net.push_transaction
+    monkeypatch.setattr(
+        net,
+        "push_transaction",
+        lambda **kw: responses.pop() if responses else push_transaction(**kw),
+    )
+    recovery = pyntelope.RecoveryPolicy(backoff_sec=0)
+    resp = transaction.send(recovery=recovery)
+    assert resp["transaction_id"] == transaction.id()
+
+
+def test_given_recovery_and_too_many_failures_then_last_error_is_raised(
+    transfer, key, monkeypatch
+):
+    net = pyntelope.FakeNode().net()
+    transaction = transfer.link(net=net).sign(key=key)
+    exhausted = {"code": 500, "error": {"code": 3080004, "name": "tx_cpu"}}
+    monkeypatch.setattr(net, "push_transaction", lambda **kw: exhausted)
+    recovery = pyntelope.RecoveryPolicy(max_attempts=2, backoff_sec=0)
+    with pytest.raises(pyntelope.exc.ResourceExhaustedError):
+        transaction.send(recovery=recovery)
+
+
+def test_linked_action_serializes_data_with_length_prefix(auth):
+    code = pyntelope.types.Wasm(value=bytes(range(256)) * 2000)
+    data = [
+        pyntelope.Data(name="account", value=pyntelope.types.Name("user2")),
+        pyntelope.Data(name="code", value=code),
+    ]
+    action = pyntelope.Action(
+        account="eosio", name="setcode", data=data, authorization=[auth]
+    )
+    linked_action = action.link(pyntelope.FakeNode().net())
+    data_bytes = bytes(data[0]) + bytes(data[1])
+    expected = bytes(pyntelope.types.Name("eosio"))
+    expected += bytes(pyntelope.types.Name("setcode"))
+    expected += b"\x01" + bytes(auth)
+    expected += bytes(pyntelope.types.Varuint32(len(data_bytes))) + data_bytes
+    assert bytes(linked_action) == expected
+
+
+def test_transaction_is_serialized_once_when_signed_and_sent(
+    example_transaction, key, monkeypatch
+):
+    calls = []
+    serialize = pyntelope.LinkedTransaction._serialize
+
+    def counted_serialize(self):
+        calls.append(self)
+        return serialize(self)
+
+    monkeypatch.setattr(
+        pyntelope.LinkedTransaction, "_serialize", counted_serialize
+    )
+    signed_transaction = example_transaction.sign_many([key, key])
+    signed_transaction.pack()
+    signed_transaction.id()
+    assert len(calls) == 1
+
+
+def test_signed_transaction_keeps_the_id_of_the_linked_transaction(
+    example_transaction, key
+):
+    signed_transaction = example_transaction.sign(key=key)
+    assert signed_transaction.id() == example_transaction.id()
+
+
+def test_copy_with_update_doesnt_reuse_the_cached_bytes(example_transaction):
+    bytes_ = bytes(example_transaction)
+    copied = example_transaction.copy(update={"ref_block_num": 1})
+    assert bytes(copied) != bytes_
+    assert copied.id() != example_transaction.id()
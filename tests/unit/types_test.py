@@ -169,6 +169,16 @@ values = [
         "99 WAX",
         b"c\x00\x00\x00\x00\x00\x00\x00\x00WAX\x00\x00\x00\x00",
     ),
+    (
+        types.Asset,
+        "1.0000 WAX",
+        b"\x10'\x00\x00\x00\x00\x00\x00\x04WAX\x00\x00\x00\x00",
+    ),
+    (
+        types.Asset,
+        "0.0001 WAX",
+        b"\x01\x00\x00\x00\x00\x00\x00\x00\x04WAX\x00\x00\x00\x00",
+    ),
     (
         types.TimePoint,
         dt.datetime(1970, 1, 1, 0, 0),
@@ -242,6 +252,16 @@ def test_type_bytes_to_object_deserialization(class_, input_, expected_output):
     assert new_instance == instance
 
 
+@pytest.mark.parametrize("class_,input_,expected_output", values)
+def test_type_bytes_with_trailing_bytes_to_object_deserialization(
+    class_, input_, expected_output
+):
+    instance = class_(input_)
+    bytes_ = bytes(instance) + b"\x01\x02"
+    new_instance = class_.from_bytes(bytes_)
+    assert new_instance == instance
+
+
 @pytest.mark.parametrize("class_,input_,expected_output", values)
 def test_size(class_, input_, expected_output):
     has_len = {
@@ -653,6 +673,30 @@ def test_abi_from_dict_returns_abi_object():
     assert isinstance(abi_obj, types.Abi)
 
 
+def test_abi_with_action_results_without_variants_serializes_empty_variants():  # NOQA: E501
+    d = {
+        "version": "eosio::abi/1.2",
+        "action_results": [{"name": "getbalance", "result_type": "asset"}],
+    }
+    abi_bytes = bytes(types.Abi.from_dict(d))
+    action_result = bytes(types.Name("getbalance")) + bytes(
+        types.String("asset")
+    )
+    # empty variants (0) then 1 action result
+    assert abi_bytes.endswith(b"\x00\x01" + action_result)
+
+
+def test_abi_with_variants_serializes_name_and_types():
+    d = {
+        "version": "eosio::abi/1.1",
+        "variants": [{"name": "value", "types": ["uint8", "string"]}],
+    }
+    abi_bytes = bytes(types.Abi.from_dict(d))
+    variant = bytes(types.String("value")) + b"\x02"
+    variant += bytes(types.String("uint8")) + bytes(types.String("string"))
+    assert abi_bytes.endswith(b"\x01" + variant)
+
+
 def test_abi_from_hello_file_return_abi_object():
     abi_obj = types.Abi.from_file(valid_contract.path_abi)
     assert isinstance(abi_obj, types.Abi)
@@ -692,3 +736,12 @@ def test_abi_from_file_with_string_and_relative_path_returns_abi_object():
     path = str(valid_contract.path_abi.relative_to(local_path))
     abi_obj = types.Abi.from_file(file=path)
     assert isinstance(abi_obj, types.Abi)
+
+
+def test_asset_from_bytes_reads_the_amount_as_signed():
+    amount = bytes(types.Int64(-5))
+    symbol = bytes(types.Symbol("4,EOS"))
+    assert types.Asset._value_from_bytes(amount + symbol) == "-0.0005 EOS"
+    # assets with a negative amount can't be created
+    with pytest.raises(pydantic.ValidationError):
+        types.Asset.from_bytes(amount + symbol)
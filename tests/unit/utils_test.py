@@ -37,3 +37,30 @@ bogus_private_key = ["", "a", "a" * 100, "a" * 1000]
 def test_sign_bytes_with_improper_key_format(key):
     with pytest.raises(ValueError):
         pyntelope.utils.sign_bytes(bytes_=b"a", key=key)
+
+
+def test_public_key_of_private_key():
+    key = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+    public_key = pyntelope.utils.public_key(key)
+    assert public_key == "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63"  # NOQA: E501
+
+
+def test_public_key_bytes_of_legacy_and_k1_formats_are_equal():
+    k1 = "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5BoDq63"
+    legacy = "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+    point = pyntelope.utils.public_key_bytes(k1)
+    assert len(point) == 33
+    assert point == pyntelope.utils.public_key_bytes(legacy)
+
+
+@pytest.mark.parametrize(
+    "public_key",
+    [
+        "",
+        "EOS6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CW",
+        "PUB_K1_6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV",
+    ],
+)
+def test_public_key_bytes_with_invalid_key_raises_value_error(public_key):
+    with pytest.raises(ValueError):
+        pyntelope.utils.public_key_bytes(public_key)